@@ -0,0 +1,108 @@
+"""
+Run the benchmark suite and emit the results as JSON.
+
+Usage:
+    python -m benchmarks [--output FILE] [--filter TEXT] [--compare BASELINE]
+
+With --compare, the mean of each benchmark is compared with the baseline
+results file and the command fails if any of them regressed by more than
+--max-regression.
+"""
+import argparse
+import datetime
+import json
+import platform
+import subprocess
+import sys
+from typing import Any, Optional
+
+from benchmarks import bench_client, bench_menu, bench_parsers
+from benchmarks.runner import BenchmarkResult
+
+FORMAT_VERSION = 1
+SUITES = [bench_parsers, bench_client, bench_menu]
+
+
+def current_commit() -> Optional[str]:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def run_suites(name_filter: Optional[str] = None) -> list[BenchmarkResult]:
+    results = []
+    for suite in SUITES:
+        for result in suite.run():
+            if name_filter is None or name_filter in result["name"]:
+                results.append(result)
+                print(
+                    f"{result['name']:<40} mean {result['mean'] * 1e6:>12.2f} us"
+                    f"  min {result['min'] * 1e6:>12.2f} us",
+                    file=sys.stderr,
+                )
+    return results
+
+
+def compare(
+    results: list[BenchmarkResult], baseline: dict[str, Any], max_regression: float
+) -> bool:
+    """
+    Print the ratio with the baseline of each benchmark and return False
+    if any of them regressed more than max_regression
+    """
+    baseline_means = {r["name"]: r["mean"] for r in baseline.get("results", [])}
+    success = True
+    for result in results:
+        previous = baseline_means.get(result["name"])
+        if not previous:
+            continue
+        ratio = result["mean"] / previous
+        regressed = ratio > 1 + max_regression
+        success = success and not regressed
+        flag = "REGRESSION" if regressed else ""
+        print(f"{result['name']:<40} x{ratio:.2f} {flag}", file=sys.stderr)
+    return success
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run the benchmark suite")
+    parser.add_argument("--output", help="Write the JSON results to this file")
+    parser.add_argument("--filter", help="Only report benchmarks containing this text")
+    parser.add_argument("--compare", help="Baseline results file to compare with")
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=0.2,
+        help="Tolerated slowdown ratio when comparing (default 0.2)",
+    )
+    args = parser.parse_args()
+
+    results = run_suites(args.filter)
+    report = {
+        "version": FORMAT_VERSION,
+        "commit": current_commit(),
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if not compare(results, baseline, args.max_regression):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
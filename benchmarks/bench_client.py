@@ -0,0 +1,74 @@
+"""
+Benchmarks of the NordVpn client output parsing and of the topology queries
+against a replayed CLI with realistic latency.
+"""
+from typing import Optional
+
+from benchmarks.runner import BenchmarkResult, measure, read_recorded_output
+from nordvpn import NordVpn, ReplayTransport
+from nordvpn.utils import parse_words
+
+# Typical duration of a nordvpn CLI invocation
+CLI_LATENCY_SECONDS = (0.015, 0.025)
+
+
+def make_cities_output(count: int) -> str:
+    """
+    Return a synthetic "nordvpn cities" output with count cities
+    """
+    cities = [f"City_{index:04d}" for index in range(count)]
+    rows = []
+    for start in range(0, count, 4):
+        stop = start + 4
+        rows.append("\t\t".join(cities[start:stop]))
+    return "\n".join(rows)
+
+
+def make_replay_client(
+    countries: list[str], extra_recordings: Optional[dict[str, list[str]]] = None
+) -> NordVpn:
+    """
+    Return a client replaying the countries and cities outputs
+    """
+    recordings = {"countries": ["\t".join(countries)], **(extra_recordings or {})}
+    for country in countries:
+        recordings[f"cities {country}"] = [make_cities_output(20)]
+    transport = ReplayTransport(recordings, latency=CLI_LATENCY_SECONDS, seed=0)
+    return NordVpn(transport=transport)
+
+
+def run(number: int = 2000) -> list[BenchmarkResult]:
+    client = NordVpn()
+    countries_output = read_recorded_output("countries.txt")
+    groups_output = read_recorded_output("groups.txt")
+    cities_output = make_cities_output(1000)
+    countries = client._parse_word_list(countries_output)
+    replay_client = make_replay_client(countries)
+    return [
+        measure(
+            "client.clean_command_output",
+            lambda: client._clean_command_output(countries_output),
+            number,
+        ),
+        measure("client.parse_words.countries", lambda: parse_words(countries_output)),
+        measure(
+            "client.parse_words.cities_1000", lambda: parse_words(cities_output), 100
+        ),
+        measure(
+            "client.parse_word_list.groups",
+            lambda: client._parse_word_list(groups_output),
+            number,
+        ),
+        measure(
+            "client.get_cities.sequential",
+            lambda: [replay_client.get_cities(country) for country in countries],
+            number=1,
+            repeat=3,
+        ),
+        measure(
+            "client.get_cities_for.concurrent",
+            lambda: replay_client.get_cities_for(countries),
+            number=1,
+            repeat=3,
+        ),
+    ]
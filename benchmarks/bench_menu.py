@@ -0,0 +1,68 @@
+"""
+End-to-end benchmark of the indicator menu construction against a replayed
+CLI with realistic latency. Skipped when GTK is not available.
+"""
+import statistics
+
+from benchmarks.bench_client import make_replay_client
+from benchmarks.runner import BenchmarkResult, measure, read_recorded_output
+from nordvpn import NordVpn
+
+
+def gtk_available() -> bool:
+    try:
+        import gi
+
+        gi.require_version("Gtk", "3.0")
+        gi.require_version("AppIndicator3", "0.1")
+        from gi.repository import Gtk
+    except (ImportError, ValueError):
+        return False
+    return Gtk.init_check()[0]
+
+
+def run() -> list[BenchmarkResult]:
+    if not gtk_available():
+        return []
+
+    from nordvpn_indicator.filler import IdleFiller
+    from nordvpn_indicator.indicator import Indicator
+
+    countries = NordVpn()._parse_word_list(read_recorded_output("countries.txt"))
+    client = make_replay_client(
+        countries, {"groups": [read_recorded_output("groups.txt")]}
+    )
+
+    # Build the menu without starting the indicator and its main loop
+    indicator = Indicator.__new__(Indicator)
+    indicator.nordvpn = client
+    fillers = []
+
+    def fill() -> None:
+        # The fetch runs in background and the slices in the UI loop, here
+        # they run one after the other to time the whole menu
+        indicator._build_menu()
+        filler = IdleFiller()
+        fillers.append(filler)
+        indicator._fill_servers_menus(
+            filler, client.get_countries(), client.get_groups()
+        )
+
+    results = [
+        # Work done before the icon is shown
+        measure("menu.build", indicator._build_menu, number=1, repeat=5),
+        measure("menu.fill", fill, number=1, repeat=5),
+    ]
+    # Longest time the UI loop was kept busy by a slice
+    slices = [filler.longest_slice for filler in fillers]
+    results.append(
+        {
+            "name": "menu.fill.longest_slice",
+            "number": 1,
+            "repeat": len(slices),
+            "min": min(slices),
+            "mean": statistics.mean(slices),
+            "stdev": statistics.stdev(slices) if len(slices) > 1 else 0.0,
+        }
+    )
+    return results
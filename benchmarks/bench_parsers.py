@@ -0,0 +1,70 @@
+"""
+Benchmarks of the status and settings parsers on recorded outputs.
+
+The single-pass parse_key_values tokenizer is also compared with the
+per-key regex lookups (find_string_value, find_bool_value, find_list_value).
+"""
+from benchmarks.runner import BenchmarkResult, measure, read_recorded_output
+from nordvpn import NordVpnSettings, NordVpnStatus, SettingsNames
+from nordvpn.utils import (
+    find_bool_value,
+    find_list_value,
+    find_string_value,
+    parse_key_values,
+    to_bool,
+    to_list,
+)
+
+STATUS_KEYS = [param.value for param in NordVpnStatus.Param]
+SETTINGS_BOOL_KEYS = [
+    SettingsNames.FIREWALL.value,
+    SettingsNames.KILL_SWITCH.value,
+    SettingsNames.CYBERSEC.value,
+    SettingsNames.NOTIFY.value,
+    SettingsNames.AUTO_CONNECT.value,
+    SettingsNames.IPV6.value,
+    SettingsNames.DNS.value,
+]
+
+
+def status_per_key(raw: str) -> list:
+    return [find_string_value(key, raw) for key in STATUS_KEYS]
+
+
+def status_single_pass(raw: str) -> list:
+    values = parse_key_values(raw)
+    return [values.get(key) for key in STATUS_KEYS]
+
+
+def settings_per_key(raw: str) -> list:
+    values: list = [find_string_value(SettingsNames.TECHNOLOGY.value, raw)]
+    values.extend(find_bool_value(key, raw) for key in SETTINGS_BOOL_KEYS)
+    values.append(find_list_value(SettingsNames.WHITELISTED_SUBNETS.value, raw))
+    return values
+
+
+def settings_single_pass(raw: str) -> list:
+    parsed = parse_key_values(raw)
+    values: list = [parsed.get(SettingsNames.TECHNOLOGY.value)]
+    values.extend(to_bool(parsed.get(key)) for key in SETTINGS_BOOL_KEYS)
+    values.append(to_list(parsed.get(SettingsNames.WHITELISTED_SUBNETS.value)))
+    return values
+
+
+def run(number: int = 5000) -> list[BenchmarkResult]:
+    status = read_recorded_output("status_connected.txt")
+    settings = read_recorded_output("settings.txt")
+    return [
+        measure("parsers.status", lambda: NordVpnStatus(status), number),
+        measure("parsers.settings", lambda: NordVpnSettings(settings), number),
+        measure("parsers.status.per_key", lambda: status_per_key(status), number),
+        measure(
+            "parsers.status.single_pass", lambda: status_single_pass(status), number
+        ),
+        measure("parsers.settings.per_key", lambda: settings_per_key(settings), number),
+        measure(
+            "parsers.settings.single_pass",
+            lambda: settings_single_pass(settings),
+            number,
+        ),
+    ]
@@ -0,0 +1,34 @@
+import statistics
+import timeit
+from pathlib import Path
+from typing import Any, Callable
+
+DATA_DIR = Path(__file__).parent / "data"
+
+BenchmarkResult = dict[str, Any]
+
+
+def read_recorded_output(name: str) -> str:
+    """
+    Return the content of a recorded nordvpn output from the data folder
+    """
+    return (DATA_DIR / name).read_text()
+
+
+def measure(
+    name: str, func: Callable[[], Any], number: int = 1000, repeat: int = 5
+) -> BenchmarkResult:
+    """
+    Time func calling it number times for each of the repeat rounds and
+    return the statistics of the time per call in seconds
+    """
+    rounds = timeit.Timer(func).repeat(repeat=repeat, number=number)
+    per_call = [total / number for total in rounds]
+    return {
+        "name": name,
+        "number": number,
+        "repeat": repeat,
+        "min": min(per_call),
+        "mean": statistics.mean(per_call),
+        "stdev": statistics.stdev(per_call) if repeat > 1 else 0.0,
+    }
@@ -1,8 +1,84 @@
-from .settings import (  # NOQA # isort:skip
-    NordVpnSettings,
-    SettingsNames,
-    Technologies,
-    Protocols,
-)
-from .status import NordVpnStatus, ConnectionStatus  # NOQA # isort:skip
-from .nordvpn import NordVpn  # NOQA # isort:skip
+from typing import TYPE_CHECKING, Any
+
+# The public names are imported from their module on first access, so
+# "from nordvpn import NordVpn" doesn't import asyncio, sockets or urllib
+_EXPORTS = {
+    "Snapshot": "snapshot",
+    "FrozenInstanceError": "snapshot",
+    "NordVpnSettings": "settings",
+    "SettingsNames": "settings",
+    "Technologies": "settings",
+    "Protocols": "settings",
+    "SettingResult": "settings",
+    "NordVpnStatus": "status",
+    "ConnectionStatus": "status",
+    "TopologyCache": "cache",
+    "Throughput": "throughput",
+    "ThroughputSampler": "throughput",
+    "HistorySample": "history",
+    "StatusHistory": "history",
+    "CommandMetrics": "metrics",
+    "Transport": "transport",
+    "TransportError": "transport",
+    "TransportUnavailable": "transport",
+    "CliTransport": "transport",
+    "FallbackTransport": "transport",
+    "FakeTransport": "transport",
+    "RecordingTransport": "transport",
+    "ReplayTransport": "transport",
+    "DaemonTransport": "ipc",
+    "StatusSubscriber": "ipc",
+    "NordVpn": "nordvpn",
+    "StatusDaemon": "server",
+    "ConnectionManager": "connection",
+    "ProbeResult": "probe",
+    "AsyncNordVpn": "async_nordvpn",
+}
+
+__all__ = list(_EXPORTS)
+
+if TYPE_CHECKING:
+    from .snapshot import Snapshot, FrozenInstanceError  # NOQA # isort:skip
+    from .settings import (  # NOQA # isort:skip
+        NordVpnSettings,
+        SettingsNames,
+        Technologies,
+        Protocols,
+        SettingResult,
+    )
+    from .status import NordVpnStatus, ConnectionStatus  # NOQA # isort:skip
+    from .cache import TopologyCache  # NOQA # isort:skip
+    from .throughput import Throughput, ThroughputSampler  # NOQA # isort:skip
+    from .history import HistorySample, StatusHistory  # NOQA # isort:skip
+    from .metrics import CommandMetrics  # NOQA # isort:skip
+    from .transport import (  # NOQA # isort:skip
+        Transport,
+        TransportError,
+        TransportUnavailable,
+        CliTransport,
+        FallbackTransport,
+        FakeTransport,
+        RecordingTransport,
+        ReplayTransport,
+    )
+    from .ipc import DaemonTransport, StatusSubscriber  # NOQA # isort:skip
+    from .nordvpn import NordVpn  # NOQA # isort:skip
+    from .server import StatusDaemon  # NOQA # isort:skip
+    from .connection import ConnectionManager  # NOQA # isort:skip
+    from .probe import ProbeResult  # NOQA # isort:skip
+    from .async_nordvpn import AsyncNordVpn  # NOQA # isort:skip
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    # __import__ with a fromlist returns the submodule itself
+    value = getattr(__import__(f"{__name__}.{module}", fromlist=[name]), name)
+    # Later accesses find the name in the module and skip __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+
+import argparse
+import signal
+from typing import Optional
+
+from nordvpn import NordVpn, StatusDaemon
+from nordvpn.ipc import default_socket_path
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m nordvpn")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve = commands.add_parser(
+        "serve", help="poll the nordvpn status and share it on a unix socket"
+    )
+    serve.add_argument(
+        "--socket",
+        default=default_socket_path(),
+        help="path of the unix socket (default: %(default)s)",
+    )
+    serve.add_argument(
+        "--interval",
+        type=float,
+        default=2.0,
+        help="seconds between the status polls (default: %(default)s)",
+    )
+    args = parser.parse_args(argv)
+
+    daemon = StatusDaemon(NordVpn(), socket_path=args.socket, interval=args.interval)
+    signal.signal(signal.SIGTERM, lambda *_: daemon.stop())
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        daemon.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+import asyncio
+from typing import Any, Iterable, Mapping, Optional
+
+from nordvpn.base import NordVpnBase
+from nordvpn.settings import (
+    RECONNECT_SETTINGS,
+    NordVpnSettings,
+    Protocols,
+    SettingResult,
+    SettingsNames,
+    Technologies,
+)
+from nordvpn.status import ConnectionStatus, NordVpnStatus
+
+
+class AsyncNordVpn(NordVpnBase):
+    """
+    NordVPN asyncio client interface.
+
+    Every call spawns the nordvpn CLI with asyncio subprocesses, so many
+    queries can run concurrently from a single event loop. Each command is
+    bounded by the client timeout: on timeout or cancellation the nordvpn
+    process is killed and the exception is propagated to the caller.
+    """
+
+    DEFAULT_TIMEOUT_SECONDS = 30.0
+
+    def __init__(self, timeout: Optional[float] = DEFAULT_TIMEOUT_SECONDS):
+        self.timeout = timeout
+
+    # Connection interfaces
+
+    async def connect(self) -> bool:
+        """
+        Connect with a NordVpn server
+        """
+        return await self._run_nordvpn_connect_command()
+
+    async def connect_to_country(self, country: str) -> bool:
+        """
+        Connect to a NordVpn server in the specified country
+        """
+        return await self._run_nordvpn_connect_command(country)
+
+    async def connect_to_group(self, group: str) -> bool:
+        """
+        Connect to a NordVpn server group
+        """
+        return await self._run_nordvpn_connect_command(group)
+
+    async def connect_to_city(self, city: str) -> bool:
+        """
+        Connect to a specific NordVpn city server
+        """
+        return await self._run_nordvpn_connect_command(city)
+
+    async def connect_to_server(self, server: str) -> bool:
+        """
+        Connect to a specific NordVpn server, e.g. "it42" or "it42.nordvpn.com"
+        """
+        return await self._run_nordvpn_connect_command(self._server_target(server))
+
+    async def disconnect(self) -> bool:
+        """
+        Disconnect from the NordVpn server
+        """
+        output = await self._run_nordvpn_command("disconnect")
+        return self._is_disconnect_success(output)
+
+    # Getters and Setters interfaces
+
+    async def get_status(self) -> NordVpnStatus:
+        """
+        Returns the VPN connection status
+        """
+        return NordVpnStatus(await self._run_nordvpn_command("status"))
+
+    async def get_countries(self) -> list[str]:
+        """
+        Returns a list of string representing the available countries
+        """
+        return self._parse_word_list(await self._run_nordvpn_command("countries"))
+
+    async def get_groups(self) -> list[str]:
+        """
+        Returns a list of string representing the available groups
+        """
+        return self._parse_word_list(await self._run_nordvpn_command("groups"))
+
+    async def get_cities(self, country: str) -> list[str]:
+        """
+        Return the list of cities available for the specified country
+        """
+        return self._parse_cities(await self._run_nordvpn_command(f"cities {country}"))
+
+    async def get_cities_for(
+        self, countries: Iterable[str], max_concurrency: Optional[int] = None
+    ) -> dict[str, list[str]]:
+        """
+        Return the cities available for each of the specified countries,
+        running at most max_concurrency nordvpn processes at the same time
+        """
+        countries = list(countries)
+        semaphore = asyncio.Semaphore(
+            max(1, max_concurrency or self.MAX_CONCURRENT_COMMANDS)
+        )
+
+        async def _get_cities(country: str) -> list[str]:
+            async with semaphore:
+                return await self.get_cities(country)
+
+        results = await asyncio.gather(*(_get_cities(c) for c in countries))
+        return dict(zip(countries, results))
+
+    async def get_settings_help_message(self, setting: SettingsNames) -> str:
+        """
+        Returns the help message relative to the specified setting
+        """
+        return await self._run_nordvpn_command(self._set_args(setting, "--help"))
+
+    async def get_settings(self) -> NordVpnSettings:
+        """
+        Return the current NordVpn settings
+        """
+        return NordVpnSettings(await self._run_nordvpn_command("settings"))
+
+    async def set_technology(self, technology: Technologies) -> bool:
+        return await self._run_nordvpn_set_command(
+            SettingsNames.TECHNOLOGY, technology.value.lower()
+        )
+
+    async def set_protocol(self, protocol: Protocols) -> bool:
+        return await self._run_nordvpn_set_command(
+            SettingsNames.PROTOCOL, protocol.value.lower()
+        )
+
+    async def set_firewall(self, enable: bool) -> bool:
+        return await self._run_nordvpn_set_command(
+            SettingsNames.FIREWALL, self._on_off(enable)
+        )
+
+    async def set_kill_switch(self, enable: bool) -> bool:
+        return await self._run_nordvpn_set_command(
+            SettingsNames.KILL_SWITCH, self._on_off(enable)
+        )
+
+    async def set_cybersec(self, enable: bool) -> bool:
+        return await self._run_nordvpn_set_command(
+            SettingsNames.CYBERSEC, self._on_off(enable)
+        )
+
+    async def set_notify(self, enable: bool) -> bool:
+        return await self._run_nordvpn_set_command(
+            SettingsNames.NOTIFY, self._on_off(enable)
+        )
+
+    async def set_auto_connect(self, enable: bool, args: Optional[str] = None) -> bool:
+        return await self._run_nordvpn_set_command(
+            SettingsNames.AUTO_CONNECT, self._auto_connect_value(enable, args)
+        )
+
+    async def set_ipv6(self, enable: bool) -> bool:
+        return await self._run_nordvpn_set_command(
+            SettingsNames.IPV6, self._on_off(enable)
+        )
+
+    async def set_dns(self, enable: bool, servers: list[str] = []) -> bool:
+        return await self._run_nordvpn_set_command(
+            SettingsNames.DNS, self._dns_value(enable, servers)
+        )
+
+    async def apply_settings(
+        self, desired: Mapping[SettingsNames, Any], reconnect: bool = True
+    ) -> dict[SettingsNames, SettingResult]:
+        """
+        Apply the desired settings, running only the commands changing them,
+        and return the result of each setting. See NordVpn.apply_settings
+        """
+        changes = self._settings_changes(await self.get_settings(), desired)
+        results = {setting: SettingResult.UNCHANGED for setting in desired}
+        for setting, commands in changes.items():
+            applied = True
+            for args in commands:
+                output = await self._run_nordvpn_command(args)
+                if not self._is_valid_command(output):
+                    applied = False
+                    break
+            results[setting] = (
+                SettingResult.APPLIED if applied else SettingResult.FAILED
+            )
+
+        pending = [
+            setting
+            for setting in RECONNECT_SETTINGS
+            if results.get(setting) == SettingResult.APPLIED
+        ]
+        if reconnect and pending and not await self._reconnect():
+            for setting in pending:
+                results[setting] = SettingResult.RECONNECT_FAILED
+        return results
+
+    async def add_whitelisted_subnet(self, subnet: str) -> bool:
+        return await self._run_nordvpn_whitelist_command(f"add subnet {subnet}")
+
+    async def remove_whitelisted_subnet(self, subnet: str) -> bool:
+        return await self._run_nordvpn_whitelist_command(f"remove subnet {subnet}")
+
+    async def add_whitelisted_port(
+        self, port: str, protocol: Optional[Protocols] = None
+    ) -> bool:
+        return await self._run_nordvpn_whitelist_command(
+            self._whitelist_port_args("add", port, protocol)
+        )
+
+    async def remove_whitelisted_port(
+        self, port: str, protocol: Optional[Protocols] = None
+    ) -> bool:
+        return await self._run_nordvpn_whitelist_command(
+            self._whitelist_port_args("remove", port, protocol)
+        )
+
+    async def _run_command(self, command: str) -> str:
+        """
+        Run a shell command and returns its output.
+        Raises asyncio.TimeoutError if the command exceeds the client timeout
+        """
+        args = command.strip().split()
+        process = await asyncio.create_subprocess_exec(
+            *args, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        )
+        try:
+            stdout, _ = await asyncio.wait_for(
+                process.communicate(), timeout=self.timeout
+            )
+        except BaseException:
+            # Timed out or cancelled, don't leave the process behind
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+            raise
+        output = stdout.decode()
+        return output.strip() if process.returncode == 0 else output
+
+    async def _reconnect(self) -> bool:
+        """
+        Reconnect to the current server if connected, return False if the
+        connection couldn't be re-established
+        """
+        status = await self.get_status()
+        if status.status != ConnectionStatus.CONNECTED:
+            return True
+        await self.disconnect()
+        if status.current_server:
+            return await self.connect_to_server(status.current_server)
+        return await self.connect()
+
+    async def _run_nordvpn_command(self, args: str) -> str:
+        """
+        Run a nordvpn command
+        """
+        return await self._run_command(f"nordvpn {args}")
+
+    async def _run_nordvpn_connect_command(self, args: str = "") -> bool:
+        """
+        Run a nordvpn connect command and return True if successful
+        """
+        output = await self._run_nordvpn_command(self._connect_args(args))
+        return self._is_connect_success(output)
+
+    async def _run_nordvpn_set_command(self, setting: SettingsNames, args: str) -> bool:
+        """
+        Run a nordvpn set command and return True if successful
+        """
+        output = await self._run_nordvpn_command(self._set_args(setting, args))
+        return self._is_valid_command(output)
+
+    async def _run_nordvpn_whitelist_command(self, args: str) -> bool:
+        """
+        Run a nordvpn whitelist command and return True if successful
+        """
+        output = await self._run_nordvpn_command(f"whitelist {args}")
+        return self._is_valid_command(output)
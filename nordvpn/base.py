@@ -0,0 +1,168 @@
+from enum import Enum, unique
+from typing import Any, Mapping, Optional
+
+from nordvpn.settings import (
+    RECONNECT_SETTINGS,
+    NordVpnSettings,
+    Protocols,
+    SettingsNames,
+)
+from nordvpn.utils import parse_words
+
+
+class NordVpnBase:
+    """
+    Commands formatting and output parsing shared by the NordVPN clients
+    """
+
+    @unique
+    class Messages(Enum):
+        UPDATE_WARNING = (
+            "A new version of NordVpn is available! Please update the application."
+        )
+        LOGIN_WARNING = "Please enter your login details."
+        CONNECT_SUCCESS = "You are connected to"
+        DISCONNECT_SUCCESS = "You are disconnected from NordVPN"
+        INVALID_COMMAND = "The command you entered is not valid."
+        INVALID_CITIES_COMMAND = "Servers by city are not available for this country"
+        NEW_FEATURE_MESHNET = "New feature - Meshnet! Link remote devices in Meshnet to connect to them directly over encrypted private tunnels, and route your traffic through another device. Use the `nordvpn meshnet --help` command to get started. Learn more: https://nordvpn.com/features/meshnet/"
+
+    # Default number of concurrent nordvpn processes used by batch queries
+    MAX_CONCURRENT_COMMANDS = 8
+
+    def _connect_args(self, target: str = "") -> str:
+        """
+        Return the arguments of the nordvpn connect command for the target
+        """
+        return f"connect {target.replace(' ', '_')}"
+
+    def _set_args(self, setting: SettingsNames, value: str) -> str:
+        """
+        Return the arguments of the nordvpn set command for the setting
+        """
+        formatted_setting = self._format_setting_name(setting.value.lower())
+        return f"set {formatted_setting} {value}"
+
+    def _on_off(self, enable: bool) -> str:
+        """
+        Return the nordvpn set command value for a boolean setting
+        """
+        return "on" if enable else "off"
+
+    def _auto_connect_value(self, enable: bool, args: Optional[str] = None) -> str:
+        """
+        Return the nordvpn set command value for the auto-connect setting
+        """
+        if enable and args is not None:
+            return f"on {args}"
+        return self._on_off(enable)
+
+    def _dns_value(self, enable: bool, servers: list[str]) -> str:
+        """
+        Return the nordvpn set command value for the DNS setting
+        """
+        return " ".join(servers) if enable else "off"
+
+    def _whitelist_port_args(
+        self, action: str, port: str, protocol: Optional[Protocols] = None
+    ) -> str:
+        """
+        Return the arguments of the nordvpn whitelist command for a port
+        """
+        args = f"{action} port {port}"
+        if protocol:
+            args += f" {protocol.value}"
+        return args
+
+    def _server_target(self, server: str) -> str:
+        """
+        Return the connect target of a server, e.g. "it42" for
+        "it42.nordvpn.com"
+        """
+        return server.split(".", 1)[0]
+
+    def _settings_changes(
+        self, current: NordVpnSettings, desired: Mapping[SettingsNames, Any]
+    ) -> dict[SettingsNames, list[str]]:
+        """
+        Return the arguments of the nordvpn commands applying each desired
+        setting different from the current one. The settings forcing a
+        reconnection come last, technology before protocol.
+
+        Boolean settings take a bool, technology and protocol their enums,
+        whitelisted subnets the complete list of subnets and DNS either False
+        or the list of servers, always applied since the current servers
+        are not reported
+        """
+        changes: dict[SettingsNames, list[str]] = {}
+        ordered = [s for s in desired if s not in RECONNECT_SETTINGS]
+        ordered += [s for s in RECONNECT_SETTINGS if s in desired]
+        for setting in ordered:
+            value = desired[setting]
+            if setting == SettingsNames.WHITELISTED_SUBNETS:
+                subnets = current.whitelisted_subnets
+                args = [
+                    f"whitelist remove subnet {s}" for s in subnets if s not in value
+                ]
+                args += [f"whitelist add subnet {s}" for s in value if s not in subnets]
+                if args:
+                    changes[setting] = args
+            elif setting == SettingsNames.DNS and not isinstance(value, bool):
+                changes[setting] = [
+                    self._set_args(setting, self._dns_value(True, value))
+                ]
+            elif current.value_of(setting) != value:
+                changes[setting] = [self._set_args(setting, self._setting_value(value))]
+        return changes
+
+    def _setting_value(self, value: Any) -> str:
+        """
+        Return the nordvpn set command value for a bool or enum setting value
+        """
+        if isinstance(value, bool):
+            return self._on_off(value)
+        if isinstance(value, Enum):
+            return str(value.value).lower()
+        raise ValueError(f"Unsupported setting value {value!r}")
+
+    def _is_connect_success(self, output: str) -> bool:
+        return self.Messages.CONNECT_SUCCESS.value in output
+
+    def _is_disconnect_success(self, output: str) -> bool:
+        return self.Messages.DISCONNECT_SUCCESS.value in output
+
+    def _is_valid_command(self, output: str) -> bool:
+        return self.Messages.INVALID_COMMAND.value not in output
+
+    def _parse_word_list(self, raw: Optional[str]) -> list[str]:
+        """
+        Parse the output of the nordvpn commands listing words, like countries
+        or groups, and return the sorted list of words
+        """
+        if raw is None:
+            return []
+        words = parse_words(self._clean_command_output(raw))
+        words.sort()
+        return words
+
+    def _parse_cities(self, raw: Optional[str]) -> list[str]:
+        """
+        Parse the output of the nordvpn cities command
+        """
+        if (raw is None) or (self.Messages.INVALID_CITIES_COMMAND.value in raw):
+            return []
+        return self._parse_word_list(raw)
+
+    def _format_setting_name(self, setting_name: str) -> str:
+        """
+        Return the given setting name formatted for compatibility
+        for "nordvpn set" command
+        """
+        return setting_name.replace(" ", "").replace("-", "").lower()
+
+    def _clean_command_output(self, command_output: str) -> str:
+        """Removes any known NordVpn news or warning from the command output and
+        returns the cleaned up output
+        """
+        clean = command_output.replace(self.Messages.NEW_FEATURE_MESHNET.value, "")
+        return clean
@@ -0,0 +1,158 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional
+
+CacheListener = Callable[[str, list[str]], None]
+
+
+def default_cache_dir() -> str:
+    """
+    Return the directory where the nordvpn cache files are stored,
+    following the XDG base directory specification
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(base, "nordvpn-indicator")
+
+
+class TopologyCache:
+    """
+    Persistent on-disk cache for the NordVpn servers topology
+    (countries, groups and cities).
+
+    Each entry stores its value together with the time it has been fetched
+    and its own time-to-live. Stale entries are still served, it's up to the
+    caller to refresh them.
+    """
+
+    FORMAT_VERSION = 1
+    FILENAME = "topology.json"
+    DEFAULT_TTL_SECONDS = 24 * 60 * 60
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        ttl: float = DEFAULT_TTL_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = path or os.path.join(default_cache_dir(), self.FILENAME)
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._listeners: list[CacheListener] = []
+        self._entries: dict[str, dict[str, Any]] = self._load()
+        # Writes are deferred while batches are open, the file is saved once
+        self._batches = 0
+        self._dirty = False
+
+    def get(self, key: str) -> Optional[list[str]]:
+        """
+        Return the cached value for the given key or None if not cached
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            return list(entry["value"]) if entry else None
+
+    def is_stale(self, key: str) -> bool:
+        """
+        Return True if the entry is missing or older than its time-to-live
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return True
+            return self._clock() - entry["timestamp"] >= entry["ttl"]
+
+    def set(self, key: str, value: list[str], ttl: Optional[float] = None) -> bool:
+        """
+        Store the value for the given key and persist the cache on disk, once
+        the batches open are closed. Listeners are notified only if the value differs from the cached one.
+        Returns True if the value has changed
+        """
+        with self._lock:
+            previous = self._entries.get(key)
+            changed = previous is None or previous["value"] != value
+            self._entries[key] = {
+                "value": list(value),
+                "timestamp": self._clock(),
+                "ttl": self.ttl if ttl is None else ttl,
+            }
+            self._save_or_defer()
+            listeners = list(self._listeners)
+        if changed:
+            for listener in listeners:
+                listener(key, list(value))
+        return changed
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """
+        Write the cache file once for all the entries set in the block, also
+        from other threads, instead of once per entry
+        """
+        with self._lock:
+            self._batches += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._batches -= 1
+                if self._batches == 0 and self._dirty:
+                    self._save()
+
+    def subscribe(self, listener: CacheListener) -> None:
+        """
+        Register a callback invoked with (key, value) whenever an entry changes
+        """
+        with self._lock:
+            self._listeners.append(listener)
+
+    def clear(self) -> None:
+        """
+        Remove all the entries from the cache
+        """
+        with self._lock:
+            self._entries = {}
+            self._save_or_defer()
+
+    def _load(self) -> dict[str, dict[str, Any]]:
+        """
+        Read the cache file, ignoring it if unreadable or of a different version
+        """
+        try:
+            with open(self.path, "r") as f:
+                content = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(content, dict):
+            return {}
+        if content.get("version") != self.FORMAT_VERSION:
+            return {}
+        entries = content.get("entries")
+        return entries if isinstance(entries, dict) else {}
+
+    def _save_or_defer(self) -> None:
+        if self._batches:
+            self._dirty = True
+        else:
+            self._save()
+
+    def _save(self) -> None:
+        """
+        Atomically write the cache file. Failures are ignored as the cache
+        is only an optimisation
+        """
+        self._dirty = False
+        content = {"version": self.FORMAT_VERSION, "entries": self._entries}
+        tmp_path = f"{self.path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(tmp_path, "w") as f:
+                json.dump(content, f)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
@@ -0,0 +1,202 @@
+import threading
+import time
+from typing import Any, Callable, Optional
+
+from nordvpn.metrics import CommandMetrics
+from nordvpn.nordvpn import NordVpn
+from nordvpn.status import ConnectionStatus, NordVpnStatus
+
+# Names of the transitions timed by the connection manager, prefixed to share
+# the metrics with the nordvpn commands
+TRANSITION_CONNECT = "transition:connect"
+TRANSITION_SWITCH = "transition:switch"
+TRANSITION_DISCONNECT = "transition:disconnect"
+
+
+def _same_place(name: Optional[str], target: str) -> bool:
+    """
+    Compare a country or city of the status with a connect target, which
+    uses underscores in place of spaces
+    """
+    if name is None:
+        return False
+    return name.replace("_", " ").casefold() == target.replace("_", " ").casefold()
+
+
+class ConnectionManager:
+    """
+    Connect and disconnect skipping the transitions that change nothing.
+
+    The last known status is fed by observe, e.g. from the status polls, and
+    read again with NordVpn.get_status when older than max_status_age
+    seconds. Connecting to the country, city or server already in use,
+    connecting automatically when the connection in use was made
+    automatically and disconnecting while disconnected are skipped. Switching server runs
+    a single connect command, since the nordvpn CLI replaces the current
+    connection, unless disconnect_before_switch is True.
+
+    on_transition is called before running the nordvpn commands of each
+    transition, and not for the transitions skipped.
+
+    The duration of each transition is recorded in metrics under the
+    "transition:connect", "transition:switch" and "transition:disconnect"
+    names. Transitions run one at a time, while the status can be observed
+    during the nordvpn commands
+    """
+
+    def __init__(
+        self,
+        nordvpn: NordVpn,
+        max_status_age: float = 5.0,
+        disconnect_before_switch: bool = False,
+        metrics: Optional[CommandMetrics] = None,
+        clock: Callable[[], float] = time.monotonic,
+        on_transition: Optional[Callable[[], Any]] = None,
+    ) -> None:
+        self.nordvpn = nordvpn
+        self.max_status_age = max_status_age
+        self.disconnect_before_switch = disconnect_before_switch
+        self.metrics = metrics or CommandMetrics()
+        self.skipped = 0
+        self._clock = clock
+        self._on_transition = on_transition
+        self._status: Optional[NordVpnStatus] = None
+        self._status_time = 0.0
+        # Whether the connection in use was made by connect, as the status
+        # doesn't tell an automatic server from a chosen one
+        self._auto_connected = False
+        # Guards the status, never held while running a nordvpn command
+        self._lock = threading.Lock()
+        self._transition_lock = threading.Lock()
+
+    def observe(self, status: NordVpnStatus) -> None:
+        """
+        Record the status just read from the nordvpn CLI
+        """
+        with self._lock:
+            self._status = status
+            self._status_time = self._clock()
+            if status.status == ConnectionStatus.DISCONNECTED:
+                self._auto_connected = False
+
+    def status(self) -> NordVpnStatus:
+        """
+        Return the last known status, read again if too old
+        """
+        with self._lock:
+            if self._status is not None:
+                if self._clock() - self._status_time < self.max_status_age:
+                    return self._status
+        status = self.nordvpn.get_status()
+        self.observe(status)
+        return status
+
+    def connect(self) -> bool:
+        """
+        Connect to an automatic server, unless already connected to one
+        """
+        return self._connect(
+            lambda status: self._auto_connected,
+            self.nordvpn.connect,
+            auto=True,
+        )
+
+    def connect_to_country(self, country: str) -> bool:
+        """
+        Connect to a server in the country, unless already connected there
+        """
+        return self._connect(
+            lambda status: _same_place(status.country, country),
+            self.nordvpn.connect_to_country,
+            country,
+        )
+
+    def connect_to_city(self, city: str) -> bool:
+        """
+        Connect to a server in the city, unless already connected there
+        """
+        return self._connect(
+            lambda status: _same_place(status.city, city),
+            self.nordvpn.connect_to_city,
+            city,
+        )
+
+    def connect_to_group(self, group: str) -> bool:
+        """
+        Connect to a server of the group. The status doesn't report the
+        group, so the connection always runs
+        """
+        return self._connect(
+            lambda status: False,
+            self.nordvpn.connect_to_group,
+            group,
+        )
+
+    def connect_to_server(self, server: str) -> bool:
+        """
+        Connect to the server, e.g. "it42", unless already connected to it
+        """
+        server_target = self.nordvpn._server_target
+        target = server_target(server)
+        return self._connect(
+            lambda status: server_target(status.current_server or "") == target,
+            self.nordvpn.connect_to_server,
+            server,
+        )
+
+    def disconnect(self) -> bool:
+        """
+        Disconnect, unless already disconnected
+        """
+        with self._transition_lock:
+            if self.status().status == ConnectionStatus.DISCONNECTED:
+                self.skipped += 1
+                return True
+            self._notify_transition()
+            start = self._clock()
+            success = self.nordvpn.disconnect()
+            self.metrics.record(
+                TRANSITION_DISCONNECT, self._clock() - start, not success
+            )
+            if success:
+                self.observe(NordVpnStatus("Status: Disconnected"))
+            else:
+                self._forget_status()
+            return success
+
+    def _connect(
+        self,
+        is_current: Callable[[NordVpnStatus], bool],
+        connect: Callable[..., bool],
+        *args: str,
+        auto: bool = False,
+    ) -> bool:
+        """
+        Run the connect function unless is_current tells the connection in use
+        already satisfies it. auto tells whether it connects automatically
+        """
+        with self._transition_lock:
+            status = self.status()
+            connected = status.status == ConnectionStatus.CONNECTED
+            if connected and is_current(status):
+                self.skipped += 1
+                return True
+            transition = TRANSITION_SWITCH if connected else TRANSITION_CONNECT
+            self._notify_transition()
+            start = self._clock()
+            if connected and self.disconnect_before_switch:
+                self.nordvpn.disconnect()
+            success = connect(*args)
+            self.metrics.record(transition, self._clock() - start, not success)
+            self._auto_connected = auto and success
+            # The new server is only known reading the status again
+            self._forget_status()
+            return success
+
+    def _notify_transition(self) -> None:
+        if self._on_transition is not None:
+            self._on_transition()
+
+    def _forget_status(self) -> None:
+        with self._lock:
+            self._status = None
@@ -0,0 +1,305 @@
+import atexit
+import csv
+import json
+import threading
+import time
+from array import array
+from typing import IO, Any, Callable, Iterator, Optional
+
+from nordvpn.snapshot import Snapshot
+from nordvpn.status import ConnectionStatus, NordVpnStatus
+
+# Codes of the connection states stored in the history
+_STATES = tuple(ConnectionStatus)
+_STATE_CODES = {state: code for code, state in enumerate(_STATES)}
+# Stored in place of a missing counter or server
+_MISSING = -1
+CSV_COLUMNS = ("timestamp", "status", "received_bytes", "sent_bytes", "server")
+# Time after notify_user_transition during which leaving the connected state
+# is attributed to the user rather than counted as a drop
+USER_TRANSITION_SECONDS = 60.0
+
+
+def _is_drop(previous: Optional[ConnectionStatus], current: ConnectionStatus) -> bool:
+    """
+    Whether the transition between the states is a connection drop
+    """
+    if previous != ConnectionStatus.CONNECTED:
+        return False
+    return current != ConnectionStatus.CONNECTED
+
+
+class HistorySample(Snapshot):
+    """
+    Status sample stored in the history
+    """
+
+    __slots__ = ("timestamp", "status", "received_bytes", "sent_bytes", "server")
+
+    timestamp: float
+    status: ConnectionStatus
+    received_bytes: Optional[int]
+    sent_bytes: Optional[int]
+    server: Optional[str]
+
+    def __init__(
+        self,
+        timestamp: float,
+        status: ConnectionStatus,
+        received_bytes: Optional[int],
+        sent_bytes: Optional[int],
+        server: Optional[str],
+    ):
+        self._init_fields(
+            timestamp=timestamp,
+            status=status,
+            received_bytes=received_bytes,
+            sent_bytes=sent_bytes,
+            server=server,
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "timestamp": self.timestamp,
+            "status": self.status.value,
+            "received_bytes": self.received_bytes,
+            "sent_bytes": self.sent_bytes,
+            "server": self.server,
+        }
+
+
+class StatusHistory:
+    """
+    Fixed size ring buffer of the status samples.
+
+    Each field is a column stored in a typed array preallocated to the
+    capacity, so appending is O(1) and the memory doesn't grow once the buffer
+    is full: the oldest samples are overwritten. Server names are interned
+    and stored as ids, the names no longer in the buffer are released. Drops,
+    i.e. transitions from connected to any other state, are counted since the
+    creation of the history, also when the samples are overwritten. The
+    transitions started by the user, reported with notify_user_transition,
+    are not drops
+    """
+
+    FORMAT_VERSION = 1
+
+    def __init__(
+        self,
+        capacity: int = 65536,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if capacity <= 0:
+            raise ValueError("The capacity must be positive")
+        self.capacity = capacity
+        self._clock = clock
+        self._timestamps = array("d", [0.0]) * capacity
+        self._states = array("b", [0]) * capacity
+        self._received = array("q", [0]) * capacity
+        self._sent = array("q", [0]) * capacity
+        self._servers = array("l", [0]) * capacity
+        # Whether each sample left the connected state because of the user
+        self._user = array("b", [0]) * capacity
+        self._server_ids: dict[str, int] = {}
+        self._server_names: list[Optional[str]] = []
+        # Number of samples referencing each server id, and the ids released
+        self._server_refs: list[int] = []
+        self._free_ids: list[int] = []
+        self._start = 0
+        self._size = 0
+        self._last_state: Optional[ConnectionStatus] = None
+        self._user_transition_time: Optional[float] = None
+        self._lock = threading.Lock()
+        self.overwritten = 0
+        self.drops = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, status: NordVpnStatus, timestamp: Optional[float] = None) -> None:
+        """
+        Add a status sample, taken now if timestamp is not specified
+        """
+        if timestamp is None:
+            timestamp = self._clock()
+        with self._lock:
+            if self._size < self.capacity:
+                index = (self._start + self._size) % self.capacity
+                self._size += 1
+            else:
+                index = self._start
+                self._start = (self._start + 1) % self.capacity
+                self.overwritten += 1
+                self._release(self._servers[index])
+            self._timestamps[index] = timestamp
+            self._states[index] = _STATE_CODES[status.status]
+            self._received[index] = self._counter(status.received_bytes)
+            self._sent[index] = self._counter(status.sent_bytes)
+            self._servers[index] = self._intern(status.current_server)
+            self._user[index] = 0
+            if _is_drop(self._last_state, status.status):
+                if self._is_user_transition(timestamp):
+                    self._user[index] = 1
+                else:
+                    self.drops += 1
+            if status.status != self._last_state:
+                self._user_transition_time = None
+            self._last_state = status.status
+
+    def notify_user_transition(self) -> None:
+        """
+        Report that the user is connecting or disconnecting, so leaving the
+        connected state next is not counted as a drop
+        """
+        with self._lock:
+            self._user_transition_time = self._clock()
+
+    def samples(self, since: Optional[float] = None) -> Iterator[HistorySample]:
+        """
+        Iterate the samples from the oldest, optionally only the ones taken
+        at or after the since timestamp
+        """
+        with self._lock:
+            indexes = [(self._start + i) % self.capacity for i in range(self._size)]
+            rows = [
+                (
+                    self._timestamps[i],
+                    self._states[i],
+                    self._received[i],
+                    self._sent[i],
+                    self._servers[i],
+                )
+                for i in indexes
+            ]
+            names = list(self._server_names)
+        for timestamp, state, received, sent, server in rows:
+            if since is not None and timestamp < since:
+                continue
+            yield HistorySample(
+                timestamp,
+                _STATES[state],
+                None if received == _MISSING else received,
+                None if sent == _MISSING else sent,
+                None if server == _MISSING else names[server],
+            )
+
+    def count_drops(self, since: Optional[float] = None) -> int:
+        """
+        Count the drops among the stored samples, optionally only the ones
+        happened at or after the since timestamp
+        """
+        with self._lock:
+            indexes = [(self._start + i) % self.capacity for i in range(self._size)]
+            rows = [
+                (self._timestamps[i], _STATES[self._states[i]], self._user[i])
+                for i in indexes
+            ]
+        drops = 0
+        previous: Optional[ConnectionStatus] = None
+        for timestamp, state, user in rows:
+            dropped = not user and _is_drop(previous, state)
+            if dropped and (since is None or timestamp >= since):
+                drops += 1
+            previous = state
+        return drops
+
+    def clear(self) -> None:
+        """
+        Discard all the samples and counters
+        """
+        with self._lock:
+            self._start = 0
+            self._size = 0
+            self._last_state = None
+            self._user_transition_time = None
+            self._server_ids = {}
+            self._server_names = []
+            self._server_refs = []
+            self._free_ids = []
+            self.overwritten = 0
+            self.drops = 0
+
+    def write_csv(self, f: IO[str]) -> None:
+        """
+        Write the samples to a text file as CSV with a header row
+        """
+        writer = csv.writer(f)
+        writer.writerow(CSV_COLUMNS)
+        for sample in self.samples():
+            row = sample.to_dict()
+            writer.writerow(
+                "" if row[column] is None else row[column] for column in CSV_COLUMNS
+            )
+
+    def write_json(self, f: IO[str]) -> None:
+        """
+        Write the samples and counters to a text file as JSON
+        """
+        json.dump(
+            {
+                "version": self.FORMAT_VERSION,
+                "capacity": self.capacity,
+                "overwritten": self.overwritten,
+                "drops": self.drops,
+                "samples": [sample.to_dict() for sample in self.samples()],
+            },
+            f,
+        )
+
+    def dump(self, path: str) -> None:
+        """
+        Write the history to a CSV file if the path ends with ".csv",
+        otherwise to a JSON file
+        """
+        with open(path, "w", newline="") as f:
+            if path.endswith(".csv"):
+                self.write_csv(f)
+            else:
+                self.write_json(f)
+
+    def dump_on_exit(self, path: str) -> None:
+        """
+        Write the history to a file when the interpreter exits
+        """
+        atexit.register(self.dump, path)
+
+    def _intern(self, server: Optional[str]) -> int:
+        if server is None:
+            return _MISSING
+        server_id = self._server_ids.get(server)
+        if server_id is None:
+            if self._free_ids:
+                server_id = self._free_ids.pop()
+                self._server_names[server_id] = server
+            else:
+                server_id = len(self._server_names)
+                self._server_names.append(server)
+                self._server_refs.append(0)
+            self._server_ids[server] = server_id
+        self._server_refs[server_id] += 1
+        return server_id
+
+    def _release(self, server_id: int) -> None:
+        """
+        Drop a reference to the server id of an overwritten sample, the name
+        is released when no sample uses it anymore
+        """
+        if server_id == _MISSING:
+            return
+        self._server_refs[server_id] -= 1
+        if self._server_refs[server_id] == 0:
+            name = self._server_names[server_id]
+            assert name is not None
+            del self._server_ids[name]
+            self._server_names[server_id] = None
+            self._free_ids.append(server_id)
+
+    def _is_user_transition(self, timestamp: float) -> bool:
+        started = self._user_transition_time
+        if started is None:
+            return False
+        return timestamp - started <= USER_TRANSITION_SECONDS
+
+    @staticmethod
+    def _counter(value: Optional[int]) -> int:
+        return _MISSING if value is None else value
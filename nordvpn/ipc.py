@@ -0,0 +1,271 @@
+import json
+import os
+import select
+import socket
+import stat
+import tempfile
+import threading
+from typing import Any, Callable, Optional
+
+from nordvpn.transport import Transport, TransportError, TransportUnavailable
+
+SOCKET_FILENAME = "nordvpn-indicator.sock"
+# Maximum size of a single message, protects from unbounded reads
+MAX_MESSAGE_SIZE = 1024 * 1024
+# Commands that don't change the state of the VPN, safe to send again
+READ_ONLY_COMMANDS = frozenset(
+    ("status", "countries", "groups", "cities", "settings", "account", "version")
+)
+
+
+def default_socket_path() -> str:
+    """
+    Return the path of the unix socket served by the nordvpn status daemon,
+    in the user runtime directory or else in a private directory of the
+    user under the temporary directory
+    """
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or fallback_runtime_dir()
+    return os.path.join(runtime_dir, SOCKET_FILENAME)
+
+
+def fallback_runtime_dir() -> str:
+    """
+    Return the directory of the user holding the socket when there is no
+    XDG_RUNTIME_DIR, the temporary directory being shared with other users
+    """
+    return os.path.join(tempfile.gettempdir(), f"nordvpn-indicator-{os.getuid()}")
+
+
+def create_private_dir(path: str) -> None:
+    """
+    Create the directory accessible only by the user if missing.
+    Raises OSError if it belongs to another user or others can access it
+    """
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    info = os.lstat(path)
+    owned = stat.S_ISDIR(info.st_mode) and info.st_uid == os.getuid()
+    if not owned or info.st_mode & 0o077:
+        raise OSError(f"{path} is not a directory private to the user")
+
+
+def encode_message(message: dict[str, Any]) -> bytes:
+    """
+    Encode a message as a single line of JSON
+    """
+    return json.dumps(message).encode() + b"\n"
+
+
+def decode_message(line: bytes) -> dict[str, Any]:
+    """
+    Decode a line of JSON into a message. Raises ValueError if invalid
+    """
+    message = json.loads(line)
+    if not isinstance(message, dict):
+        raise ValueError("Invalid message")
+    return message
+
+
+class _ClosedBeforeResponse(TransportError):
+    """
+    Raised when the daemon closed the connection without responding
+    """
+
+
+class DaemonTransport(Transport):
+    """
+    Run the nordvpn commands through a daemon listening on a unix socket
+    instead of spawning the nordvpn CLI.
+
+    Messages are lines of JSON: the request {"command": ["status"]} is
+    answered with {"output": "...", "ok": true}. The connection is kept open
+    across calls and re-established if the daemon closed it while idle, or
+    closed it before responding to a read-only command, which is sent again.
+    Raises TransportUnavailable if the daemon can't be reached, and
+    TransportError if no valid response is received once the command has
+    been sent, since the daemon might be running it.
+    """
+
+    def __init__(
+        self, socket_path: Optional[str] = None, timeout: Optional[float] = 5.0
+    ) -> None:
+        self.socket_path = socket_path or default_socket_path()
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._socket: Optional[socket.socket] = None
+        self._reader: Any = None
+
+    def run(self, args: list[str]) -> str:
+        """
+        Run the nordvpn command with the given arguments and return its output
+        """
+        request = encode_message({"command": args})
+        with self._lock:
+            if self._socket is not None and self._is_closed_by_daemon():
+                self._close()
+            self._ensure_connected()
+            try:
+                response = self._request(request)
+            except _ClosedBeforeResponse:
+                # Closed while the request was in flight, e.g. by a daemon
+                # stopping, retried once when running it again is harmless
+                if not args or args[0] not in READ_ONLY_COMMANDS:
+                    raise
+                self._ensure_connected()
+                response = self._request(request)
+        output = response.get("output")
+        if not isinstance(output, str):
+            raise TransportError("Invalid daemon response")
+        if response.get("ok") is False:
+            # Failed like the nordvpn CLI, see CliTransport
+            raise TransportError(output)
+        return output
+
+    def close(self) -> None:
+        """
+        Close the connection with the daemon
+        """
+        with self._lock:
+            self._close()
+
+    def _request(self, request: bytes) -> dict[str, Any]:
+        assert self._socket is not None
+        try:
+            self._socket.sendall(request)
+            line = self._reader.readline(MAX_MESSAGE_SIZE)
+        except OSError as e:
+            # Timeouts included, the command might be running
+            self._close()
+            raise TransportError(f"No response from the daemon: {e}") from e
+        if not line:
+            self._close()
+            raise _ClosedBeforeResponse("Connection closed by the daemon")
+        if not line.endswith(b"\n"):
+            self._close()
+            raise TransportError("Connection closed by the daemon")
+        try:
+            return decode_message(line)
+        except ValueError:
+            self._close()
+            raise TransportError("Invalid daemon response")
+
+    def _is_closed_by_daemon(self) -> bool:
+        """
+        Tell whether the idle connection has been closed by the daemon,
+        which never sends anything on it unless asked
+        """
+        assert self._socket is not None
+        readable, _, _ = select.select([self._socket], [], [], 0)
+        return bool(readable)
+
+    def _ensure_connected(self) -> None:
+        if self._socket is not None:
+            return
+        try:
+            self._connect()
+        except OSError as e:
+            raise TransportUnavailable(str(e)) from e
+
+    def _connect(self) -> None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            raise
+        self._socket = sock
+        self._reader = sock.makefile("rb")
+
+    def _close(self) -> None:
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+
+class StatusSubscriber:
+    """
+    Receive the status changes pushed by the daemon in a background thread.
+
+    on_status is called with the output of "nordvpn status" every time it
+    changes. When the daemon can't be reached or closes the connection
+    on_disconnect is called and the connection is retried every
+    retry_interval seconds.
+    """
+
+    def __init__(
+        self,
+        on_status: Callable[[str], Any],
+        socket_path: Optional[str] = None,
+        on_disconnect: Optional[Callable[[], Any]] = None,
+        retry_interval: float = 5.0,
+    ) -> None:
+        self.socket_path = socket_path or default_socket_path()
+        self.retry_interval = retry_interval
+        self._on_status = on_status
+        self._on_disconnect = on_disconnect
+        self._stopped = threading.Event()
+        self._lock = threading.Lock()
+        self._socket: Optional[socket.socket] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """
+        Start receiving the status changes
+        """
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop receiving the status changes and close the connection
+        """
+        self._stopped.set()
+        with self._lock:
+            if self._socket is not None:
+                # Wake up the thread blocked reading
+                try:
+                    self._socket.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                self._receive()
+            except (OSError, ValueError):
+                pass
+            if self._stopped.is_set():
+                return
+            if self._on_disconnect is not None:
+                self._on_disconnect()
+            self._stopped.wait(self.retry_interval)
+
+    def _receive(self) -> None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(self.socket_path)
+            with self._lock:
+                if self._stopped.is_set():
+                    return
+                # Registered to be shut down by stop
+                self._socket = sock
+            sock.sendall(encode_message({"op": "subscribe"}))
+            with sock.makefile("rb") as reader:
+                while not self._stopped.is_set():
+                    line = reader.readline(MAX_MESSAGE_SIZE)
+                    if not line.endswith(b"\n"):
+                        return
+                    message = decode_message(line)
+                    output = message.get("output")
+                    if message.get("event") == "status" and isinstance(output, str):
+                        self._on_status(output)
+        finally:
+            with self._lock:
+                self._socket = None
+            sock.close()
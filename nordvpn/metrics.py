@@ -0,0 +1,103 @@
+import atexit
+import bisect
+import json
+import threading
+from typing import Any, Callable
+
+# Upper bounds in seconds of the latency histogram buckets
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class _CommandStats:
+    __slots__ = ("count", "errors", "total_seconds", "max_seconds", "buckets")
+
+    def __init__(self, buckets_count: int) -> None:
+        self.count = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        # One extra bucket for the latencies above the last bound
+        self.buckets = [0] * (buckets_count + 1)
+
+
+class CommandMetrics:
+    """
+    Per-command counters, error counts and latency histograms.
+
+    Histograms use fixed buckets so recording a sample costs a bisect and a
+    few increments. Commands are identified by the nordvpn subcommand name,
+    e.g. "status" or "cities"
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self._stats: dict[str, _CommandStats] = {}
+        self._counters: dict[str, Callable[[], dict[str, int]]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, command: str, seconds: float, error: bool = False) -> None:
+        """
+        Record the execution of a command that took the given seconds
+        """
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            stats = self._stats.get(command)
+            if stats is None:
+                stats = self._stats[command] = _CommandStats(len(self.buckets))
+            stats.count += 1
+            stats.errors += error
+            stats.total_seconds += seconds
+            if seconds > stats.max_seconds:
+                stats.max_seconds = seconds
+            stats.buckets[index] += 1
+
+    def add_counters(self, name: str, source: Callable[[], dict[str, int]]) -> None:
+        """
+        Include the counters returned by source in the snapshots under name,
+        e.g. the updates of the UI pushed and suppressed
+        """
+        with self._lock:
+            self._counters[name] = source
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """
+        Return the metrics of each command, and the counters added, as a JSON
+        serialisable dictionary
+        """
+        labels = [f"le_{bound:g}" for bound in self.buckets] + ["le_inf"]
+        with self._lock:
+            counters = dict(self._counters)
+            snapshot: dict[str, dict[str, Any]] = {
+                command: {
+                    "count": stats.count,
+                    "errors": stats.errors,
+                    "total_seconds": stats.total_seconds,
+                    "mean_seconds": stats.total_seconds / stats.count,
+                    "max_seconds": stats.max_seconds,
+                    "histogram": dict(zip(labels, stats.buckets)),
+                }
+                for command, stats in self._stats.items()
+            }
+        for name, source in counters.items():
+            snapshot[name] = source()
+        return snapshot
+
+    def reset(self) -> None:
+        """
+        Discard all the recorded metrics, the counters added are kept
+        """
+        with self._lock:
+            self._stats = {}
+
+    def dump(self, path: str) -> None:
+        """
+        Write the metrics snapshot to a JSON file
+        """
+        with open(path, "w") as f:
+            json.dump(self.snapshot(), f, indent=2)
+
+    def dump_on_exit(self, path: str) -> None:
+        """
+        Write the metrics snapshot to a JSON file when the interpreter exits
+        """
+        atexit.register(self.dump, path)
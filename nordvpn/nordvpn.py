@@ -1,36 +1,55 @@
-from enum import Enum, unique
-from subprocess import CalledProcessError, run
-from typing import Optional
-
-from nordvpn import (
+import threading
+import time
+from contextlib import nullcontext
+from typing import Any, Callable, Iterable, Mapping, Optional
+
+from nordvpn.base import NordVpnBase
+from nordvpn.cache import TopologyCache
+from nordvpn.metrics import CommandMetrics
+from nordvpn.settings import (
+    RECONNECT_SETTINGS,
+    SETTINGS_FIELDS,
     NordVpnSettings,
-    NordVpnStatus,
     Protocols,
+    SettingResult,
     SettingsNames,
     Technologies,
 )
-from nordvpn.utils import parse_words
+from nordvpn.status import ConnectionStatus, NordVpnStatus
+from nordvpn.transport import CliTransport, Transport, TransportError
 
 
-class NordVpn:
-    """
-    NordVPN Client interface
+class NordVpn(NordVpnBase):
     """
+    NordVPN Client interface.
 
-    @unique
-    class Messages(Enum):
-        UPDATE_WARNING = (
-            "A new version of NordVpn is available! Please update the application."
-        )
-        LOGIN_WARNING = "Please enter your login details."
-        CONNECT_SUCCESS = "You are connected to"
-        DISCONNECT_SUCCESS = "You are disconnected from NordVPN"
-        INVALID_COMMAND = "The command you entered is not valid."
-        INVALID_CITIES_COMMAND = "Servers by city are not available for this country"
-        NEW_FEATURE_MESHNET = "New feature - Meshnet! Link remote devices in Meshnet to connect to them directly over encrypted private tunnels, and route your traffic through another device. Use the `nordvpn meshnet --help` command to get started. Learn more: https://nordvpn.com/features/meshnet/"
+    The settings are cached in memory for settings_ttl seconds, a TTL of 0
+    disables the cache. The setters update the cached settings when they
+    succeed, so only the changes made outside the client wait for the TTL
+    """
 
-    def __init__(self):
-        pass
+    DEFAULT_SETTINGS_TTL_SECONDS = 30.0
+
+    def __init__(
+        self,
+        cache: Optional[TopologyCache] = None,
+        transport: Optional[Transport] = None,
+        metrics: Optional[CommandMetrics] = None,
+        settings_ttl: float = DEFAULT_SETTINGS_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.cache = cache
+        self.transport = transport or CliTransport()
+        self.metrics = metrics or CommandMetrics()
+        self.settings_ttl = settings_ttl
+        self._clock = clock
+        self._refreshing: set[str] = set()
+        self._refreshing_lock = threading.Lock()
+        self._settings: Optional[NordVpnSettings] = None
+        self._settings_expiry = 0.0
+        # Incremented on every change of the cached settings
+        self._settings_generation = 0
+        self._settings_lock = threading.Lock()
 
     # Connection interfaces
 
@@ -47,26 +66,32 @@ class NordVpn:
         Args:
             country: Country name
         """
-        return self._run_nordvpn_connect_command(country.replace(" ", "_"))
+        return self._run_nordvpn_connect_command(country)
 
     def connect_to_group(self, group: str) -> bool:
         """
         Connect to a NordVpn server group
         """
-        return self._run_nordvpn_connect_command(group.replace(" ", "_"))
+        return self._run_nordvpn_connect_command(group)
 
     def connect_to_city(self, city: str) -> bool:
         """
         Connect to a specific NordVpn city server
         """
-        return self._run_nordvpn_connect_command(city.replace(" ", "_"))
+        return self._run_nordvpn_connect_command(city)
+
+    def connect_to_server(self, server: str) -> bool:
+        """
+        Connect to a specific NordVpn server, e.g. "it42" or "it42.nordvpn.com"
+        """
+        return self._run_nordvpn_connect_command(self._server_target(server))
 
     def disconnect(self) -> bool:
         """
         Disconnect from the NordVpn server
         """
         output = self._run_nordvpn_command("disconnect")
-        return self.Messages.DISCONNECT_SUCCESS.value in output
+        return self._is_disconnect_success(output)
 
     # Getters and Setters interfaces
 
@@ -81,173 +106,359 @@ class NordVpn:
         """
         Returns a list of string representing the available countries
         """
-        raw_countries = self._run_nordvpn_command("countries")
-        if raw_countries is None:
-            return []
-        clean_output = self._clean_command_output(raw_countries)
-        countries = parse_words(clean_output)
-        countries.sort()
-        return countries
+        return self._get_topology("countries", self._fetch_countries)
 
     def get_groups(self) -> list[str]:
         """
         Returns a list of string representing the available groups
         """
-        raw_groups = self._run_nordvpn_command("groups")
-        if raw_groups is None:
-            return []
-        clean_output = self._clean_command_output(raw_groups)
-        groups = parse_words(clean_output)
-        groups.sort()
-        return groups
+        return self._get_topology("groups", self._fetch_groups)
 
     def get_cities(self, country: str) -> list[str]:
         """
         Return the list of cities available for the specified country
         """
-        raw_cities = self._run_nordvpn_command(f"cities {country}")
-        if (raw_cities is None) or (
-            NordVpn.Messages.INVALID_CITIES_COMMAND.value in raw_cities
-        ):
-            return []
-        clean_output = self._clean_command_output(raw_cities)
-        cities = parse_words(clean_output)
-        cities.sort()
-        return cities
+        return self._get_topology(
+            f"cities/{country}", lambda: self._fetch_cities(country)
+        )
+
+    def get_cities_for(
+        self, countries: Iterable[str], max_workers: Optional[int] = None
+    ) -> dict[str, list[str]]:
+        """
+        Return the cities available for each of the specified countries.
+        The queries are run concurrently with at most max_workers processes
+        and the returned mapping preserves the order of the input countries
+        """
+        # Imported here, the thread pool is only needed to prefetch the cities
+        from concurrent.futures import ThreadPoolExecutor
+
+        countries = list(countries)
+        if not countries:
+            return {}
+        workers = max(1, max_workers or self.MAX_CONCURRENT_COMMANDS)
+        # The cities fetched are written to the cache file at once
+        batch = self.cache.batch() if self.cache is not None else nullcontext()
+        pool = ThreadPoolExecutor(max_workers=min(workers, len(countries)))
+        with batch, pool:
+            return dict(zip(countries, pool.map(self.get_cities, countries)))
 
     def get_settings_help_message(self, setting: SettingsNames) -> str:
         """
         Returns the help message relative to the specified setting
         """
-        formatted_setting = self._format_setting_name(setting.value.lower())
-        return self._run_nordvpn_command(f"set {formatted_setting} --help")
+        return self._run_nordvpn_command(self._set_args(setting, "--help"))
+
+    def get_settings(self, refresh: bool = False) -> NordVpnSettings:
+        """
+        Return the current NordVpn settings, from the cache unless expired
+        or refresh is True
+        """
+        with self._settings_lock:
+            if not refresh and self._settings is not None:
+                if self._clock() < self._settings_expiry:
+                    return self._settings
+            generation = self._settings_generation
+        settings = NordVpnSettings(self._run_nordvpn_command("settings"))
+        with self._settings_lock:
+            # Don't overwrite the changes made while reading the settings
+            if generation == self._settings_generation:
+                self._settings = settings
+                self._settings_expiry = self._clock() + self.settings_ttl
+        return settings
 
-    def get_settings(self) -> NordVpnSettings:
+    def invalidate_settings(self) -> None:
         """
-        Return the current NordVpn settings
+        Discard the cached settings, the next read runs the nordvpn CLI
         """
-        output = self._run_nordvpn_command("settings")
-        return NordVpnSettings(output)
+        with self._settings_lock:
+            self._settings = None
+            self._settings_generation += 1
 
     def set_technology(self, technology: Technologies) -> bool:
+        # The protocol changes too, the cached settings are invalidated
         return self._run_nordvpn_set_command(
             SettingsNames.TECHNOLOGY, technology.value.lower()
         )
 
+    def set_protocol(self, protocol: Protocols) -> bool:
+        return self._run_nordvpn_set_command(
+            SettingsNames.PROTOCOL, protocol.value.lower(), protocol
+        )
+
     def set_firewall(self, enable: bool) -> bool:
         return self._run_nordvpn_set_command(
-            SettingsNames.FIREWALL, "on" if enable else "off"
+            SettingsNames.FIREWALL, self._on_off(enable), enable
         )
 
     def set_kill_switch(self, enable: bool) -> bool:
         return self._run_nordvpn_set_command(
-            SettingsNames.KILL_SWITCH, "on" if enable else "off"
+            SettingsNames.KILL_SWITCH, self._on_off(enable), enable
         )
 
     def set_cybersec(self, enable: bool) -> bool:
         return self._run_nordvpn_set_command(
-            SettingsNames.CYBERSEC, "on" if enable else "off"
+            SettingsNames.CYBERSEC, self._on_off(enable), enable
         )
 
     def set_notify(self, enable: bool) -> bool:
         return self._run_nordvpn_set_command(
-            SettingsNames.NOTIFY, "on" if enable else "off"
+            SettingsNames.NOTIFY, self._on_off(enable), enable
         )
 
     def set_auto_connect(self, enable: bool, args: Optional[str] = None) -> bool:
-        if enable and args is not None:
-            return self._run_nordvpn_set_command(
-                SettingsNames.AUTO_CONNECT, f"on {args}"
-            )
-        else:
-            return self._run_nordvpn_set_command(
-                SettingsNames.AUTO_CONNECT, "on" if enable else "off"
-            )
+        return self._run_nordvpn_set_command(
+            SettingsNames.AUTO_CONNECT, self._auto_connect_value(enable, args), enable
+        )
 
     def set_ipv6(self, enable: bool) -> bool:
         return self._run_nordvpn_set_command(
-            SettingsNames.IPV6, "on" if enable else "off"
+            SettingsNames.IPV6, self._on_off(enable), enable
         )
 
     def set_dns(self, enable: bool, servers: list[str] = []) -> bool:
         return self._run_nordvpn_set_command(
-            SettingsNames.DNS, " ".join(servers) if enable else "off"
+            SettingsNames.DNS, self._dns_value(enable, servers)
         )
 
+    def apply_settings(
+        self, desired: Mapping[SettingsNames, Any], reconnect: bool = True
+    ) -> dict[SettingsNames, SettingResult]:
+        """
+        Apply the desired settings, running only the commands changing them,
+        and return the result of each setting.
+
+        The current settings are read once, bypassing the cache. If
+        technology or protocol change while connected, the connection to the
+        same server is re-established once after all the settings are
+        applied, unless reconnect is False
+
+        Args:
+            desired: Values of the settings, see the supported ones in
+                NordVpnBase._settings_changes
+        """
+        changes = self._settings_changes(self.get_settings(refresh=True), desired)
+        results = {setting: SettingResult.UNCHANGED for setting in desired}
+        for setting, commands in changes.items():
+            # Stop at the first failing command, e.g. for the subnets
+            applied = all(
+                self._is_valid_command(self._run_nordvpn_command(args))
+                for args in commands
+            )
+            results[setting] = (
+                SettingResult.APPLIED if applied else SettingResult.FAILED
+            )
+            if applied:
+                self._cache_setting(setting, desired[setting])
+            else:
+                # Some of the subnets might have changed
+                self.invalidate_settings()
+
+        pending = [
+            setting
+            for setting in RECONNECT_SETTINGS
+            if results.get(setting) == SettingResult.APPLIED
+        ]
+        if reconnect and pending and not self._reconnect():
+            for setting in pending:
+                results[setting] = SettingResult.RECONNECT_FAILED
+        return results
+
     def add_whitelisted_subnet(self, subnet: str) -> bool:
-        return self._run_nordvpn_whitelist_command(f"add subnet {subnet}")
+        if not self._run_nordvpn_whitelist_command(f"add subnet {subnet}"):
+            return False
+        self._cache_subnet(subnet, True)
+        return True
 
     def remove_whitelisted_subnet(self, subnet: str) -> bool:
-        return self._run_nordvpn_whitelist_command(f"remove subnet {subnet}")
+        if not self._run_nordvpn_whitelist_command(f"remove subnet {subnet}"):
+            return False
+        self._cache_subnet(subnet, False)
+        return True
 
     def add_whitelisted_port(
         self, port: str, protocol: Optional[Protocols] = None
     ) -> bool:
-        command = f"add port {port}"
-        if protocol:
-            command += f" {protocol.value}"
-        return self._run_nordvpn_whitelist_command(command)
+        # The ports are not parsed, the cached settings are invalidated
+        success = self._run_nordvpn_whitelist_command(
+            self._whitelist_port_args("add", port, protocol)
+        )
+        self.invalidate_settings()
+        return success
 
     def remove_whitelisted_port(
         self, port: str, protocol: Optional[Protocols] = None
     ) -> bool:
-        command = f"remove port {port}"
-        if protocol:
-            command += f" {protocol.value}"
-        return self._run_nordvpn_whitelist_command(command)
+        success = self._run_nordvpn_whitelist_command(
+            self._whitelist_port_args("remove", port, protocol)
+        )
+        self.invalidate_settings()
+        return success
+
+    def _cache_setting(self, setting: SettingsNames, value: Any) -> None:
+        """
+        Write the value of a setting successfully changed in the cached
+        settings. Settings whose resulting value is not known, i.e. technology,
+        DNS or a None value, invalidate the cache
+        """
+        if value is None or setting in (SettingsNames.TECHNOLOGY, SettingsNames.DNS):
+            self.invalidate_settings()
+            return
+        if setting == SettingsNames.WHITELISTED_SUBNETS:
+            value = tuple(value)
+        with self._settings_lock:
+            if self._settings is not None:
+                self._settings = self._settings.replace(
+                    **{SETTINGS_FIELDS[setting]: value}
+                )
+            self._settings_generation += 1
+
+    def _cache_subnet(self, subnet: str, whitelisted: bool) -> None:
+        """
+        Add or remove a subnet in the cached settings
+        """
+        with self._settings_lock:
+            self._settings_generation += 1
+            if self._settings is None:
+                return
+            subnets = tuple(
+                s for s in self._settings.whitelisted_subnets if s != subnet
+            )
+            if whitelisted:
+                subnets += (subnet,)
+            self._settings = self._settings.replace(whitelisted_subnets=subnets)
 
-    def _run_command(self, command: str) -> str:
+    def _get_topology(
+        self, key: str, fetch: Callable[[], Optional[list[str]]]
+    ) -> list[str]:
         """
-        Run a shell command and returns its output
+        Return the topology entry from the cache if available, otherwise
+        fetch it. Stale cached entries are served immediately and refreshed
+        in background. Empty lists are cached too, failed fetches are not
         """
-        output = "UNKNOWN ERROR"
-        try:
-            result = run(
-                command.strip().split(), capture_output=True, text=True, check=True
-            )
-            output = result.stdout.strip()
-        except CalledProcessError as e:
-            output = e.output
-        return output
+        if self.cache is None:
+            return fetch() or []
+        cached = self.cache.get(key)
+        if cached is None:
+            value = fetch()
+            if value is None:
+                # Fetched again on the next call
+                return []
+            self.cache.set(key, value)
+            return value
+        if self.cache.is_stale(key):
+            self._refresh_topology_in_background(key, fetch)
+        return cached
+
+    def _refresh_topology_in_background(
+        self, key: str, fetch: Callable[[], Optional[list[str]]]
+    ) -> None:
+        """
+        Fetch the topology entry in a background thread and update the cache
+        """
+        with self._refreshing_lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def _refresh():
+            try:
+                value = fetch()
+                # Keep the old data if the fetch failed
+                if value is not None and self.cache is not None:
+                    self.cache.set(key, value)
+            finally:
+                with self._refreshing_lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=_refresh, daemon=True).start()
+
+    def _fetch_countries(self) -> Optional[list[str]]:
+        """
+        Run the nordvpn command to read the available countries, None if
+        it failed
+        """
+        output, ok = self._run_nordvpn_command_result("countries")
+        return self._parse_word_list(output) if ok else None
+
+    def _fetch_groups(self) -> Optional[list[str]]:
+        """
+        Run the nordvpn command to read the available groups, None if it
+        failed
+        """
+        output, ok = self._run_nordvpn_command_result("groups")
+        return self._parse_word_list(output) if ok else None
+
+    def _fetch_cities(self, country: str) -> Optional[list[str]]:
+        """
+        Run the nordvpn command to read the cities of the specified country,
+        None if it failed
+        """
+        output, ok = self._run_nordvpn_command_result(f"cities {country}")
+        return self._parse_cities(output) if ok else None
+
+    def _reconnect(self) -> bool:
+        """
+        Reconnect to the current server if connected, return False if the
+        connection couldn't be re-established
+        """
+        status = self.get_status()
+        if status.status != ConnectionStatus.CONNECTED:
+            return True
+        self.disconnect()
+        if status.current_server:
+            return self.connect_to_server(status.current_server)
+        return self.connect()
 
     def _run_nordvpn_command(self, args: str) -> str:
         """
-        Run a nordvpn command
+        Run a nordvpn command and returns its output
+        """
+        output, _ = self._run_nordvpn_command_result(args)
+        return output
+
+    def _run_nordvpn_command_result(self, args: str) -> tuple[str, bool]:
         """
-        return self._run_command(f"nordvpn {args}")
+        Run a nordvpn command and returns its output and whether it succeeded
+        """
+        command = args.strip().split()
+        error = True
+        start = time.perf_counter()
+        try:
+            output = self.transport.run(command)
+            error = False
+        except TransportError as e:
+            output = e.output
+        finally:
+            self.metrics.record(
+                command[0] if command else "", time.perf_counter() - start, error
+            )
+        return output, not error
 
     def _run_nordvpn_connect_command(self, args: str = "") -> bool:
         """
         Run a nordvpn connect command and return True if successful
         """
-        output = self._run_nordvpn_command(f"connect {args}")
-        return self.Messages.CONNECT_SUCCESS.value in output
+        output = self._run_nordvpn_command(self._connect_args(args))
+        return self._is_connect_success(output)
 
-    def _run_nordvpn_set_command(self, setting: SettingsNames, args: str) -> bool:
+    def _run_nordvpn_set_command(
+        self, setting: SettingsNames, args: str, value: Any = None
+    ) -> bool:
         """
-        Run a nordvpn set command and return True if successful
+        Run a nordvpn set command and return True if successful. On success
+        the value is written in the cached settings, if None the cached
+        settings are invalidated
         """
-        formatted_setting = self._format_setting_name(setting.value.lower())
-        output = self._run_nordvpn_command(f"set {formatted_setting} {args}")
-        return self.Messages.INVALID_COMMAND.value not in output
+        output = self._run_nordvpn_command(self._set_args(setting, args))
+        if not self._is_valid_command(output):
+            return False
+        self._cache_setting(setting, value)
+        return True
 
     def _run_nordvpn_whitelist_command(self, args: str) -> bool:
         """
         Run a nordvpn whitelist command and return True if successful
         """
         output = self._run_nordvpn_command(f"whitelist {args}")
-        return self.Messages.INVALID_COMMAND.value not in output
-
-    def _format_setting_name(self, setting_name: str) -> str:
-        """
-        Return the given setting name formatted for compatibility
-        for "nordvpn set" command
-        """
-        return setting_name.replace(" ", "").replace("-", "").lower()
-
-    def _clean_command_output(self, command_output: str) -> str:
-        """Removes any known NordVpn news or warning from the command output and
-        returns the cleaned up output
-        """
-        clean = command_output.replace(self.Messages.NEW_FEATURE_MESHNET.value, "")
-        return clean
+        return self._is_valid_command(output)
@@ -0,0 +1,140 @@
+import asyncio
+import json
+import socket
+import time
+import urllib.request
+from typing import Any, Awaitable, Callable, Iterable, Optional
+
+from nordvpn.snapshot import Snapshot
+
+RECOMMENDATIONS_URL = "https://api.nordvpn.com/v1/servers/recommendations"
+# NordVPN servers accept OpenVPN over TCP on this port
+DEFAULT_PROBE_PORT = 443
+DEFAULT_PROBE_TIMEOUT_SECONDS = 2.0
+MAX_CONCURRENT_PROBES = 16
+
+Opener = Callable[[str, int], Awaitable[tuple[Any, Any]]]
+Resolver = Callable[[str, int], Awaitable[str]]
+
+
+class ProbeResult(Snapshot):
+    """
+    TCP connect round trip time of a server, None with the error if the
+    server couldn't be reached
+    """
+
+    __slots__ = ("host", "port", "rtt", "error")
+
+    host: str
+    port: int
+    rtt: Optional[float]
+    error: Optional[str]
+
+    def __init__(
+        self, host: str, port: int, rtt: Optional[float], error: Optional[str] = None
+    ):
+        self._init_fields(host=host, port=port, rtt=rtt, error=error)
+
+    @property
+    def reachable(self) -> bool:
+        return self.rtt is not None
+
+
+async def resolve(host: str, port: int) -> str:
+    """
+    Return the first address of the host for a TCP connection
+    """
+    infos = await asyncio.get_running_loop().getaddrinfo(
+        host, port, type=socket.SOCK_STREAM
+    )
+    if not infos:
+        raise OSError(f"No address found for {host}")
+    return str(infos[0][4][0])
+
+
+async def probe(
+    host: str,
+    port: int = DEFAULT_PROBE_PORT,
+    timeout: float = DEFAULT_PROBE_TIMEOUT_SECONDS,
+    opener: Optional[Opener] = None,
+    resolver: Optional[Resolver] = None,
+) -> ProbeResult:
+    """
+    Measure the time taken to open a TCP connection with the server. The
+    host is resolved first, so the DNS lookup is not part of the time
+    """
+    open_connection = opener or asyncio.open_connection
+    try:
+        address = await asyncio.wait_for((resolver or resolve)(host, port), timeout)
+        start = time.perf_counter()
+        _, writer = await asyncio.wait_for(open_connection(address, port), timeout)
+    except asyncio.TimeoutError:
+        return ProbeResult(host, port, None, "timeout")
+    except OSError as e:
+        return ProbeResult(host, port, None, e.strerror or str(e))
+    rtt = time.perf_counter() - start
+    writer.close()
+    return ProbeResult(host, port, rtt)
+
+
+async def probe_all(
+    hosts: Iterable[str],
+    port: int = DEFAULT_PROBE_PORT,
+    timeout: float = DEFAULT_PROBE_TIMEOUT_SECONDS,
+    max_concurrency: int = MAX_CONCURRENT_PROBES,
+    opener: Optional[Opener] = None,
+    resolver: Optional[Resolver] = None,
+) -> list[ProbeResult]:
+    """
+    Probe the servers concurrently, at most max_concurrency at a time, and
+    return the results ranked from the fastest, the unreachable ones last
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _probe(host: str) -> ProbeResult:
+        async with semaphore:
+            return await probe(host, port, timeout, opener, resolver)
+
+    results = await asyncio.gather(*(_probe(host) for host in dict.fromkeys(hosts)))
+    return rank(results)
+
+
+def rank(results: Iterable[ProbeResult]) -> list[ProbeResult]:
+    """
+    Sort the results from the fastest, the unreachable servers last
+    """
+    return sorted(
+        results, key=lambda r: (r.rtt is None, r.rtt if r.rtt is not None else 0.0)
+    )
+
+
+def fastest_server(hosts: Iterable[str], **kwargs: Any) -> Optional[str]:
+    """
+    Probe the servers and return the fastest one, None if none is reachable.
+    Runs its own event loop, the arguments are the ones of probe_all
+    """
+    results = asyncio.run(probe_all(hosts, **kwargs))
+    if not results or not results[0].reachable:
+        return None
+    return results[0].host
+
+
+def fetch_recommended_servers(
+    limit: int = 10,
+    timeout: float = 5.0,
+    urlopen: Callable[..., Any] = urllib.request.urlopen,
+) -> list[str]:
+    """
+    Return the hostnames of the servers recommended by the NordVPN API.
+    Raises OSError if the API can't be reached and ValueError if the
+    response is not valid
+    """
+    with urlopen(f"{RECOMMENDATIONS_URL}?limit={limit}", timeout=timeout) as response:
+        servers = json.load(response)
+    if not isinstance(servers, list):
+        raise ValueError("Invalid recommendations")
+    return [
+        server["hostname"]
+        for server in servers
+        if isinstance(server, dict) and isinstance(server.get("hostname"), str)
+    ]
@@ -0,0 +1,281 @@
+import os
+import socket
+import socketserver
+import threading
+import time
+from typing import Any, Callable, Optional
+
+from nordvpn.ipc import (
+    MAX_MESSAGE_SIZE,
+    READ_ONLY_COMMANDS,
+    create_private_dir,
+    decode_message,
+    default_socket_path,
+    encode_message,
+    fallback_runtime_dir,
+)
+from nordvpn.nordvpn import NordVpn
+from nordvpn.status import NordVpnStatus
+from nordvpn.transport import TransportError
+
+# Longest time a status command waits for the first poll before failing
+STATUS_TIMEOUT_SECONDS = 5.0
+
+
+class StatusDaemon:
+    """
+    Poll the nordvpn status once for any number of clients.
+
+    A single thread polls NordVpn.get_status every interval seconds and keeps
+    the latest snapshot. Clients connect to a unix socket speaking the JSON
+    lines protocol of DaemonTransport: the status command is answered from the
+    snapshot, any other command is run with the NordVpn transport. A client
+    sending {"op": "subscribe"} receives the current status and then every
+    change as {"event": "status", "output": "..."} until it disconnects.
+
+    The Transfer and Uptime counters change on every poll while connected,
+    a change of the counters alone is pushed at most every counters_interval
+    seconds.
+
+    A status command received before any poll succeeded waits at most
+    status_timeout seconds and then fails.
+    """
+
+    def __init__(
+        self,
+        nordvpn: Optional[NordVpn] = None,
+        socket_path: Optional[str] = None,
+        interval: float = 2.0,
+        counters_interval: float = 10.0,
+        status_timeout: float = STATUS_TIMEOUT_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.nordvpn = nordvpn or NordVpn()
+        self.socket_path = socket_path or default_socket_path()
+        self.interval = interval
+        self.counters_interval = counters_interval
+        self.status_timeout = status_timeout
+        self._clock = clock
+        # Last status pushed to the subscribers and when
+        self._published: Optional[NordVpnStatus] = None
+        self._published_time = 0.0
+        self.status: Optional[NordVpnStatus] = None
+        # Incremented on every status change, watched by the subscribers
+        self.version = 0
+        self._changed = threading.Condition()
+        self._poll_now = threading.Event()
+        self._stopped = threading.Event()
+        self._server: Optional[_UnixServer] = None
+        self._threads: list[threading.Thread] = []
+
+    def start(self) -> None:
+        """
+        Start polling and serving the clients in background threads
+        """
+        self._server = _UnixServer(self.socket_path, self)
+        self._threads = [
+            threading.Thread(target=self._poll_loop, daemon=True),
+            threading.Thread(
+                target=self._server.serve_forever,
+                kwargs={"poll_interval": 0.1},
+                daemon=True,
+            ),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def serve_forever(self) -> None:
+        """
+        Start the daemon and block until stopped
+        """
+        self.start()
+        self._stopped.wait()
+
+    def stop(self) -> None:
+        """
+        Stop polling, disconnect the clients and remove the socket
+        """
+        self._stopped.set()
+        self._poll_now.set()
+        with self._changed:
+            self._changed.notify_all()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        for thread in self._threads:
+            thread.join(timeout=5)
+        self._threads = []
+
+    def poll(self) -> NordVpnStatus:
+        """
+        Get the status now and notify the subscribers if it changed
+        """
+        status = self.nordvpn.get_status()
+        now = self._clock()
+        with self._changed:
+            # Answered to the status commands, even when not pushed
+            self.status = status
+            published = self._published
+            if published is None or status.summary() != published.summary():
+                publish = True
+            else:
+                counters_due = now - self._published_time >= self.counters_interval
+                publish = counters_due and status != published
+            if publish:
+                self._published = status
+                self._published_time = now
+                self.version += 1
+                self._changed.notify_all()
+        return status
+
+    def request_poll(self) -> None:
+        """
+        Make the poller thread get the status without waiting the interval
+        """
+        self._poll_now.set()
+
+    def current_status(
+        self, timeout: Optional[float] = None
+    ) -> Optional[NordVpnStatus]:
+        """
+        Return the latest status, waiting for the first poll if needed
+        """
+        with self._changed:
+            self._changed.wait_for(
+                lambda: self.status is not None or self._stopped.is_set(), timeout
+            )
+            return self.status
+
+    def wait_for_change(
+        self, version: int, timeout: Optional[float] = None
+    ) -> tuple[int, Optional[NordVpnStatus]]:
+        """
+        Wait until the status is newer than version and return the new version
+        and status. The version doesn't change if the timeout expired
+        """
+        with self._changed:
+            self._changed.wait_for(
+                lambda: self.version != version or self._stopped.is_set(), timeout
+            )
+            return self.version, self.status
+
+    def run_command(self, args: list[str]) -> tuple[str, bool]:
+        """
+        Run a nordvpn command, return its output and whether it succeeded
+        """
+        if args == ["status"]:
+            status = self.current_status(timeout=self.status_timeout)
+            if status is None:
+                return "No status available", False
+            return status.status_as_string, True
+        try:
+            output = self.nordvpn.transport.run(args)
+            ok = True
+        except TransportError as e:
+            output = e.output
+            ok = False
+        if not args or args[0] not in READ_ONLY_COMMANDS:
+            # Every other command might change the state of the VPN
+            self.request_poll()
+        return output, ok
+
+    @property
+    def stopped(self) -> bool:
+        return self._stopped.is_set()
+
+    def _poll_loop(self) -> None:
+        while not self._stopped.is_set():
+            self._poll_now.clear()
+            try:
+                self.poll()
+            except Exception:
+                # Keep serving the last status, the next poll might succeed
+                pass
+            self._poll_now.wait(self.interval)
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    server: "_UnixServer"
+
+    def handle(self) -> None:
+        daemon = self.server.status_daemon
+        while not daemon.stopped:
+            line = self.rfile.readline(MAX_MESSAGE_SIZE)
+            if not line.endswith(b"\n"):
+                return
+            try:
+                message = decode_message(line)
+            except ValueError:
+                self._send({"output": "Invalid message", "ok": False})
+                continue
+            if message.get("op") == "subscribe":
+                self._stream_status(daemon)
+                return
+            command = message.get("command")
+            if not isinstance(command, list) or not all(
+                isinstance(arg, str) for arg in command
+            ):
+                self._send({"output": "Invalid command", "ok": False})
+                continue
+            output, ok = daemon.run_command(command)
+            self._send({"output": output, "ok": ok})
+
+    def _stream_status(self, daemon: StatusDaemon) -> None:
+        """
+        Push every status change to the client until it disconnects
+        """
+        version = -1
+        while not daemon.stopped:
+            new_version, status = daemon.wait_for_change(version, timeout=1.0)
+            if new_version == version:
+                continue
+            version = new_version
+            if status is None:
+                continue
+            try:
+                self._send({"event": "status", "output": status.status_as_string})
+            except OSError:
+                return
+
+    def _send(self, message: dict[str, Any]) -> None:
+        self.wfile.write(encode_message(message))
+        self.wfile.flush()
+
+
+class _UnixServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: str, daemon: StatusDaemon) -> None:
+        self.status_daemon = daemon
+        if os.path.dirname(path) == fallback_runtime_dir():
+            create_private_dir(fallback_runtime_dir())
+        _remove_stale_socket(path)
+        super().__init__(path, _RequestHandler)
+        # The socket allows running commands, keep it private to the user
+        os.chmod(path, 0o600)
+
+    def server_close(self) -> None:
+        super().server_close()
+        try:
+            os.unlink(self.server_address)  # type: ignore[arg-type]
+        except OSError:
+            pass
+
+
+def _remove_stale_socket(path: str) -> None:
+    """
+    Remove the socket left by a daemon no longer running.
+    Raises OSError if another daemon is listening on it
+    """
+    if not os.path.exists(path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        os.unlink(path)
+    else:
+        raise OSError(f"Another daemon is listening on {path}")
+    finally:
+        probe.close()
@@ -1,7 +1,8 @@
 from enum import Enum, unique
-from typing import Optional
+from typing import Any, Optional
 
-from nordvpn.utils import find_bool_value, find_list_value, find_string_value
+from nordvpn.snapshot import Snapshot
+from nordvpn.utils import parse_key_values, to_bool, to_list
 
 
 @unique
@@ -19,6 +20,7 @@ class Protocols(Enum):
 @unique
 class SettingsNames(Enum):
     TECHNOLOGY = "Technology"
+    PROTOCOL = "Protocol"
     FIREWALL = "Firewall"
     KILL_SWITCH = "Kill Switch"
     CYBERSEC = "CyberSec"
@@ -29,41 +31,99 @@ class SettingsNames(Enum):
     WHITELISTED_SUBNETS = "Whitelisted subnets"
 
 
-class NordVpnSettings:
+@unique
+class SettingResult(Enum):
+    """
+    Outcome of a setting applied by NordVpn.apply_settings
+    """
+
+    UNCHANGED = "unchanged"
+    APPLIED = "applied"
+    FAILED = "failed"
+    # Applied, but the connection couldn't be re-established to use it
+    RECONNECT_FAILED = "reconnect failed"
+
+
+# Settings taking effect only after reconnecting, in the order to apply them
+RECONNECT_SETTINGS = (SettingsNames.TECHNOLOGY, SettingsNames.PROTOCOL)
+
+# Fields of NordVpnSettings holding the value of each setting
+SETTINGS_FIELDS = {
+    SettingsNames.TECHNOLOGY: "technology",
+    SettingsNames.PROTOCOL: "protocol",
+    SettingsNames.FIREWALL: "firewall",
+    SettingsNames.KILL_SWITCH: "kill_swith",
+    SettingsNames.CYBERSEC: "cybersec",
+    SettingsNames.NOTIFY: "notify",
+    SettingsNames.AUTO_CONNECT: "auto_connect",
+    SettingsNames.IPV6: "ipv6",
+    SettingsNames.DNS: "dns",
+    SettingsNames.WHITELISTED_SUBNETS: "whitelisted_subnets",
+}
+
+
+class NordVpnSettings(Snapshot):
     """
     NordVpn Settings
     """
 
-    technology: Optional[Technologies] = None
-    firewall: Optional[bool] = None
-    kill_swith: Optional[bool] = None
-    cybersec: Optional[bool] = None
-    notify: Optional[bool] = None
-    auto_connect: Optional[bool] = None
-    ipv6: Optional[bool] = None
-    dns: Optional[bool] = None
-    whitelisted_subnets: list[str] = []
+    __slots__ = (
+        "technology",
+        "protocol",
+        "firewall",
+        "kill_swith",
+        "cybersec",
+        "notify",
+        "auto_connect",
+        "ipv6",
+        "dns",
+        "whitelisted_subnets",
+    )
+
+    technology: Optional[Technologies]
+    # Only reported when using OpenVPN
+    protocol: Optional[Protocols]
+    firewall: Optional[bool]
+    kill_swith: Optional[bool]
+    cybersec: Optional[bool]
+    notify: Optional[bool]
+    auto_connect: Optional[bool]
+    ipv6: Optional[bool]
+    dns: Optional[bool]
+    whitelisted_subnets: tuple[str, ...]
 
     def __init__(self, raw_settings: str):
+        fields: dict[str, Any] = {name: None for name in self._field_names}
+        fields["whitelisted_subnets"] = ()
         try:
-            self._parse_settings(raw_settings)
+            fields.update(self._parse_settings(raw_settings))
         except ValueError:
-            return
+            pass
+        self._set_fields(fields)
+
+    def _parse_settings(self, raw: str) -> dict[str, Any]:
+        """
+        Parse the raw output of "nordvpn settings" command into the fields
+        """
+        values = parse_key_values(raw)
+        protocol = values.get(SettingsNames.PROTOCOL.value)
+        return {
+            "technology": Technologies(values.get(SettingsNames.TECHNOLOGY.value)),
+            "protocol": Protocols(protocol) if protocol else None,
+            "firewall": to_bool(values.get(SettingsNames.FIREWALL.value)),
+            "kill_swith": to_bool(values.get(SettingsNames.KILL_SWITCH.value)),
+            "cybersec": to_bool(values.get(SettingsNames.CYBERSEC.value)),
+            "notify": to_bool(values.get(SettingsNames.NOTIFY.value)),
+            "auto_connect": to_bool(values.get(SettingsNames.AUTO_CONNECT.value)),
+            "ipv6": to_bool(values.get(SettingsNames.IPV6.value)),
+            "dns": to_bool(values.get(SettingsNames.DNS.value)),
+            "whitelisted_subnets": tuple(
+                to_list(values.get(SettingsNames.WHITELISTED_SUBNETS.value)) or ()
+            ),
+        }
 
-    def _parse_settings(self, raw: str):
+    def value_of(self, setting: SettingsNames) -> Any:
         """
-        Parse the raw output of "nordvpn settings" command
+        Return the current value of the setting
         """
-        self.technology = Technologies(
-            find_string_value(SettingsNames.TECHNOLOGY.value, raw)
-        )
-        self.firewall = find_bool_value(SettingsNames.FIREWALL.value, raw)
-        self.kill_swith = find_bool_value(SettingsNames.KILL_SWITCH.value, raw)
-        self.cybersec = find_bool_value(SettingsNames.CYBERSEC.value, raw)
-        self.notify = find_bool_value(SettingsNames.NOTIFY.value, raw)
-        self.auto_connect = find_bool_value(SettingsNames.AUTO_CONNECT.value, raw)
-        self.ipv6 = find_bool_value(SettingsNames.IPV6.value, raw)
-        self.dns = find_bool_value(SettingsNames.DNS.value, raw)
-        self.whitelisted_subnets = (
-            find_list_value(SettingsNames.WHITELISTED_SUBNETS.value, raw) or []
-        )
+        return getattr(self, SETTINGS_FIELDS[setting])
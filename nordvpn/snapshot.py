@@ -0,0 +1,108 @@
+from typing import Any, Optional, TypeVar
+
+SnapshotType = TypeVar("SnapshotType", bound="Snapshot")
+
+
+class FrozenInstanceError(AttributeError):
+    """
+    Raised when trying to modify a snapshot
+    """
+
+
+class Snapshot:
+    """
+    Base class of the immutable, __slots__ based value types.
+
+    Subclasses list their fields in __slots__ and assign them once with
+    _init_fields or _set_fields. Slots starting with an underscore are
+    private, not fields. Snapshots compare and hash by value, are safe to
+    share between threads and can be copied and pickled.
+    """
+
+    __slots__ = ("_hash",)
+
+    _hash: Optional[int]
+    # Names of the fields declared by the class hierarchy
+    _field_names: tuple[str, ...] = ()
+    _field_set: frozenset[str] = frozenset()
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._field_names = cls._field_names + tuple(
+            name
+            for name in cls.__dict__.get("__slots__", ())
+            if not name.startswith("_")
+        )
+        cls._field_set = frozenset(cls._field_names)
+
+    def _init_fields(self, **values: Any) -> None:
+        """
+        Assign the fields of the snapshot, all of them must be given
+        """
+        self._set_fields(values)
+
+    def _set_fields(self, values: dict[str, Any]) -> None:
+        """
+        Assign the fields from a dictionary of all of them, which saves
+        copying the values as keyword arguments
+        """
+        if values.keys() != self._field_set:
+            raise TypeError(f"Expected the fields {self._field_names}")
+        setattr_ = object.__setattr__
+        for name, value in values.items():
+            setattr_(self, name, value)
+        setattr_(self, "_hash", None)
+
+    def _values(self) -> tuple[Any, ...]:
+        return tuple(getattr(self, name) for name in self._field_names)
+
+    def replace(self: SnapshotType, **changes: Any) -> SnapshotType:
+        """
+        Return a copy of the snapshot with the given fields changed
+        """
+        values = {name: getattr(self, name) for name in self._field_names}
+        unknown = set(changes) - set(values)
+        if unknown:
+            raise TypeError(f"Unknown fields {sorted(unknown)}")
+        values.update(changes)
+        copy = object.__new__(type(self))
+        copy._set_fields(values)
+        return copy
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # Rebuilt by copy and pickle without __init__ nor __setattr__
+        return _rebuild, (type(self), self._values())
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise FrozenInstanceError(f"Cannot assign to field '{name}'")
+
+    def __delattr__(self, name: str) -> None:
+        raise FrozenInstanceError(f"Cannot delete field '{name}'")
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        assert isinstance(other, Snapshot)
+        return self._values() == other._values()
+
+    def __hash__(self) -> int:
+        value = self._hash
+        if value is None:
+            value = hash(self._values())
+            object.__setattr__(self, "_hash", value)
+        return value
+
+    def __repr__(self) -> str:
+        fields = ", ".join(
+            f"{name}={getattr(self, name)!r}" for name in self._field_names
+        )
+        return f"{type(self).__name__}({fields})"
+
+
+def _rebuild(cls: type[SnapshotType], values: tuple[Any, ...]) -> SnapshotType:
+    """
+    Create a snapshot of the class with the field values, see __reduce__
+    """
+    snapshot = object.__new__(cls)
+    snapshot._set_fields(dict(zip(cls._field_names, values)))
+    return snapshot
@@ -1,7 +1,11 @@
 from enum import Enum, unique
-from typing import Optional
+from typing import Any, Optional
 
-from nordvpn.utils import find_string_value
+from nordvpn.snapshot import Snapshot
+from nordvpn.utils import parse_duration, parse_key_values, parse_transfer
+
+# Value of the counters not parsed yet
+_UNPARSED: Any = object()
 
 
 @unique
@@ -11,21 +15,41 @@ class ConnectionStatus(Enum):
     CONNECTING = "Connecting"
 
 
-class NordVpnStatus:
+class NordVpnStatus(Snapshot):
     """
     NordVpn client application status
     """
 
-    warnings: set[str] = set()
-    status: ConnectionStatus = ConnectionStatus.DISCONNECTED
-    current_server: Optional[str] = None
-    country: Optional[str] = None
-    city: Optional[str] = None
-    ip: Optional[str] = None
-    protocol: Optional[str] = None
-    technology: Optional[str] = None
-    transfer: Optional[str] = None
-    uptime: Optional[str] = None
+    __slots__ = (
+        "status_as_string",
+        "warnings",
+        "status",
+        "current_server",
+        "country",
+        "city",
+        "ip",
+        "protocol",
+        "technology",
+        "transfer",
+        "uptime",
+        "_transfer_bytes",
+        "_uptime_seconds",
+    )
+
+    status_as_string: str
+    warnings: frozenset[str]
+    status: ConnectionStatus
+    current_server: Optional[str]
+    country: Optional[str]
+    city: Optional[str]
+    ip: Optional[str]
+    protocol: Optional[str]
+    technology: Optional[str]
+    transfer: Optional[str]
+    uptime: Optional[str]
+    # Counters parsed on first access, most statuses never need them
+    _transfer_bytes: tuple[Optional[int], Optional[int]]
+    _uptime_seconds: Optional[int]
 
     @unique
     class Param(Enum):
@@ -40,38 +64,92 @@ class NordVpnStatus:
         UPTIME = "Uptime"
 
     def __init__(self, raw_status: str):
+        fields = dict(_DEFAULT_FIELDS)
+        fields["status_as_string"] = raw_status
         try:
-            self._parse_raw_status(raw_status)
+            fields.update(self._parse_raw_status(raw_status))
         except ValueError:
-            return
+            pass
+        self._set_fields(fields)
 
-    def _parse_raw_status(self, raw_status: str) -> None:
-        self.status_as_string = raw_status
+    def _parse_raw_status(self, raw_status: str) -> dict[str, Any]:
+        """
+        Parse the raw output of "nordvpn status" command into the fields
+        """
+        values = parse_key_values(raw_status)
+        status = ConnectionStatus(values.get(_STATUS_KEY))
+        fields: dict[str, Any] = {"status": status}
+        if status is ConnectionStatus.CONNECTED:
+            for name, key in _CONNECTED_FIELDS:
+                fields[name] = values.get(key)
+        return fields
 
-        self.status = ConnectionStatus(
-            find_string_value(NordVpnStatus.Param.STATUS.value, raw_status)
-        )
-        if self.status == ConnectionStatus.CONNECTED:
-            self.current_server = find_string_value(
-                NordVpnStatus.Param.CURRENT_SERVER.value, raw_status
-            )
-            self.country = find_string_value(
-                NordVpnStatus.Param.COUNTRY.value, raw_status
-            )
-            self.city = find_string_value(NordVpnStatus.Param.CITY.value, raw_status)
-            self.ip = find_string_value(NordVpnStatus.Param.IP.value, raw_status)
-            self.protocol = find_string_value(
-                NordVpnStatus.Param.PROTOCOL.value, raw_status
-            )
-            self.technology = find_string_value(
-                NordVpnStatus.Param.TECHNOLOGY.value, raw_status
-            )
-            self.transfer = find_string_value(
-                NordVpnStatus.Param.TRANSFER.value, raw_status
-            )
-            self.uptime = find_string_value(
-                NordVpnStatus.Param.UPTIME.value, raw_status
-            )
+    @property
+    def received_bytes(self) -> Optional[int]:
+        """
+        Bytes received through the tunnel, None if not connected
+        """
+        return self._transfer_counters()[0]
+
+    @property
+    def sent_bytes(self) -> Optional[int]:
+        """
+        Bytes sent through the tunnel, None if not connected
+        """
+        return self._transfer_counters()[1]
+
+    @property
+    def uptime_seconds(self) -> Optional[int]:
+        """
+        Duration of the connection in seconds, None if not connected
+        """
+        seconds = getattr(self, "_uptime_seconds", _UNPARSED)
+        if seconds is _UNPARSED:
+            seconds = parse_duration(self.uptime)
+            object.__setattr__(self, "_uptime_seconds", seconds)
+        return seconds
+
+    def _transfer_counters(self) -> tuple[Optional[int], Optional[int]]:
+        counters = getattr(self, "_transfer_bytes", None)
+        if counters is None:
+            counters = parse_transfer(self.transfer)
+            object.__setattr__(self, "_transfer_bytes", counters)
+        return counters
 
     def to_string(self):
         return self.status_as_string.split("-")[-1].strip()
+
+    def summary(self) -> str:
+        """
+        Return the status without the Transfer and Uptime lines, which change
+        on every poll while connected
+        """
+        counters = (
+            f"{NordVpnStatus.Param.TRANSFER.value}:",
+            f"{NordVpnStatus.Param.UPTIME.value}:",
+        )
+        return "\n".join(
+            line
+            for line in self.to_string().splitlines()
+            if not line.strip().startswith(counters)
+        )
+
+
+# Values of the fields when not reported
+_DEFAULT_FIELDS: dict[str, Any] = {
+    **dict.fromkeys(NordVpnStatus._field_names),
+    "warnings": frozenset(),
+    "status": ConnectionStatus.DISCONNECTED,
+}
+_STATUS_KEY = NordVpnStatus.Param.STATUS.value
+# Fields only reported while connected and the keys of their values
+_CONNECTED_FIELDS = (
+    ("current_server", NordVpnStatus.Param.CURRENT_SERVER.value),
+    ("country", NordVpnStatus.Param.COUNTRY.value),
+    ("city", NordVpnStatus.Param.CITY.value),
+    ("ip", NordVpnStatus.Param.IP.value),
+    ("protocol", NordVpnStatus.Param.PROTOCOL.value),
+    ("technology", NordVpnStatus.Param.TECHNOLOGY.value),
+    ("transfer", NordVpnStatus.Param.TRANSFER.value),
+    ("uptime", NordVpnStatus.Param.UPTIME.value),
+)
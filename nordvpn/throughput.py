@@ -0,0 +1,115 @@
+import threading
+import time
+from typing import Callable, Optional
+
+from nordvpn.snapshot import Snapshot
+from nordvpn.status import ConnectionStatus, NordVpnStatus
+
+_RATE_UNITS = ("B/s", "KiB/s", "MiB/s", "GiB/s", "TiB/s")
+# Time, server, received and sent bytes of a status sample
+_Sample = tuple[float, Optional[str], int, int]
+
+
+def format_rate(bytes_per_second: float) -> str:
+    """
+    Format a rate in bytes per second with the binary unit that fits it
+    """
+    value = float(bytes_per_second)
+    for unit in _RATE_UNITS[:-1]:
+        if abs(value) < 1024:
+            return f"{value:.0f} {unit}" if unit == "B/s" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} {_RATE_UNITS[-1]}"
+
+
+class Throughput(Snapshot):
+    """
+    Received and sent bytes per second measured over an interval
+    """
+
+    __slots__ = ("received_rate", "sent_rate", "interval")
+
+    received_rate: float
+    sent_rate: float
+    interval: float
+
+    def __init__(self, received_rate: float, sent_rate: float, interval: float):
+        self._init_fields(
+            received_rate=received_rate, sent_rate=sent_rate, interval=interval
+        )
+
+    def to_string(self) -> str:
+        return f"↓ {format_rate(self.received_rate)}  ↑ {format_rate(self.sent_rate)}"
+
+
+class ThroughputSampler:
+    """
+    Derive the tunnel throughput from the transfer counters of consecutive
+    status samples.
+
+    The counters restart on every connection, so a new server or counters
+    going backwards start a new measure. Samples closer than min_interval
+    seconds are merged with the following one, since the counters are printed
+    with few significant digits
+    """
+
+    def __init__(
+        self,
+        min_interval: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.min_interval = min_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._previous: Optional[_Sample] = None
+        self.last: Optional[Throughput] = None
+
+    def sample(self, status: NordVpnStatus) -> Optional[Throughput]:
+        """
+        Add a status sample and return the current throughput, None if not
+        connected or not measured yet
+        """
+        now = self._clock()
+        received = status.received_bytes
+        sent = status.sent_bytes
+        with self._lock:
+            if status.status != ConnectionStatus.CONNECTED:
+                received = sent = None
+            if received is None or sent is None:
+                self._previous = None
+                self.last = None
+                return None
+            current = (now, status.current_server, received, sent)
+            previous = self._previous
+            if not self._continues(previous, current):
+                self._previous = current
+                self.last = None
+                return None
+            assert previous is not None
+            elapsed = now - previous[0]
+            if elapsed < self.min_interval:
+                return self.last
+            self._previous = current
+            self.last = Throughput(
+                (received - previous[2]) / elapsed,
+                (sent - previous[3]) / elapsed,
+                elapsed,
+            )
+            return self.last
+
+    @staticmethod
+    def _continues(previous: Optional[_Sample], current: _Sample) -> bool:
+        """
+        Whether the counters of the current sample follow the previous ones
+        """
+        if previous is None or previous[1] != current[1]:
+            return False
+        return current[2] >= previous[2] and current[3] >= previous[3]
+
+    def reset(self) -> None:
+        """
+        Forget the previous samples
+        """
+        with self._lock:
+            self._previous = None
+            self.last = None
@@ -0,0 +1,202 @@
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from subprocess import CalledProcessError, run
+from typing import Callable, Optional, Union
+
+from nordvpn.base import NordVpnBase
+
+Latency = Union[float, tuple[float, float]]
+
+
+class TransportError(Exception):
+    """
+    Raised by a transport when the nordvpn command fails.
+    The output of the failed command is preserved in the output attribute
+    """
+
+    def __init__(self, output: str) -> None:
+        super().__init__(output)
+        self.output = output
+
+
+class TransportUnavailable(OSError):
+    """
+    Raised by a transport when the command couldn't be delivered, e.g. the
+    daemon is not running. The command hasn't run and can be run again
+    """
+
+
+class Transport(ABC):
+    """
+    Interface of the transports used by NordVpn to run the nordvpn commands
+    """
+
+    @abstractmethod
+    def run(self, args: list[str]) -> str:
+        """
+        Run the nordvpn command with the given arguments and return its output.
+        Raises TransportError if the command fails
+        """
+
+
+class CliTransport(Transport):
+    """
+    Run the commands spawning the nordvpn CLI
+    """
+
+    def __init__(self, executable: str = "nordvpn") -> None:
+        self.executable = executable
+
+    def run(self, args: list[str]) -> str:
+        try:
+            result = run(
+                [self.executable, *args], capture_output=True, text=True, check=True
+            )
+        except CalledProcessError as e:
+            raise TransportError(e.output)
+        return result.stdout.strip()
+
+
+class FallbackTransport(Transport):
+    """
+    Run the commands with the primary transport, using the fallback one
+    when the primary is unavailable (TransportUnavailable).
+
+    Failures after the command has been delivered, e.g. timeouts, are not
+    retried with the fallback, since the command might have run already
+    """
+
+    def __init__(self, primary: Transport, fallback: Transport) -> None:
+        self.primary = primary
+        self.fallback = fallback
+
+    def run(self, args: list[str]) -> str:
+        try:
+            return self.primary.run(args)
+        except TransportUnavailable:
+            return self.fallback.run(args)
+
+
+class FakeTransport(Transport):
+    """
+    In-memory transport answering with canned outputs.
+
+    The responses map the command arguments joined by spaces, e.g.
+    "cities Italy", to the output or to a function returning it. Unknown
+    commands fail as invalid commands. Every call is recorded in calls
+    """
+
+    def __init__(
+        self, responses: Optional[dict[str, Union[str, Callable[[], str]]]] = None
+    ) -> None:
+        self.responses = dict(responses or {})
+        self.calls: list[list[str]] = []
+        self._lock = threading.Lock()
+
+    def run(self, args: list[str]) -> str:
+        with self._lock:
+            self.calls.append(list(args))
+        response = self.responses.get(" ".join(args))
+        if response is None:
+            raise TransportError(NordVpnBase.Messages.INVALID_COMMAND.value)
+        return response() if callable(response) else response
+
+
+class RecordingTransport(Transport):
+    """
+    Forward the commands to another transport recording the outputs of the
+    successful ones, which can be saved and replayed with ReplayTransport
+    """
+
+    FORMAT_VERSION = 1
+
+    def __init__(self, transport: Transport) -> None:
+        self.transport = transport
+        self.recordings: dict[str, list[str]] = {}
+        self._lock = threading.Lock()
+
+    def run(self, args: list[str]) -> str:
+        output = self.transport.run(args)
+        with self._lock:
+            self.recordings.setdefault(" ".join(args), []).append(output)
+        return output
+
+    def save(self, path: str) -> None:
+        """
+        Write the recorded outputs to a JSON file
+        """
+        with self._lock:
+            content = {"version": self.FORMAT_VERSION, "commands": self.recordings}
+            with open(path, "w") as f:
+                json.dump(content, f, indent=2)
+
+
+class ReplayTransport(Transport):
+    """
+    Replay the outputs recorded by RecordingTransport.
+
+    Commands recorded several times cycle through their outputs. Each call
+    sleeps for the configured latency, either fixed or uniformly distributed
+    in a (min, max) range, and fails with the given probability, which makes
+    it suitable to benchmark and load test without a real VPN
+    """
+
+    DEFAULT_FAILURE_OUTPUT = "Whoops! Connection failed. Please try again."
+
+    def __init__(
+        self,
+        recordings: dict[str, list[str]],
+        latency: Latency = 0.0,
+        failure_rate: float = 0.0,
+        failure_output: str = DEFAULT_FAILURE_OUTPUT,
+        seed: Optional[int] = None,
+    ) -> None:
+        if not 0 <= failure_rate <= 1:
+            raise ValueError("The failure rate must be between 0 and 1")
+        self.recordings = recordings
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.failure_output = failure_output
+        # Imported here, only the fake transport needs random numbers
+        import random
+
+        self._random = random.Random(seed)
+        self._positions: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_file(cls, path: str, **kwargs) -> "ReplayTransport":
+        """
+        Create a transport replaying the recordings saved in the JSON file
+        """
+        with open(path) as f:
+            content = json.load(f)
+        if content.get("version") != RecordingTransport.FORMAT_VERSION:
+            raise ValueError(f"Unsupported recordings file: {path}")
+        return cls(content["commands"], **kwargs)
+
+    def run(self, args: list[str]) -> str:
+        command = " ".join(args)
+        with self._lock:
+            delay = self._next_latency()
+            failed = self._random.random() < self.failure_rate
+            outputs = self.recordings.get(command)
+            output = None
+            if outputs:
+                position = self._positions.get(command, 0)
+                self._positions[command] = position + 1
+                output = outputs[position % len(outputs)]
+        if delay > 0:
+            time.sleep(delay)
+        if failed:
+            raise TransportError(self.failure_output)
+        if output is None:
+            raise TransportError(NordVpnBase.Messages.INVALID_COMMAND.value)
+        return output
+
+    def _next_latency(self) -> float:
+        if isinstance(self.latency, tuple):
+            return self._random.uniform(*self.latency)
+        return self.latency
@@ -1,5 +1,145 @@
-import re
-from typing import Any, Optional
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Optional
+
+if TYPE_CHECKING:
+    import re
+
+# Values of the keys listing items, like subnets, span the following indented lines
+_CONTINUATION_PREFIXES = (" ", "\t")
+_TRUE_VALUES = frozenset(("enabled", "on", "true"))
+# Multipliers of the size units printed in the transfer counters
+_SIZE_UNITS = {
+    "b": 1,
+    "kb": 1000,
+    "mb": 1000**2,
+    "gb": 1000**3,
+    "tb": 1000**4,
+    "kib": 1024,
+    "mib": 1024**2,
+    "gib": 1024**3,
+    "tib": 1024**4,
+}
+# Seconds of the units printed in the uptime, singular and plural
+_DURATION_UNITS = {
+    "second": 1,
+    "minute": 60,
+    "hour": 3600,
+    "day": 86400,
+    "week": 604800,
+    "year": 31536000,
+}
+
+
+@lru_cache(maxsize=None)
+def _quantity_pattern() -> "re.Pattern[str]":
+    """
+    Return the pattern of a number followed by its unit, compiled on first use
+    """
+    # Imported here like in the other parsers, most commands don't need re
+    import re
+
+    return re.compile(r"(\d+(?:\.\d+)?)\s*([A-Za-z]+)")
+
+
+def parse_key_values(source: Optional[str]) -> dict[str, str]:
+    """
+    Split the source string in a dictionary of "key: value" pairs scanning it
+    only once. Keys with an empty value collect the following indented lines
+    as a comma separated value. Only the first occurrence of a key is kept
+    """
+    values: dict[str, str] = {}
+    if not source:
+        return values
+    list_key: Optional[str] = None
+    for line in source.splitlines():
+        if list_key is not None and line.startswith(_CONTINUATION_PREFIXES):
+            item = line.strip()
+            if item:
+                previous = values[list_key]
+                values[list_key] = f"{previous},{item}" if previous else item
+            continue
+        list_key = None
+        key, separator, value = line.partition(":")
+        if not separator:
+            continue
+        key = key.strip()
+        if key in values:
+            continue
+        value = value.strip()
+        values[key] = value
+        if not value:
+            list_key = key
+    return values
+
+
+def to_bool(value: Optional[str]) -> Optional[bool]:
+    """
+    Convert a parsed setting value to bool, returning None if missing
+    """
+    if value is None:
+        return None
+    return value in _TRUE_VALUES
+
+
+def to_list(value: Optional[str]) -> Optional[list[str]]:
+    """
+    Convert a parsed comma separated value to list, returning None if missing
+    """
+    if value is None:
+        return None
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def parse_size(value: Optional[str]) -> Optional[int]:
+    """
+    Convert a size like "1.2 GiB" to bytes, returning None if not valid
+    """
+    if not value:
+        return None
+    match = _quantity_pattern().fullmatch(value.strip())
+    if match is None:
+        return None
+    multiplier = _SIZE_UNITS.get(match.group(2).lower())
+    if multiplier is None:
+        return None
+    return round(float(match.group(1)) * multiplier)
+
+
+def parse_transfer(value: Optional[str]) -> tuple[Optional[int], Optional[int]]:
+    """
+    Convert the transfer counters like "1.2 GiB received, 300 MiB sent" to
+    the received and sent bytes, None for each counter missing
+    """
+    received: Optional[int] = None
+    sent: Optional[int] = None
+    if not value:
+        return received, sent
+    for counter in value.split(","):
+        amount, _, direction = counter.strip().rpartition(" ")
+        if direction == "received":
+            received = parse_size(amount)
+        elif direction == "sent":
+            sent = parse_size(amount)
+    return received, sent
+
+
+def parse_duration(value: Optional[str]) -> Optional[int]:
+    """
+    Convert a duration like "1 hour 5 minutes 3 seconds" to seconds,
+    returning None if not valid
+    """
+    if not value:
+        return None
+    seconds = 0
+    matches = 0
+    for match in _quantity_pattern().finditer(value):
+        unit = match.group(2).lower()
+        multiplier = _DURATION_UNITS.get(unit[:-1] if unit.endswith("s") else unit)
+        if multiplier is None:
+            return None
+        seconds += round(float(match.group(1)) * multiplier)
+        matches += 1
+    return seconds if matches else None
 
 
 def find_string_value(key: str, source: str) -> Optional[str]:
@@ -8,6 +148,8 @@ def find_string_value(key: str, source: str) -> Optional[str]:
     as pair "key:value"
     Return the value string of the parsed key otherwise it returns None
     """
+    import re
+
     match = re.search(r"{}:\s(.*)".format(key), source)
     if match is None:
         return None
@@ -20,6 +162,8 @@ def find_bool_value(key: str, source: str) -> Optional[bool]:
     as pair "key:value"
     Return the value string of the parsed key otherwise it returns None
     """
+    import re
+
     match = re.search(r"{}:\s(.*)".format(key), source)
     if match is None:
         return None
@@ -33,6 +177,8 @@ def find_list_value(key: str, source: str) -> Optional[list[Any]]:
     as pair "key:value". The list must be commad separated
     Return the value string of the parsed key otherwise it returns None
     """
+    import re
+
     match = re.search(r"{}:\s(.*)".format(key), source)
     if match is None:
         return None
@@ -47,6 +193,8 @@ def parse_words(raw: str) -> list[str]:
     """
     if raw is None:
         return []
+    import re
+
     parsed_list = re.findall(r"(\w{2,})+", raw)
     if parsed_list is None:
         return []
@@ -1,4 +1,30 @@
-from .indicator import Indicator  # NOQA # isort:skip
+from typing import TYPE_CHECKING, Any
+
+# Indicator loads GTK, so it's only imported when the indicator starts
+_EXPORTS = {
+    "Indicator": "indicator",
+    "main": "__main__",
+}
+
+__all__ = list(_EXPORTS)
+
+if TYPE_CHECKING:
+    from .indicator import Indicator  # NOQA # isort:skip
+    from .__main__ import main  # NOQA # isort:skip
 
 
 __version__ = "0.1.0"
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    # __import__ with a fromlist returns the submodule itself
+    value = getattr(__import__(f"{__name__}.{module}", fromlist=[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
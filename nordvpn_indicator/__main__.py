@@ -1,13 +1,82 @@
 #!/usr/bin/env python3
 
+import argparse
+import os
 import signal
+from typing import Callable, Optional
 
-from nordvpn import NordVpn
-from nordvpn_indicator import Indicator
+from nordvpn import (
+    CliTransport,
+    CommandMetrics,
+    DaemonTransport,
+    FallbackTransport,
+    NordVpn,
+    StatusHistory,
+    TopologyCache,
+    Transport,
+)
+from nordvpn.ipc import default_socket_path
 
+# When set, the client metrics are written to this file on exit and on SIGUSR1
+METRICS_FILE_ENV = "NORDVPN_INDICATOR_METRICS_FILE"
+# When set, the status history is written to this file on exit and on SIGUSR1,
+# as CSV if the name ends with ".csv", otherwise as JSON
+HISTORY_FILE_ENV = "NORDVPN_INDICATOR_HISTORY_FILE"
+# Connecting through the daemon runs the whole nordvpn connect, which often
+# takes longer than the default timeout of DaemonTransport
+DAEMON_TIMEOUT_SECONDS = 90.0
 
-def main() -> None:
-    _ = Indicator(NordVpn())
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="nordvpn-indicator")
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="get the status from the daemon started with 'python -m nordvpn serve'"
+        " and run the commands through it, instead of polling the nordvpn CLI",
+    )
+    parser.add_argument(
+        "--socket",
+        default=default_socket_path(),
+        help="path of the daemon unix socket (default: %(default)s)",
+    )
+    args = parser.parse_args(argv)
+    # Imported once the arguments are parsed, "--help" doesn't load GTK
+    from nordvpn_indicator.indicator import Indicator
+
+    dumps: list[Callable[[], None]] = []
+    metrics = CommandMetrics()
+    metrics_file = os.environ.get(METRICS_FILE_ENV)
+    if metrics_file:
+        metrics.dump_on_exit(metrics_file)
+        dumps.append(lambda: metrics.dump(metrics_file))
+    history = StatusHistory()
+    history_file = os.environ.get(HISTORY_FILE_ENV)
+    if history_file:
+        history.dump_on_exit(history_file)
+        dumps.append(lambda: history.dump(history_file))
+    if dumps:
+        signal.signal(signal.SIGUSR1, lambda *_: _call_all(dumps))
+    transport: Optional[Transport] = None
+    status_socket: Optional[str] = None
+    if args.daemon:
+        # The CLI is used directly while the daemon is not running
+        transport = FallbackTransport(
+            DaemonTransport(args.socket, timeout=DAEMON_TIMEOUT_SECONDS),
+            CliTransport(),
+        )
+        status_socket = args.socket
+    _ = Indicator(
+        NordVpn(cache=TopologyCache(), transport=transport, metrics=metrics),
+        watch_interfaces=not args.daemon,
+        history=history,
+        status_socket=status_socket,
+    )
+
+
+def _call_all(callbacks: list[Callable[[], None]]) -> None:
+    for callback in callbacks:
+        callback()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,86 @@
+import time
+from typing import Any, Callable, Iterable, Iterator, Optional, TypeVar
+
+Dispatcher = Callable[..., Any]
+T = TypeVar("T")
+
+# Longest time a slice keeps the UI loop busy, below a frame at 60 Hz
+DEFAULT_SLICE_BUDGET_SECONDS = 0.004
+
+
+class IdleFiller:
+    """
+    Add items to the widgets in small slices run by the UI loop.
+
+    Each slice is an idle callback, dispatched e.g. with GLib.idle_add, adding
+    items until budget seconds have elapsed and then asking to be called
+    again, so events are handled between the slices however many items are
+    added. The slices still pending are dropped by cancel, e.g. when the
+    widgets filled are replaced
+    """
+
+    def __init__(
+        self,
+        dispatch: Optional[Dispatcher] = None,
+        budget: float = DEFAULT_SLICE_BUDGET_SECONDS,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        self._dispatch = dispatch or _run_until_done
+        self.budget = budget
+        self._clock = clock
+        self._cancelled = False
+        self.slices = 0
+        self.longest_slice = 0.0
+
+    def fill(
+        self,
+        items: Iterable[T],
+        add: Callable[[T], Any],
+        on_done: Optional[Callable[[], Any]] = None,
+    ) -> None:
+        """
+        Call add with each of the items from the UI loop, then on_done
+        """
+        self._dispatch(self._slice, iter(items), add, on_done)
+
+    def cancel(self) -> None:
+        """
+        Stop adding the items of every fill in progress
+        """
+        self._cancelled = True
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def _slice(
+        self,
+        items: Iterator[T],
+        add: Callable[[T], Any],
+        on_done: Optional[Callable[[], Any]],
+    ) -> bool:
+        """
+        Add items until the budget is spent, returns True to be called again
+        """
+        if self._cancelled:
+            return False
+        start = self._clock()
+        self.slices += 1
+        try:
+            for item in items:
+                add(item)
+                if self._clock() - start >= self.budget:
+                    return True
+            if on_done is not None:
+                on_done()
+            return False
+        finally:
+            self.longest_slice = max(self.longest_slice, self._clock() - start)
+
+
+def _run_until_done(callback: Callable[..., bool], *args: Any) -> None:
+    """
+    Dispatcher running the idle callback right away until it completes
+    """
+    while callback(*args):
+        pass
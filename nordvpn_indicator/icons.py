@@ -0,0 +1,158 @@
+import hashlib
+import os
+import pathlib
+from importlib import resources
+from typing import Callable, Optional
+
+from nordvpn import ConnectionStatus
+from nordvpn.cache import default_cache_dir
+
+# Icon names, matching the PNG files shipped in the data folder
+ICON_CONNECTED = "nordvpn_connected"
+ICON_DISCONNECTED = "nordvpn_disconnected"
+ICON_WARNING = "nordvpn_warning"
+ICON_NAMES = (ICON_CONNECTED, ICON_DISCONNECTED, ICON_WARNING)
+# Panel sizes of the hicolor theme, scaled down from the 64px originals
+ICON_SIZES = (16, 22, 24, 32, 48)
+# Sizes also provided at double resolution for HiDPI panels
+HIDPI_ICON_SIZES = (16, 22, 24, 32)
+
+Scaler = Callable[[bytes, int], bytes]
+
+
+def icon_name(connection_status: ConnectionStatus) -> str:
+    """
+    Returns the icon name relative to the connection status
+    """
+    if connection_status == ConnectionStatus.CONNECTED:
+        return ICON_CONNECTED
+    if connection_status == ConnectionStatus.DISCONNECTED:
+        return ICON_DISCONNECTED
+    return ICON_WARNING
+
+
+def read_icon(name: str) -> bytes:
+    """
+    Return the PNG content of the icon, also when the package is installed
+    as a zip archive
+    """
+    return (resources.files("nordvpn_indicator") / "data" / f"{name}.png").read_bytes()
+
+
+def packaged_icon_dir() -> Optional[str]:
+    """
+    Return the directory of the icons shipped with the package, which are
+    not scaled to the panel sizes. None if the package is not installed as
+    files, e.g. in a zip archive
+    """
+    path = resources.files("nordvpn_indicator") / "data"
+    if not isinstance(path, pathlib.Path) or not path.is_dir():
+        return None
+    return str(path)
+
+
+def scale_with_pixbuf(data: bytes, size: int) -> bytes:
+    """
+    Return the PNG icon scaled to size x size pixels using GdkPixbuf.
+    Raises ImportError if GdkPixbuf is missing, ValueError if it fails
+    """
+    import gi
+
+    gi.require_version("GdkPixbuf", "2.0")
+    from gi.repository import GdkPixbuf, GLib
+
+    try:
+        loader = GdkPixbuf.PixbufLoader.new_with_type("png")
+        loader.write(data)
+        loader.close()
+        pixbuf = loader.get_pixbuf().scale_simple(
+            size, size, GdkPixbuf.InterpType.HYPER
+        )
+        _, buffer = pixbuf.save_to_bufferv("png", [], [])
+    except GLib.Error as e:
+        # e.g. the PNG loader is not installed
+        raise ValueError(f"Can't scale the icon: {e}") from e
+    return bytes(buffer)
+
+
+class IconTheme:
+    """
+    Icon theme directory holding the indicator icons at the panel sizes.
+
+    The icons are written once, the directory is reused until the shipped
+    icons change. AppIndicator looks the icons up by name in this directory,
+    so switching icon doesn't read any file.
+    """
+
+    STAMP_FILENAME = ".stamp"
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        scaler: Optional[Scaler] = scale_with_pixbuf,
+    ) -> None:
+        self.path = path or os.path.join(default_cache_dir(), "icons")
+        self._scaler = scaler
+
+    def is_installed(self) -> bool:
+        """
+        Tell whether the theme directory holds the current icons
+        """
+        return self._read_stamp() == self._stamp(self._icons())
+
+    def install(self) -> str:
+        """
+        Write the icons in the theme directory if outdated and return its path.
+        Raises OSError if the directory can't be written
+        """
+        icons = self._icons()
+        stamp = self._stamp(icons)
+        if self._read_stamp() == stamp:
+            return self.path
+
+        for name, data in icons.items():
+            # Unthemed icon, used when no scaled version matches
+            self._write(os.path.join(self.path, f"{name}.png"), data)
+            self._write(self._themed_icon_path("64x64", name), data)
+            self._write_scaled(name, data)
+        self._write(os.path.join(self.path, self.STAMP_FILENAME), stamp.encode())
+        return self.path
+
+    def _icons(self) -> dict[str, bytes]:
+        return {name: read_icon(name) for name in ICON_NAMES}
+
+    def _read_stamp(self) -> Optional[str]:
+        try:
+            with open(os.path.join(self.path, self.STAMP_FILENAME)) as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _write_scaled(self, name: str, data: bytes) -> None:
+        if self._scaler is None:
+            return
+        targets = [(f"{size}x{size}", size) for size in ICON_SIZES]
+        targets += [(f"{size}x{size}@2", size * 2) for size in HIDPI_ICON_SIZES]
+        for folder, pixels in targets:
+            try:
+                scaled = self._scaler(data, pixels)
+            except (ImportError, ValueError):
+                # GdkPixbuf not available or failing, the unthemed icon is used
+                return
+            self._write(self._themed_icon_path(folder, name), scaled)
+
+    def _themed_icon_path(self, folder: str, name: str) -> str:
+        return os.path.join(self.path, "hicolor", folder, "apps", f"{name}.png")
+
+    def _write(self, path: str, data: bytes) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+
+    def _stamp(self, icons: dict[str, bytes]) -> str:
+        digest = hashlib.sha256()
+        for name in sorted(icons):
+            digest.update(name.encode())
+            digest.update(icons[name])
+        digest.update(repr((ICON_SIZES, HIDPI_ICON_SIZES)).encode())
+        return digest.hexdigest()
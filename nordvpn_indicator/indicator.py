@@ -1,54 +1,183 @@
-from os import path
-from threading import Timer
+from functools import partial
+from threading import Event, Lock, Thread, Timer
+from typing import Any, Callable, Optional
 
 import gi
 
-from nordvpn import ConnectionStatus, NordVpn
+from nordvpn import (
+    ConnectionManager,
+    ConnectionStatus,
+    NordVpn,
+    NordVpnStatus,
+    StatusHistory,
+    StatusSubscriber,
+    Throughput,
+    ThroughputSampler,
+)
 
 gi.require_version("Gtk", "3.0")
 gi.require_version("AppIndicator3", "0.1")
 from gi.repository import AppIndicator3, GLib, Gtk  # NOQA: E402
 
+from nordvpn_indicator.filler import IdleFiller  # NOQA: E402
+from nordvpn_indicator.icons import (  # NOQA: E402
+    IconTheme,
+    icon_name,
+    packaged_icon_dir,
+)
+from nordvpn_indicator.netwatch import InterfacesState, InterfaceWatcher  # NOQA: E402
+from nordvpn_indicator.quick_connect import QuickConnectWindow  # NOQA: E402
+from nordvpn_indicator.scheduler import PollScheduler  # NOQA: E402
+from nordvpn_indicator.search import EntryKind, SearchEntry, SearchIndex  # NOQA: E402
+from nordvpn_indicator.view import ViewModel  # NOQA: E402
+from nordvpn_indicator.worker import ActionWorker  # NOQA: E402
+
 
 class Indicator:
     APPINDICATOR_ID = "nordvpn_indicator"
-    STATUS_UPDATE_SECONDS = 5.0
+    LOADING_LABEL = "Loading…"
+    NO_CITIES_LABEL = "No cities available"
+    NOT_AVAILABLE_LABEL = "Not available"
+    # Cache entries listed in the menu, rebuilt when they change
+    MENU_TOPOLOGY_KEYS = ("countries", "groups")
+    NO_THROUGHPUT_LABEL = "Throughput not available"
+    # Polling is only a safety net when the tunnel interfaces are watched
+    SAFETY_NET_POLL_SECONDS = 300.0
 
-    def __init__(self, nordvpn: NordVpn) -> None:
+    def __init__(
+        self,
+        nordvpn: NordVpn,
+        scheduler: Optional[PollScheduler] = None,
+        watch_interfaces: bool = True,
+        history: Optional[StatusHistory] = None,
+        status_socket: Optional[str] = None,
+    ) -> None:
         self.nordvpn = nordvpn
+        # Every polled status is kept in a bounded history
+        self.history = history if history is not None else StatusHistory()
+        # Connections skip the commands changing nothing, e.g. disconnecting
+        # before connecting or connecting to the country in use. Leaving the
+        # connected state by running a command is then not counted as a drop
+        self.connection = ConnectionManager(
+            nordvpn,
+            metrics=nordvpn.metrics,
+            on_transition=self.history.notify_user_transition,
+        )
+        # Refresh the status as soon as the VPN tunnel interfaces change
+        self.watcher: Optional[InterfaceWatcher] = None
+        if watch_interfaces:
+            self.watcher = InterfaceWatcher(self._on_interfaces_change)
+        if scheduler is None:
+            scheduler = (
+                PollScheduler(max_interval=self.SAFETY_NET_POLL_SECONDS)
+                if watch_interfaces
+                else PollScheduler()
+            )
+        self.scheduler = scheduler
+        # User actions run in background, completions are reported in the UI loop
+        self.worker = ActionWorker(dispatch=GLib.idle_add)
+        # Only the changes of the status are pushed to the UI
+        self.view = ViewModel(dispatch=GLib.idle_add)
+        self.nordvpn.metrics.add_counters("view", self.view.counters)
+        # Tunnel throughput derived from the transfer counters of each poll
+        self.throughput = ThroughputSampler()
+        self.timer: Optional[Timer] = None
+        self._timer_lock = Lock()
+        # Quick connect search index, built when the popup is first opened
+        self.search_index: Optional[SearchIndex] = None
+        self._indexing = False
+        self._quick_connect: Optional[QuickConnectWindow] = None
+        # Message of the last failed action and the status label it replaced,
+        # kept until the status changes. Only accessed in the UI loop
+        self._failure: Optional[tuple[str, Optional[str]]] = None
+        # Status changes pushed by the status daemon replace the polling
+        # while it is reachable
+        self.subscriber: Optional[StatusSubscriber] = None
+        self._subscribed = Event()
+        if status_socket is not None:
+            self.subscriber = StatusSubscriber(
+                self._on_pushed_status,
+                status_socket,
+                on_disconnect=self._on_subscription_lost,
+            )
+        # Icons are resolved once and then referenced by name. Until the
+        # icons scaled to the panel sizes are installed the shipped ones are
+        # shown, the scaling doesn't delay the icon
+        theme = IconTheme()
+        installed = theme.is_installed()
         self.indicator = AppIndicator3.Indicator.new(
             self.APPINDICATOR_ID,
-            self._get_icon_path(ConnectionStatus.CONNECTING),
+            icon_name(ConnectionStatus.CONNECTING),
             AppIndicator3.IndicatorCategory.SYSTEM_SERVICES,
         )
+        # Without shipped icon files, e.g. installed as a zip archive, the
+        # icon appears once the theme is installed
+        icon_dir = theme.path if installed else packaged_icon_dir()
+        if icon_dir is not None:
+            self.indicator.set_icon_theme_path(icon_dir)
+        if not installed:
+            Thread(target=self._install_icon_theme, args=[theme], daemon=True).start()
         self.indicator.set_status(AppIndicator3.IndicatorStatus.ACTIVE)
-        self.indicator.set_menu(self._build_menu())
+        # The menu is shown right away, the countries, cities and groups are
+        # fetched in background and added a few at a time by the UI loop
+        self.filler: Optional[IdleFiller] = None
+        self._loading_servers = False
+        self._set_menu()
+
+        # Rebuild the menu when the servers topology is refreshed in background
+        self._menu_rebuild_pending = False
+        if self.nordvpn.cache is not None:
+            self.nordvpn.cache.subscribe(self._on_topology_update)
 
-        self._update_indicator_status()
+        # The first status is fetched in background too, the icon shows the
+        # connecting state until then
+        self._schedule_status_update(0)
+        if self.watcher is not None:
+            self.watcher.start()
+        if self.subscriber is not None:
+            self.subscriber.start()
 
         # Start the UI main loop
         Gtk.main()
 
-    def _get_icon_path(self, connection_status: ConnectionStatus) -> str:
+    def _install_icon_theme(self, theme: IconTheme):
         """
-        Returns the icon filepath relative to the connection status
+        Write the scaled icons in background and switch to them once done
         """
-        if connection_status == ConnectionStatus.CONNECTED:
-            filename = "nordvpn_connected.png"
-        elif connection_status == ConnectionStatus.DISCONNECTED:
-            filename = "nordvpn_disconnected.png"
-        else:
-            filename = "nordvpn_warning.png"
-        # TODO we might need to use importlib
-        # importlib.resources.open_text("nordvpn", f"data/{filename}"))
-        return f"{path.dirname(path.realpath(__file__))}/data/{filename}"
+        try:
+            path = theme.install()
+        except OSError:
+            # e.g. the cache directory is not writable, keep the shipped icons
+            return
+        GLib.idle_add(self._set_icon_theme_path, path)
+
+    def _set_icon_theme_path(self, path: str) -> bool:
+        self.indicator.set_icon_theme_path(path)
+        return False
+
+    def _set_menu(self):
+        """
+        Show a new menu and load the servers of its submenus
+        """
+        if self.filler is not None:
+            # Stop filling the submenus of the menu replaced
+            self.filler.cancel()
+        self.filler = IdleFiller(dispatch=GLib.idle_add)
+        self.indicator.set_menu(self._build_menu())
+        self._load_servers()
 
     def _build_menu(self):
         """
-        Builds menu for the app indicator
+        Builds menu for the app indicator. The countries, cities and groups
+        submenus only show a placeholder until filled by _fill_servers_menus
         """
         main_menu = Gtk.Menu()
 
+        # Search popup to connect without scrolling the menus
+        item_quick_connect = Gtk.MenuItem(label="Quick connect…")
+        item_quick_connect.connect("activate", self._quick_connect_callback)
+        main_menu.append(item_quick_connect)
+
         # Create a Connect submenu
         menu_connect = Gtk.Menu()
         item_connect = Gtk.MenuItem(label="Connect")
@@ -60,54 +189,43 @@ class Indicator:
         item_connect_auto.connect("activate", self._auto_connect_callback)
         menu_connect.append(item_connect_auto)
 
-        # Second item is submenu to select the country
-        countries = self.nordvpn.get_countries()
-        countries_menu = Gtk.Menu()
+        # Connect to the recommended server answering first. Disabled while
+        # connected, the probes would go through the current server
+        self.item_connect_fastest = Gtk.MenuItem(label="Fastest")
+        self.item_connect_fastest.connect("activate", self._fastest_connect_callback)
+        menu_connect.append(self.item_connect_fastest)
+
+        # Then a submenu to select the country
+        self.countries_menu = self._build_placeholder_menu()
         item_connect_country = Gtk.MenuItem(label="Countries")
-        item_connect_country.set_submenu(countries_menu)
-        for country in countries:
-            item = Gtk.MenuItem(label=country)
-            item.connect("activate", self._country_connect_callback)
-            countries_menu.append(item)
+        item_connect_country.set_submenu(self.countries_menu)
         menu_connect.append(item_connect_country)
 
-        # Next item is submenu to select a specific city
-        cities_menu = Gtk.Menu()
+        # Next item is submenu to select a specific city. Each country has
+        # its own submenu populated the first time it is shown
+        self.cities_menu = self._build_placeholder_menu()
         item_connect_city = Gtk.MenuItem(label="Cities")
-        item_connect_city.set_submenu(cities_menu)
-        for country in countries:
-            # Draw the country as disabled
-            item_country = Gtk.MenuItem(label=country)
-            item_country.set_sensitive(False)
-            cities_menu.append(item_country)
-            # List the cities below
-            cities = self.nordvpn.get_cities(country)
-            for city in cities:
-                item_city = Gtk.MenuItem(label=city)
-                item_city.connect("activate", self._city_connect_callback)
-                cities_menu.append(item_city)
+        item_connect_city.set_submenu(self.cities_menu)
         menu_connect.append(item_connect_city)
 
         # Next item is submenu to select a server group
-        groups = self.nordvpn.get_groups()
-        groups_menu = Gtk.Menu()
+        self.groups_menu = self._build_placeholder_menu()
         item_connect_group = Gtk.MenuItem(label="Groups")
-        item_connect_group.set_submenu(groups_menu)
-        for g in groups:
-            item = Gtk.MenuItem(label=g)
-            item.connect("activate", self._group_connect_callback)
-            groups_menu.append(item)
+        item_connect_group.set_submenu(self.groups_menu)
         menu_connect.append(item_connect_group)
 
         # Disconnect item
-        item_disconnect = Gtk.MenuItem(label="Disconnect")
-        item_disconnect.connect("activate", self._disconnect_callback)
-        main_menu.append(item_disconnect)
+        self.item_disconnect = Gtk.MenuItem(label="Disconnect")
+        self.item_disconnect.connect("activate", self._disconnect_callback)
+        main_menu.append(self.item_disconnect)
 
         # Create a submenu for the connection status
         menu_status = Gtk.Menu()
         item_status = Gtk.MenuItem(label="Status")
         item_status.set_submenu(menu_status)
+        # Activated when the submenu is about to be shown, which doesn't emit
+        # "show" once exported by AppIndicator
+        item_status.connect("activate", self._on_status_item_activated)
         main_menu.append(item_status)
 
         # Add a label to show the current status details
@@ -115,6 +233,11 @@ class Indicator:
         menu_status.append(self.status_label)
         self.status_label.set_sensitive(False)
 
+        # Add a label to show the current throughput of the tunnel
+        self.throughput_label = Gtk.MenuItem(label=self.NO_THROUGHPUT_LABEL)
+        menu_status.append(self.throughput_label)
+        self.throughput_label.set_sensitive(False)
+
         # Define the Settings menu entry
         item_settings = Gtk.MenuItem(label="Settings...")
         item_settings.connect("activate", self._display_settings_window)
@@ -127,44 +250,304 @@ class Indicator:
         main_menu.show_all()
         return main_menu
 
+    def _build_placeholder_menu(self):
+        """
+        Builds a submenu showing a placeholder until it is filled
+        """
+        menu = Gtk.Menu()
+        placeholder = Gtk.MenuItem(label=self.LOADING_LABEL)
+        placeholder.set_sensitive(False)
+        menu.append(placeholder)
+        return menu
+
+    def _load_servers(self):
+        """
+        Fetch the countries and groups in background, then fill the submenus
+        """
+        filler = self.filler
+        self._loading_servers = True
+
+        def _fetch():
+            countries = self.nordvpn.get_countries()
+            groups = self.nordvpn.get_groups()
+            self._loading_servers = False
+            GLib.idle_add(self._fill_servers_menus, filler, countries, groups)
+
+        Thread(target=_fetch, daemon=True).start()
+
+    def _fill_servers_menus(
+        self, filler: IdleFiller, countries: list[str], groups: list[str]
+    ) -> bool:
+        """
+        Replace the placeholders of the countries, cities and groups submenus,
+        adding their items in slices short enough to keep the menu responsive
+        """
+        if filler.cancelled:
+            # The menu has been replaced while fetching
+            return False
+        menus = (
+            (self.countries_menu, countries, self._add_country_item),
+            (self.cities_menu, countries, self._add_country_cities_item),
+            (self.groups_menu, groups, self._add_group_item),
+        )
+        for menu, names, add in menus:
+            for child in menu.get_children():
+                menu.remove(child)
+            if not names:
+                item = Gtk.MenuItem(label=self.NOT_AVAILABLE_LABEL)
+                item.set_sensitive(False)
+                item.show()
+                menu.append(item)
+            filler.fill(names, partial(add, menu))
+        return False
+
+    def _add_country_item(self, menu, country: str):
+        item = Gtk.MenuItem(label=country)
+        item.connect("activate", self._country_connect_callback)
+        item.show()
+        menu.append(item)
+
+    def _add_country_cities_item(self, menu, country: str):
+        item = Gtk.MenuItem(label=country)
+        # The cities are fetched the first time the submenu is about to be
+        # shown. Exported by AppIndicator the submenu is never mapped and
+        # doesn't emit "show", the item is activated instead
+        item.set_submenu(self._build_placeholder_menu())
+        item.connect("activate", self._on_cities_item_activated, country)
+        item.show_all()
+        menu.append(item)
+
+    def _add_group_item(self, menu, group: str):
+        item = Gtk.MenuItem(label=group)
+        item.connect("activate", self._group_connect_callback)
+        item.show()
+        menu.append(item)
+
+    def _on_cities_item_activated(self, item, country: str):
+        """
+        Fetch the cities of the country in background the first time its
+        submenu is opened
+        """
+        item.disconnect_by_func(self._on_cities_item_activated)
+        menu = item.get_submenu()
+
+        def _fetch():
+            cities = self.nordvpn.get_cities(country)
+            GLib.idle_add(self._populate_cities_menu, menu, cities)
+
+        Thread(target=_fetch, daemon=True).start()
+
+    def _populate_cities_menu(self, menu, cities: list[str]) -> bool:
+        """
+        Replace the placeholder of the cities submenu with the actual cities
+        """
+        for child in menu.get_children():
+            menu.remove(child)
+        if not cities:
+            item = Gtk.MenuItem(label=self.NO_CITIES_LABEL)
+            item.set_sensitive(False)
+            menu.append(item)
+        for city in cities:
+            item = Gtk.MenuItem(label=city)
+            item.connect("activate", self._city_connect_callback)
+            menu.append(item)
+        menu.show_all()
+        return False
+
+    def _on_topology_update(self, key: str, value: list[str]) -> None:
+        """
+        Schedule a single menu rebuild when the countries or groups change
+        """
+        # Built again with the new data on the next search
+        self.search_index = None
+        if key not in self.MENU_TOPOLOGY_KEYS:
+            # The cities submenus show the cities fetched when first opened
+            return
+        if self._loading_servers:
+            # Fetched for the menu being filled, which shows the new data
+            return
+        if not self._menu_rebuild_pending:
+            self._menu_rebuild_pending = True
+            GLib.idle_add(self._rebuild_menu)
+
+    def _rebuild_menu(self) -> bool:
+        """
+        Replace the indicator menu with a freshly built one
+        """
+        self._menu_rebuild_pending = False
+        self._set_menu()
+        # Render the last known state on the new widgets
+        setters: dict[str, Callable[[Any], bool]] = {
+            "label": self._set_status_label,
+            "throughput": self._set_throughput_label,
+            "disconnect_sensitive": self._set_disconnect_sensitive,
+            "fastest_sensitive": self._set_fastest_sensitive,
+        }
+        values = {key: self.view.get(key) for key in setters}
+        self.view.invalidate(*setters)
+        for key, value in values.items():
+            if value is not None:
+                self.view.update(key, value, setters[key])
+        return False
+
     def _quit(self, menu_item):
         """
         Close the application
         """
-        self.timer.cancel()
+        self.worker.stop()
+        if self.watcher is not None:
+            self.watcher.stop(timeout=0)
+        if self.subscriber is not None:
+            self.subscriber.stop(timeout=0)
+        with self._timer_lock:
+            if self.timer is not None:
+                self.timer.cancel()
         Gtk.main_quit()
 
     def _country_connect_callback(self, menu_item):
         """
         Callback function to handle the connection of a selected country
         """
-        self.nordvpn.disconnect()
-        self.nordvpn.connect_to_country(menu_item.get_label())
+        country = menu_item.get_label()
+        self._submit_action(
+            f"connect to {country}", self.connection.connect_to_country, country
+        )
 
     def _auto_connect_callback(self, menu_item):
         """
         Callback to handle connection to an automatic server
         """
-        self.nordvpn.disconnect()
-        self.nordvpn.connect()
+        self._submit_action("connect", self.connection.connect)
+
+    def _fastest_connect_callback(self, menu_item):
+        """
+        Callback to connect to the recommended server with the lowest latency
+        """
+        self._submit_action(
+            "connect to the fastest server", self._connect_to_fastest_server
+        )
+
+    def _connect_to_fastest_server(self) -> bool:
+        """
+        Probe the recommended servers and connect to the fastest one. Only
+        meaningful while disconnected, otherwise the API and the probes go
+        through the current server, or are blocked by the kill switch
+        """
+        # Imported here, asyncio and urllib are only needed when probing
+        from nordvpn.probe import fastest_server, fetch_recommended_servers
+
+        try:
+            servers = fetch_recommended_servers()
+        except (OSError, ValueError):
+            return False
+        server = fastest_server(servers)
+        if server is None:
+            return False
+        return self.connection.connect_to_server(server)
+
+    def _quick_connect_callback(self, menu_item):
+        """
+        Open the quick connect popup, indexing the servers if needed
+        """
+        if self._quick_connect is not None:
+            self._quick_connect.present()
+            return
+        window = QuickConnectWindow(self._on_quick_connect_select)
+        window.connect("destroy", self._on_quick_connect_destroy)
+        self._quick_connect = window
+        if self.search_index is not None:
+            window.set_index(self.search_index)
+        elif not self._indexing:
+            self._indexing = True
+            Thread(target=self._build_search_index, daemon=True).start()
+        window.show_all()
+
+    def _build_search_index(self):
+        """
+        Index the countries and groups, then the cities, which take longer
+        """
+        try:
+            countries = self.nordvpn.get_countries()
+            groups = self.nordvpn.get_groups()
+            index = SearchIndex.build(countries, groups)
+            GLib.idle_add(self._set_search_index, index)
+            cities = self.nordvpn.get_cities_for(countries)
+            index = SearchIndex.build(countries, groups, cities)
+            GLib.idle_add(self._set_search_index, index)
+        finally:
+            # Also when failed, the next popup indexes again
+            GLib.idle_add(self._on_indexing_done)
+
+    def _set_search_index(self, index: SearchIndex) -> bool:
+        self.search_index = index
+        if self._quick_connect is not None:
+            self._quick_connect.set_index(index)
+        return False
+
+    def _on_indexing_done(self) -> bool:
+        self._indexing = False
+        if self.search_index is None and self._quick_connect is not None:
+            self._quick_connect.set_unavailable()
+        return False
+
+    def _on_quick_connect_destroy(self, window):
+        self._quick_connect = None
+
+    def _on_quick_connect_select(self, entry: SearchEntry):
+        """
+        Connect to the entry selected in the quick connect popup
+        """
+        connect = {
+            EntryKind.COUNTRY: self.connection.connect_to_country,
+            EntryKind.CITY: self.connection.connect_to_city,
+            EntryKind.GROUP: self.connection.connect_to_group,
+        }[entry.kind]
+        self._submit_action(f"connect to {entry.label}", connect, entry.target)
 
     def _disconnect_callback(self, menu_item):
         """Callback to handle the disconnect request"""
-        self.nordvpn.disconnect()
+        self._submit_action("disconnect", self.connection.disconnect)
 
     def _group_connect_callback(self, menu_item):
         """
         Callback to connect to a server group
         """
-        self.nordvpn.disconnect()
-        self.nordvpn.connect_to_group(menu_item.get_label())
+        group = menu_item.get_label()
+        self._submit_action(
+            f"connect to {group}", self.connection.connect_to_group, group
+        )
 
     def _city_connect_callback(self, menu_item):
         """
         Callback to connet to a city server
         """
-        self.nordvpn.disconnect()
-        self.nordvpn.connect_to_city(menu_item.get_label())
+        city = menu_item.get_label()
+        self._submit_action(f"connect to {city}", self.connection.connect_to_city, city)
+
+    def _submit_action(self, name: str, func: Callable[..., Any], *args: Any):
+        """
+        Queue a user action to be run by the background worker
+        """
+        self.scheduler.notify_activity()
+        self.worker.submit(name, func, *args, on_done=self._on_action_done)
+
+    def _on_action_done(self, name: str, result: Any) -> bool:
+        """
+        Called in the UI loop when a user action completes, with False or the
+        exception raised if it failed
+        """
+        if result is False or isinstance(result, Exception):
+            message = f"Failed to {name}"
+            if isinstance(result, Exception) and str(result):
+                message += f": {str(result).splitlines()[0]}"
+            failure = self._failure
+            replaced = failure[1] if failure is not None else self.view.get("label")
+            self._failure = (message, replaced)
+            self.view.update("label", message, self._set_status_label)
+        else:
+            self._failure = None
+        self._schedule_status_update(0)
+        return False
 
     def _display_settings_window(self, menu_itme):
         """
@@ -174,12 +557,122 @@ class Indicator:
         # window = SettingsWindow(self.nordvpn)
         # window.show_all()
 
+    def _on_interfaces_change(self, interfaces: InterfacesState):
+        """
+        Called from the watcher thread when the VPN tunnel interfaces change
+        """
+        self.scheduler.notify_activity()
+        self._schedule_status_update(0)
+
+    def _on_status_item_activated(self, menu_item):
+        """
+        Poll faster while the status details are displayed to keep the
+        throughput current
+        """
+        self.scheduler.notify_activity()
+        self._schedule_status_update(0)
+
+    def _on_pushed_status(self, output: str):
+        """
+        Called from the subscriber thread when the daemon pushes a new status
+        """
+        self._subscribed.set()
+        with self._timer_lock:
+            if self.timer is not None:
+                self.timer.cancel()
+        self._show_status(NordVpnStatus(output))
+
+    def _on_subscription_lost(self):
+        """
+        Called from the subscriber thread when the daemon is not reachable
+        """
+        if self._subscribed.is_set():
+            self._subscribed.clear()
+            self._schedule_status_update(0)
+
     def _update_indicator_status(self):
-        """Start a timer that gets the VPN status and updates the UI"""
+        """Get the VPN status, update the UI and schedule the next update"""
+        if self._subscribed.is_set():
+            # The daemon pushes the status changes
+            return
         status = self.nordvpn.get_status()
-        GLib.idle_add(self.status_label.set_label, status.to_string())
-        GLib.idle_add(
-            self.indicator.set_icon_full, self._get_icon_path(status.status), ""
+        self._show_status(status)
+        self._schedule_status_update(self.scheduler.next_interval(status.status))
+
+    def _show_status(self, status: NordVpnStatus):
+        """
+        Record the status and push its changes to the UI
+        """
+        self.connection.observe(status)
+        self.history.append(status)
+        throughput = self.throughput.sample(status)
+        # The counters change on every poll, the throughput label shows them.
+        # The failure of the last action is only handled in the UI loop
+        GLib.idle_add(self._show_status_label, status.summary())
+        self.view.update(
+            "throughput",
+            self._throughput_label(throughput),
+            self._set_throughput_label,
+        )
+        self.view.update("icon", icon_name(status.status), self._set_icon)
+        self.view.update(
+            "disconnect_sensitive",
+            status.status != ConnectionStatus.DISCONNECTED,
+            self._set_disconnect_sensitive,
+        )
+        self.view.update(
+            "fastest_sensitive",
+            status.status == ConnectionStatus.DISCONNECTED,
+            self._set_fastest_sensitive,
         )
-        self.timer = Timer(self.STATUS_UPDATE_SECONDS, self._update_indicator_status)
-        self.timer.start()
+
+    def _show_status_label(self, label: str) -> bool:
+        """
+        Called in the UI loop to show the status label, or the failure of
+        the last action until the status changes
+        """
+        failure = self._failure
+        if failure is not None:
+            if label == failure[1]:
+                # Nothing happened since the failure, keep reporting it
+                label = failure[0]
+            else:
+                self._failure = None
+        self.view.update("label", label, self._set_status_label)
+        return False
+
+    def _set_status_label(self, label: str) -> bool:
+        self.status_label.set_label(label)
+        return False
+
+    def _throughput_label(self, throughput: Optional[Throughput]) -> str:
+        if throughput is None:
+            return self.NO_THROUGHPUT_LABEL
+        return throughput.to_string()
+
+    def _set_throughput_label(self, label: str) -> bool:
+        self.throughput_label.set_label(label)
+        return False
+
+    def _set_icon(self, name: str) -> bool:
+        self.indicator.set_icon_full(name, name.replace("_", " "))
+        return False
+
+    def _set_disconnect_sensitive(self, sensitive: bool) -> bool:
+        self.item_disconnect.set_sensitive(sensitive)
+        return False
+
+    def _set_fastest_sensitive(self, sensitive: bool) -> bool:
+        self.item_connect_fastest.set_sensitive(sensitive)
+        return False
+
+    def _schedule_status_update(self, delay: float):
+        """
+        Replace the pending status update with one starting after delay seconds
+        """
+        with self._timer_lock:
+            if self.timer is not None:
+                self.timer.cancel()
+            self.timer = Timer(delay, self._update_indicator_status)
+            self.timer.daemon = True
+            self.timer.start()
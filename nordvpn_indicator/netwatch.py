@@ -0,0 +1,133 @@
+import os
+import re
+import socket
+import threading
+from typing import Callable, Optional
+
+SYSFS_NET_PATH = "/sys/class/net"
+# Interfaces created by the NordLynx and OpenVPN technologies
+TUNNEL_INTERFACE_PATTERN = re.compile(r"(nordlynx|tun\d+)")
+# Multicast group of the netlink link notifications (linux/rtnetlink.h)
+RTMGRP_LINK = 1
+NETLINK_BUFFER_SIZE = 65536
+
+InterfacesState = dict[str, str]
+
+
+def read_tunnel_interfaces(sysfs_root: str = SYSFS_NET_PATH) -> InterfacesState:
+    """
+    Return the VPN tunnel interfaces found in sysfs mapped to their
+    operational state, e.g. {"nordlynx": "unknown"}
+    """
+    interfaces: InterfacesState = {}
+    try:
+        names = os.listdir(sysfs_root)
+    except OSError:
+        return interfaces
+    for name in names:
+        if not TUNNEL_INTERFACE_PATTERN.fullmatch(name):
+            continue
+        try:
+            with open(os.path.join(sysfs_root, name, "operstate")) as f:
+                interfaces[name] = f.read().strip()
+        except OSError:
+            interfaces[name] = "unknown"
+    return interfaces
+
+
+class InterfaceWatcher:
+    """
+    Watch the VPN tunnel interfaces from a background thread and call
+    on_change with the new state whenever an interface appears, disappears
+    or changes operational state.
+
+    Link events are received from netlink when available, waking the thread
+    as soon as something changes. The sysfs state is also re-read every
+    poll_interval seconds, which is the only mechanism if netlink can't be
+    used.
+    """
+
+    def __init__(
+        self,
+        on_change: Callable[[InterfacesState], None],
+        sysfs_root: str = SYSFS_NET_PATH,
+        poll_interval: float = 5.0,
+        use_netlink: bool = True,
+    ) -> None:
+        self._on_change = on_change
+        self._sysfs_root = sysfs_root
+        self._poll_interval = poll_interval
+        self._use_netlink = use_netlink
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.state = read_tunnel_interfaces(sysfs_root)
+
+    def start(self) -> None:
+        """
+        Start watching the interfaces in a daemon thread
+        """
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop the watcher thread
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        netlink = self._open_netlink() if self._use_netlink else None
+        try:
+            while not self._stop.is_set():
+                if netlink is None:
+                    self._stop.wait(self._poll_interval)
+                else:
+                    self._wait_netlink_event(netlink)
+                if not self._stop.is_set():
+                    self._check_state()
+        finally:
+            if netlink is not None:
+                netlink.close()
+
+    def _check_state(self) -> None:
+        """
+        Read the interfaces state and notify if it changed
+        """
+        state = read_tunnel_interfaces(self._sysfs_root)
+        if state != self.state:
+            self.state = state
+            self._on_change(state)
+
+    def _open_netlink(self) -> Optional[socket.socket]:
+        """
+        Open a netlink socket subscribed to the link notifications,
+        returning None if netlink is not supported
+        """
+        try:
+            netlink = socket.socket(
+                socket.AF_NETLINK, socket.SOCK_RAW, socket.NETLINK_ROUTE
+            )
+        except (AttributeError, OSError):
+            return None
+        try:
+            netlink.bind((0, RTMGRP_LINK))
+            netlink.settimeout(self._poll_interval)
+        except OSError:
+            netlink.close()
+            return None
+        return netlink
+
+    def _wait_netlink_event(self, netlink: socket.socket) -> None:
+        """
+        Block until a link notification is received or poll_interval elapses
+        """
+        try:
+            netlink.recv(NETLINK_BUFFER_SIZE)
+        except socket.timeout:
+            pass
+        except OSError:
+            # Don't spin if the socket is broken, fall back to plain polling
+            self._stop.wait(self._poll_interval)
@@ -0,0 +1,122 @@
+from typing import Callable, Optional
+
+import gi
+
+gi.require_version("Gtk", "3.0")
+from gi.repository import Gdk, Gtk  # NOQA: E402
+
+from nordvpn_indicator.search import SearchEntry, SearchIndex  # NOQA: E402
+
+
+class QuickConnectWindow(Gtk.Window):
+    """
+    Popup filtering the countries, cities and groups while typing.
+
+    Only the best matches are materialised as rows, at most MAX_ROWS, so the
+    list stays small whatever the size of the index. Activating a row calls
+    on_select with its entry and closes the popup
+    """
+
+    MAX_ROWS = 20
+    INDEXING_LABEL = "Loading servers…"
+    UNAVAILABLE_LABEL = "Servers not available"
+    NO_MATCHES_LABEL = "No matches"
+
+    def __init__(self, on_select: Callable[[SearchEntry], None]) -> None:
+        super().__init__(title="Quick connect")
+        self._on_select = on_select
+        self._index: Optional[SearchIndex] = None
+        # Shown while there is no index
+        self._no_index_label = self.INDEXING_LABEL
+        self.set_default_size(360, -1)
+        self.set_position(Gtk.WindowPosition.MOUSE)
+        self.set_keep_above(True)
+
+        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=6)
+        box.set_border_width(6)
+        self.add(box)
+
+        self.search_entry = Gtk.SearchEntry()
+        self.search_entry.set_placeholder_text("Country, city or group")
+        self.search_entry.connect("search-changed", self._on_search_changed)
+        self.search_entry.connect("activate", self._on_entry_activate)
+        box.pack_start(self.search_entry, False, False, 0)
+
+        self.list_box = Gtk.ListBox()
+        self.list_box.connect("row-activated", self._on_row_activated)
+        box.pack_start(self.list_box, True, True, 0)
+
+        self.connect("key-press-event", self._on_key_press)
+        self._show_message(self._no_index_label)
+
+    def set_index(self, index: SearchIndex) -> None:
+        """
+        Replace the index searched, e.g. when the cities have been fetched
+        """
+        self._index = index
+        self._refresh()
+
+    def set_unavailable(self) -> None:
+        """
+        Report that the servers couldn't be indexed
+        """
+        self._index = None
+        self._no_index_label = self.UNAVAILABLE_LABEL
+        self._refresh()
+
+    def _on_search_changed(self, entry) -> None:
+        self._refresh()
+
+    def _refresh(self) -> None:
+        if self._index is None:
+            self._show_message(self._no_index_label)
+            return
+        query = self.search_entry.get_text()
+        matches = self._index.search(query, limit=self.MAX_ROWS)
+        self._clear()
+        if query.strip() and not matches:
+            self._show_message(self.NO_MATCHES_LABEL)
+            return
+        for entry in matches:
+            row = Gtk.ListBoxRow()
+            row.entry = entry
+            label = Gtk.Label(label=entry.label, xalign=0)
+            kind = Gtk.Label(label=entry.kind.value, xalign=1)
+            kind.get_style_context().add_class("dim-label")
+            row_box = Gtk.Box(spacing=12)
+            row_box.pack_start(label, True, True, 0)
+            row_box.pack_end(kind, False, False, 0)
+            row.add(row_box)
+            self.list_box.add(row)
+        self.list_box.show_all()
+
+    def _show_message(self, message: str) -> None:
+        self._clear()
+        row = Gtk.ListBoxRow(selectable=False, activatable=False)
+        row.add(Gtk.Label(label=message))
+        self.list_box.add(row)
+        self.list_box.show_all()
+
+    def _clear(self) -> None:
+        for row in self.list_box.get_children():
+            self.list_box.remove(row)
+
+    def _on_entry_activate(self, entry) -> None:
+        # Enter selects the best match
+        row = self.list_box.get_row_at_index(0)
+        if row is not None and getattr(row, "entry", None) is not None:
+            self._select(row.entry)
+
+    def _on_row_activated(self, list_box, row) -> None:
+        if getattr(row, "entry", None) is not None:
+            self._select(row.entry)
+
+    def _on_key_press(self, widget, event) -> bool:
+        if event.keyval == Gdk.KEY_Escape:
+            self.destroy()
+            return True
+        return False
+
+    def _select(self, entry: SearchEntry) -> None:
+        self.destroy()
+        self._on_select(entry)
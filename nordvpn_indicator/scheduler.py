@@ -0,0 +1,61 @@
+import time
+from typing import Callable, Optional
+
+from nordvpn import ConnectionStatus
+
+
+class PollScheduler:
+    """
+    Compute the delay before the next status poll.
+
+    The status is polled quickly while the connection is changing, i.e. while
+    connecting or shortly after some activity. Once the status is stable the
+    interval grows exponentially up to max_interval and goes back to
+    base_interval as soon as the status changes.
+    """
+
+    def __init__(
+        self,
+        fast_interval: float = 0.5,
+        base_interval: float = 2.0,
+        max_interval: float = 30.0,
+        backoff: float = 2.0,
+        boost_duration: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if not 0 < fast_interval <= base_interval <= max_interval:
+            raise ValueError("Expected 0 < fast_interval <= base <= max_interval")
+        if backoff < 1:
+            raise ValueError("The backoff factor must be at least 1")
+        self.fast_interval = fast_interval
+        self.base_interval = base_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.boost_duration = boost_duration
+        self._clock = clock
+        self._boost_until = float("-inf")
+        self._interval = base_interval
+        self._last_status: Optional[ConnectionStatus] = None
+
+    def notify_activity(self) -> None:
+        """
+        Poll quickly for the next boost_duration seconds, e.g. after a user
+        action or a change of the network interfaces
+        """
+        self._boost_until = self._clock() + self.boost_duration
+
+    def next_interval(self, status: ConnectionStatus) -> float:
+        """
+        Return the delay in seconds before polling again, given the status
+        returned by the last poll
+        """
+        changed = status != self._last_status
+        self._last_status = status
+        if status == ConnectionStatus.CONNECTING or self._clock() < self._boost_until:
+            self._interval = self.base_interval
+            return self.fast_interval
+        if changed:
+            self._interval = self.base_interval
+        else:
+            self._interval = min(self._interval * self.backoff, self.max_interval)
+        return self._interval
@@ -0,0 +1,161 @@
+import bisect
+import heapq
+from enum import Enum, unique
+from typing import Iterable, Mapping, Optional
+
+from nordvpn.snapshot import Snapshot
+
+
+@unique
+class EntryKind(Enum):
+    COUNTRY = "country"
+    CITY = "city"
+    GROUP = "group"
+
+
+# Order of the kinds among matches of the same rank
+_KIND_ORDER = {EntryKind.COUNTRY: 0, EntryKind.CITY: 1, EntryKind.GROUP: 2}
+# Ranks of the matches, lower is better
+_EXACT, _NAME_PREFIX, _WORD_PREFIX, _SUBSTRING = range(4)
+
+
+def normalize(text: str) -> str:
+    """
+    Return the text in the form used by the index: lower case, with spaces in
+    place of the underscores used by the nordvpn CLI
+    """
+    return " ".join(text.replace("_", " ").casefold().split())
+
+
+def _trigrams(text: str) -> set[str]:
+    return {"".join(chars) for chars in zip(text, text[1:], text[2:])}
+
+
+class SearchEntry(Snapshot):
+    """
+    Connection target found by the quick connect search. The target is the
+    name passed to the connect command, the label the one displayed
+    """
+
+    __slots__ = ("kind", "target", "label")
+
+    kind: EntryKind
+    target: str
+    label: str
+
+    def __init__(self, kind: EntryKind, target: str, label: str):
+        self._init_fields(kind=kind, target=target, label=label)
+
+
+class SearchIndex:
+    """
+    Immutable index of the countries, cities and groups for the type to
+    filter search.
+
+    Every word of the names is kept in a sorted list, so the entries with a
+    word starting with the query are found with a bisection. Queries matching
+    in the middle of a word use a trigram index narrowing the entries to
+    verify. Multi-word queries match the entries matching every word
+    """
+
+    def __init__(self, entries: Iterable[SearchEntry]) -> None:
+        self.entries = tuple(dict.fromkeys(entries))
+        self._names = [normalize(entry.target) for entry in self.entries]
+        words = {
+            (word, index)
+            for index, name in enumerate(self._names)
+            for word in name.split()
+        }
+        self._words = sorted(words)
+        self._trigrams: dict[str, set[int]] = {}
+        for index, name in enumerate(self._names):
+            for trigram in _trigrams(name):
+                self._trigrams.setdefault(trigram, set()).add(index)
+
+    @classmethod
+    def build(
+        cls,
+        countries: Iterable[str] = (),
+        groups: Iterable[str] = (),
+        cities: Optional[Mapping[str, Iterable[str]]] = None,
+    ) -> "SearchIndex":
+        """
+        Build the index from the countries, the groups and the cities of each
+        country, as returned by NordVpn
+        """
+        entries = [
+            SearchEntry(EntryKind.COUNTRY, country, country.replace("_", " "))
+            for country in countries
+        ]
+        for country, country_cities in (cities or {}).items():
+            entries += [
+                SearchEntry(
+                    EntryKind.CITY,
+                    city,
+                    f"{city} ({country})".replace("_", " "),
+                )
+                for city in country_cities
+            ]
+        entries += [
+            SearchEntry(EntryKind.GROUP, group, group.replace("_", " "))
+            for group in groups
+        ]
+        return cls(entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def search(self, query: str, limit: int = 20) -> list[SearchEntry]:
+        """
+        Return the best entries matching the query, at most limit
+        """
+        terms = normalize(query).split()
+        if not terms or limit <= 0:
+            return []
+        matches = None
+        for term in terms:
+            term_matches = self._match(term)
+            matches = term_matches if matches is None else matches & term_matches
+            if not matches:
+                return []
+        assert matches is not None
+        query_text = " ".join(terms)
+        best = heapq.nsmallest(
+            limit, matches, key=lambda index: self._rank(index, query_text)
+        )
+        return [self.entries[index] for index in best]
+
+    def _match(self, term: str) -> set[int]:
+        """
+        Return the entries with a word starting with the term or, if the
+        term is long enough, containing it
+        """
+        matches = set()
+        position = bisect.bisect_left(self._words, (term, -1))
+        while position < len(self._words):
+            word, index = self._words[position]
+            if not word.startswith(term):
+                break
+            matches.add(index)
+            position += 1
+        if len(term) >= 3:
+            candidates = None
+            for trigram in _trigrams(term):
+                indexes = self._trigrams.get(trigram, set())
+                candidates = indexes if candidates is None else candidates & indexes
+            for index in candidates or ():
+                if term in self._names[index]:
+                    matches.add(index)
+        return matches
+
+    def _rank(self, index: int, query: str) -> tuple[int, int, str]:
+        name = self._names[index]
+        if name == query:
+            rank = _EXACT
+        elif name.startswith(query):
+            rank = _NAME_PREFIX
+        elif any(word.startswith(query.split()[0]) for word in name.split()):
+            rank = _WORD_PREFIX
+        else:
+            rank = _SUBSTRING
+        return rank, _KIND_ORDER[self.entries[index].kind], name
@@ -0,0 +1,64 @@
+import threading
+from typing import Any, Callable, Optional
+
+Dispatcher = Callable[..., Any]
+
+
+class ViewModel:
+    """
+    Keep the last state pushed to the UI and forward only the changes.
+
+    Each property, e.g. the icon or the status label, is identified by a key.
+    Updating a property with the value already rendered is suppressed,
+    otherwise the apply function is called with the new value through the
+    dispatch function, e.g. GLib.idle_add to run it in the UI thread.
+    """
+
+    def __init__(self, dispatch: Optional[Dispatcher] = None) -> None:
+        self._dispatch = dispatch or (lambda callback, *args: callback(*args))
+        self._state: dict[str, Any] = {}
+        # Reentrant, the dispatch function might apply the value right away
+        self._lock = threading.RLock()
+        self.pushed = 0
+        self.suppressed = 0
+
+    def update(self, key: str, value: Any, apply: Callable[[Any], Any]) -> bool:
+        """
+        Push the value of the property to the UI if it changed.
+        Returns True if the update has been pushed
+        """
+        with self._lock:
+            if key in self._state and self._state[key] == value:
+                self.suppressed += 1
+                return False
+            self._state[key] = value
+            self.pushed += 1
+            # Dispatched in the order of the state changes, an older value
+            # can't be applied after a newer one
+            self._dispatch(apply, value)
+        return True
+
+    def invalidate(self, *keys: str) -> None:
+        """
+        Forget the rendered state of the given properties, or of all of them
+        if none is specified, e.g. after the widgets have been recreated
+        """
+        with self._lock:
+            if not keys:
+                self._state.clear()
+            for key in keys:
+                self._state.pop(key, None)
+
+    def counters(self) -> dict[str, int]:
+        """
+        Return the number of updates pushed and suppressed
+        """
+        with self._lock:
+            return {"pushed": self.pushed, "suppressed": self.suppressed}
+
+    def get(self, key: str) -> Any:
+        """
+        Return the last value pushed for the property
+        """
+        with self._lock:
+            return self._state.get(key)
@@ -0,0 +1,89 @@
+import threading
+import traceback
+from typing import Any, Callable, Optional
+
+ActionCallback = Callable[[str, Any], Any]
+Dispatcher = Callable[..., Any]
+
+
+class _Action:
+    def __init__(
+        self,
+        name: str,
+        func: Callable[..., Any],
+        args: tuple,
+        on_done: Optional[ActionCallback],
+    ) -> None:
+        self.name = name
+        self.func = func
+        self.args = args
+        self.on_done = on_done
+
+
+class ActionWorker:
+    """
+    Run the user actions in a background thread, one at a time.
+
+    The queue holds a single pending action: an action submitted while
+    another one is waiting replaces it, so on rapid repeated clicks only the
+    last requested action runs. Completion callbacks are delivered through
+    the dispatch function, e.g. GLib.idle_add to run them in the UI thread.
+    """
+
+    def __init__(self, dispatch: Optional[Dispatcher] = None) -> None:
+        self._dispatch = dispatch or (lambda callback, *args: callback(*args))
+        self._condition = threading.Condition()
+        self._pending: Optional[_Action] = None
+        self._running = True
+        self.coalesced = 0
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    def submit(
+        self,
+        name: str,
+        func: Callable[..., Any],
+        *args: Any,
+        on_done: Optional[ActionCallback] = None,
+    ) -> None:
+        """
+        Queue the action replacing any pending one. The on_done callback is
+        dispatched with the action name and the value returned by func, or the
+        exception raised by func
+        """
+        with self._condition:
+            if self._pending is not None:
+                self.coalesced += 1
+            self._pending = _Action(name, func, args, on_done)
+            self._condition.notify()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop the worker, dropping the pending action. The action currently
+        running, if any, is completed before the thread exits
+        """
+        with self._condition:
+            self._running = False
+            self._pending = None
+            self._condition.notify()
+        if threading.current_thread() is not self._thread:
+            self._thread.join(timeout)
+
+    def _loop(self) -> None:
+        while True:
+            with self._condition:
+                while self._running and self._pending is None:
+                    self._condition.wait()
+                if not self._running:
+                    return
+                action = self._pending
+                self._pending = None
+            assert action is not None
+            try:
+                result = action.func(*action.args)
+            except Exception as e:
+                # Keep the worker alive for the next actions
+                traceback.print_exc()
+                result = e
+            if action.on_done is not None:
+                self._dispatch(action.on_done, action.name, result)
@@ -0,0 +1,18 @@
+import pytest
+
+
+class FakeClock:
+    """
+    Clock returning the time set in now, advanced by the tests
+    """
+
+    def __init__(self, now: float = 0.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
@@ -0,0 +1,104 @@
+import threading
+
+from nordvpn_indicator.worker import ActionWorker
+
+
+def test_action_completion():
+    done = threading.Event()
+    results = []
+
+    def on_done(name, result):
+        results.append((name, result))
+        done.set()
+
+    worker = ActionWorker()
+    worker.submit("sum", lambda a, b: a + b, 1, 2, on_done=on_done)
+    assert done.wait(timeout=5)
+    assert results == [("sum", 3)]
+    worker.stop(timeout=5)
+
+
+def test_rapid_submissions_are_coalesced():
+    release = threading.Event()
+    done = threading.Event()
+    executed = []
+
+    def action(name):
+        executed.append(name)
+        if name == "first":
+            release.wait(timeout=5)
+        return name
+
+    def on_done(name, result):
+        if result == "last":
+            done.set()
+
+    worker = ActionWorker()
+    worker.submit("first", action, "first", on_done=on_done)
+    # Wait for the first action to start before queueing the others
+    while not executed:
+        threading.Event().wait(0.01)
+    for name in ["second", "third", "last"]:
+        worker.submit(name, action, name, on_done=on_done)
+    release.set()
+
+    assert done.wait(timeout=5)
+    assert executed == ["first", "last"]
+    assert worker.coalesced == 2
+    worker.stop(timeout=5)
+
+
+def test_completion_is_dispatched():
+    dispatched = []
+    done = threading.Event()
+
+    def dispatch(callback, *args):
+        dispatched.append(args)
+        done.set()
+
+    worker = ActionWorker(dispatch=dispatch)
+    worker.submit("noop", lambda: True, on_done=lambda name, result: None)
+    assert done.wait(timeout=5)
+    assert dispatched == [("noop", True)]
+    worker.stop(timeout=5)
+
+
+def test_failing_action_reports_the_exception():
+    done = threading.Event()
+    results = []
+
+    def fail():
+        raise RuntimeError("boom")
+
+    def on_done(name, result):
+        results.append((name, result))
+        done.set()
+
+    worker = ActionWorker()
+    worker.submit("fail", fail, on_done=on_done)
+    assert done.wait(timeout=5)
+    [(name, error)] = results
+    assert name == "fail"
+    assert isinstance(error, RuntimeError)
+    assert str(error) == "boom"
+    worker.stop(timeout=5)
+
+
+def test_failing_action_keeps_worker_alive():
+    done = threading.Event()
+    results = []
+
+    def fail():
+        raise RuntimeError("boom")
+
+    def on_done(name, result):
+        results.append((name, result))
+        if name == "ok":
+            done.set()
+
+    worker = ActionWorker()
+    worker.submit("fail", fail, on_done=on_done)
+    worker.submit("ok", lambda: True, on_done=on_done)
+    assert done.wait(timeout=5)
+    assert results[-1] == ("ok", True)
+    worker.stop(timeout=5)
@@ -0,0 +1,119 @@
+from nordvpn import (
+    FakeTransport,
+    NordVpn,
+    Protocols,
+    SettingResult,
+    SettingsNames,
+    Technologies,
+)
+
+SETTINGS = """Technology: OpenVPN
+Protocol: UDP
+Firewall: enabled
+Kill Switch: disabled
+CyberSec: disabled
+Notify: enabled
+Auto-connect: disabled
+IPv6: disabled
+DNS: disabled
+Whitelisted subnets:
+    10.0.0.0/8
+    192.168.0.0/24
+"""
+CONNECTED = """Status: Connected
+Current server: it42.nordvpn.com"""
+OK = "Setting is successfully set."
+
+
+def make_client(status: str = CONNECTED, **extra: str):
+    responses = {
+        "settings": SETTINGS,
+        "status": status,
+        "disconnect": "You are disconnected from NordVPN.",
+        "connect it42": "You are connected to Italy #42 (it42.nordvpn.com)!",
+        "set technology nordlynx": OK,
+        "set protocol tcp": OK,
+        "set killswitch on": OK,
+        "set dns 1.1.1.1 1.0.0.1": OK,
+        "whitelist remove subnet 192.168.0.0/24": OK,
+        "whitelist add subnet 172.16.0.0/16": OK,
+    }
+    responses.update(extra)
+    transport = FakeTransport(responses)
+    return NordVpn(transport=transport), transport
+
+
+def test_apply_settings_runs_only_changes():
+    client, transport = make_client()
+    results = client.apply_settings(
+        {
+            SettingsNames.FIREWALL: True,
+            SettingsNames.KILL_SWITCH: True,
+            SettingsNames.DNS: ["1.1.1.1", "1.0.0.1"],
+            SettingsNames.WHITELISTED_SUBNETS: ["10.0.0.0/8", "172.16.0.0/16"],
+        }
+    )
+    assert results == {
+        SettingsNames.FIREWALL: SettingResult.UNCHANGED,
+        SettingsNames.KILL_SWITCH: SettingResult.APPLIED,
+        SettingsNames.DNS: SettingResult.APPLIED,
+        SettingsNames.WHITELISTED_SUBNETS: SettingResult.APPLIED,
+    }
+    assert [" ".join(call) for call in transport.calls] == [
+        "settings",
+        "set killswitch on",
+        "set dns 1.1.1.1 1.0.0.1",
+        "whitelist remove subnet 192.168.0.0/24",
+        "whitelist add subnet 172.16.0.0/16",
+    ]
+
+
+def test_apply_settings_reconnects_once():
+    client, transport = make_client()
+    results = client.apply_settings(
+        {
+            SettingsNames.PROTOCOL: Protocols.TCP,
+            SettingsNames.TECHNOLOGY: Technologies.NORDLYNX,
+            SettingsNames.KILL_SWITCH: True,
+        }
+    )
+    assert set(results.values()) == {SettingResult.APPLIED}
+    assert [" ".join(call) for call in transport.calls] == [
+        "settings",
+        "set killswitch on",
+        "set technology nordlynx",
+        "set protocol tcp",
+        "status",
+        "disconnect",
+        "connect it42",
+    ]
+
+
+def test_apply_settings_without_reconnection():
+    client, transport = make_client(status="Status: Disconnected")
+    results = client.apply_settings({SettingsNames.PROTOCOL: Protocols.TCP})
+    assert results == {SettingsNames.PROTOCOL: SettingResult.APPLIED}
+    assert ["disconnect"] not in transport.calls
+
+    client, transport = make_client()
+    client.apply_settings({SettingsNames.PROTOCOL: Protocols.TCP}, reconnect=False)
+    assert ["status"] not in transport.calls
+    # Nothing to reconnect when unchanged
+    client, transport = make_client()
+    client.apply_settings({SettingsNames.PROTOCOL: Protocols.UDP})
+    assert [" ".join(call) for call in transport.calls] == ["settings"]
+
+
+def test_apply_settings_failures():
+    client, transport = make_client(**{"connect it42": "Whoops! Connection failed."})
+    results = client.apply_settings(
+        {
+            SettingsNames.TECHNOLOGY: Technologies.NORDLYNX,
+            # Not available in the fake transport, fails as invalid command
+            SettingsNames.IPV6: True,
+        }
+    )
+    assert results == {
+        SettingsNames.TECHNOLOGY: SettingResult.RECONNECT_FAILED,
+        SettingsNames.IPV6: SettingResult.FAILED,
+    }
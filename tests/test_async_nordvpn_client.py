@@ -0,0 +1,175 @@
+import asyncio
+import os
+import stat
+import sys
+import time
+
+import pytest
+
+from nordvpn import (
+    AsyncNordVpn,
+    ConnectionStatus,
+    SettingResult,
+    SettingsNames,
+    Technologies,
+)
+
+FAKE_NORDVPN = """#!{python}
+import os
+import sys
+import time
+
+args = sys.argv[1:]
+with open(os.environ["FAKE_NORDVPN_LOG"], "a") as log:
+    log.write(" ".join(args) + "\\n")
+time.sleep(float(os.environ.get("FAKE_NORDVPN_LATENCY", "0")))
+command = args[0] if args else ""
+if command == "connect":
+    print("You are connected to United Kingdom #2462 (uk2462.nordvpn.com)!")
+elif command == "disconnect":
+    print("You are disconnected from NordVPN")
+elif command == "status":
+    print("Status: Connected\\nCountry: ACountry\\nCity: ACity")
+elif command == "countries":
+    print("Italy\\t\\tAlbania")
+elif command == "cities":
+    print(args[1] + "_City")
+elif command == "settings":
+    print("Technology: NORDLYNX\\nFirewall: enabled")
+elif command in ("set", "whitelist"):
+    print("Setting is set successfully.")
+else:
+    print("The command you entered is not valid.")
+    sys.exit(1)
+"""
+
+
+@pytest.fixture
+def fake_nordvpn(tmp_path, monkeypatch):
+    """Install a fake nordvpn executable in the PATH and return its log file"""
+    executable = tmp_path / "nordvpn"
+    executable.write_text(FAKE_NORDVPN.format(python=sys.executable))
+    executable.chmod(executable.stat().st_mode | stat.S_IEXEC)
+    log = tmp_path / "calls.log"
+    log.touch()
+    monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("FAKE_NORDVPN_LOG", str(log))
+    return log
+
+
+def calls(log):
+    return log.read_text().splitlines()
+
+
+def test_connect(fake_nordvpn):
+    assert asyncio.run(AsyncNordVpn().connect_to_country("United Kingdom"))
+    assert calls(fake_nordvpn) == ["connect United_Kingdom"]
+
+
+def test_disconnect(fake_nordvpn):
+    assert asyncio.run(AsyncNordVpn().disconnect())
+    assert calls(fake_nordvpn) == ["disconnect"]
+
+
+def test_get_status(fake_nordvpn):
+    status = asyncio.run(AsyncNordVpn().get_status())
+    assert status.status == ConnectionStatus.CONNECTED
+    assert status.country == "ACountry"
+    assert status.city == "ACity"
+
+
+def test_get_countries(fake_nordvpn):
+    assert asyncio.run(AsyncNordVpn().get_countries()) == ["Albania", "Italy"]
+
+
+def test_get_settings(fake_nordvpn):
+    settings = asyncio.run(AsyncNordVpn().get_settings())
+    assert settings.technology == Technologies.NORDLYNX
+    assert settings.firewall is True
+
+
+def test_setters(fake_nordvpn):
+    async def _apply():
+        client = AsyncNordVpn()
+        return [
+            await client.set_technology(Technologies.OPENVPN),
+            await client.set_kill_switch(False),
+            await client.set_dns(True, ["1.1.1.1"]),
+            await client.add_whitelisted_port("1234"),
+        ]
+
+    assert asyncio.run(_apply()) == [True, True, True, True]
+    assert calls(fake_nordvpn) == [
+        "set technology openvpn",
+        "set killswitch off",
+        "set dns 1.1.1.1",
+        "whitelist add port 1234",
+    ]
+
+
+def test_apply_settings(fake_nordvpn):
+    results = asyncio.run(
+        AsyncNordVpn().apply_settings(
+            {
+                SettingsNames.FIREWALL: True,
+                SettingsNames.TECHNOLOGY: Technologies.OPENVPN,
+                SettingsNames.IPV6: False,
+            }
+        )
+    )
+    assert results == {
+        SettingsNames.FIREWALL: SettingResult.UNCHANGED,
+        SettingsNames.TECHNOLOGY: SettingResult.APPLIED,
+        SettingsNames.IPV6: SettingResult.APPLIED,
+    }
+    # Reconnected once, to any server since the status reports none
+    assert calls(fake_nordvpn) == [
+        "settings",
+        "set ipv6 off",
+        "set technology openvpn",
+        "status",
+        "disconnect",
+        "connect",
+    ]
+
+
+def test_failed_command_output(fake_nordvpn):
+    output = asyncio.run(AsyncNordVpn()._run_nordvpn_command("unknown"))
+    assert output.startswith(AsyncNordVpn.Messages.INVALID_COMMAND.value)
+
+
+def test_get_cities_for_is_concurrent(fake_nordvpn, monkeypatch):
+    latency = 0.3
+    monkeypatch.setenv("FAKE_NORDVPN_LATENCY", str(latency))
+    countries = [f"Country{i}" for i in range(8)]
+
+    start = time.perf_counter()
+    cities = asyncio.run(AsyncNordVpn().get_cities_for(countries, max_concurrency=8))
+    elapsed = time.perf_counter() - start
+
+    assert list(cities.keys()) == countries
+    assert cities["Country3"] == ["Country3_City"]
+    assert elapsed < latency * len(countries) / 2
+
+
+def test_timeout_kills_process(fake_nordvpn, monkeypatch):
+    monkeypatch.setenv("FAKE_NORDVPN_LATENCY", "5")
+    start = time.perf_counter()
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(AsyncNordVpn(timeout=0.5).get_status())
+    assert time.perf_counter() - start < 4
+
+
+def test_cancellation(fake_nordvpn, monkeypatch):
+    monkeypatch.setenv("FAKE_NORDVPN_LATENCY", "5")
+
+    async def _cancel():
+        task = asyncio.ensure_future(AsyncNordVpn().get_status())
+        await asyncio.sleep(0.5)
+        task.cancel()
+        await task
+
+    start = time.perf_counter()
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(_cancel())
+    assert time.perf_counter() - start < 4
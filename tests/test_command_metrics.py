@@ -0,0 +1,61 @@
+import json
+
+import pytest
+
+from nordvpn import CommandMetrics, FakeTransport, NordVpn
+
+
+def test_record_and_snapshot():
+    metrics = CommandMetrics(buckets=(0.1, 1.0))
+    metrics.record("status", 0.05)
+    metrics.record("status", 0.5)
+    metrics.record("status", 2.0, error=True)
+    metrics.record("connect", 1.0)
+
+    snapshot = metrics.snapshot()
+    assert snapshot["status"]["count"] == 3
+    assert snapshot["status"]["errors"] == 1
+    assert snapshot["status"]["total_seconds"] == pytest.approx(2.55)
+    assert snapshot["status"]["max_seconds"] == 2.0
+    assert snapshot["status"]["histogram"] == {"le_0.1": 1, "le_1": 1, "le_inf": 1}
+    assert snapshot["connect"]["histogram"] == {"le_0.1": 0, "le_1": 1, "le_inf": 0}
+
+    metrics.reset()
+    assert metrics.snapshot() == {}
+
+
+def test_counters_in_snapshot():
+    metrics = CommandMetrics()
+    counters = {"pushed": 1}
+    metrics.add_counters("view", lambda: dict(counters))
+    metrics.record("status", 0.05)
+    counters["pushed"] = 2
+    assert metrics.snapshot()["view"] == {"pushed": 2}
+    metrics.reset()
+    assert metrics.snapshot() == {"view": {"pushed": 2}}
+
+
+def test_dump(tmp_path):
+    metrics = CommandMetrics()
+    metrics.record("status", 0.05)
+    path = tmp_path / "metrics.json"
+    metrics.dump(str(path))
+    assert json.loads(path.read_text())["status"]["count"] == 1
+
+
+def test_client_instrumentation():
+    transport = FakeTransport(
+        {"status": "Status: Connected", "cities Italy": "Milan\tRome"}
+    )
+    client = NordVpn(transport=transport)
+    client.get_status()
+    client.get_status()
+    client.get_cities("Italy")
+    client.connect()
+
+    snapshot = client.metrics.snapshot()
+    assert snapshot["status"]["count"] == 2
+    assert snapshot["status"]["errors"] == 0
+    assert snapshot["cities"]["count"] == 1
+    assert snapshot["connect"]["count"] == 1
+    assert snapshot["connect"]["errors"] == 1
@@ -0,0 +1,129 @@
+import threading
+
+from nordvpn import ConnectionManager, FakeTransport, NordVpn, NordVpnStatus
+from nordvpn.connection import TRANSITION_CONNECT, TRANSITION_SWITCH
+
+CONNECTED = """Status: Connected
+Current server: us1234.nordvpn.com
+Country: United States
+City: New York"""
+DISCONNECTED = "Status: Disconnected"
+
+
+def make_manager(status: str, clock, **kwargs):
+    transport = FakeTransport(
+        {
+            "status": status,
+            "connect": "You are connected to Italy #42 (it42.nordvpn.com)!",
+            "connect Italy": "You are connected to Italy #42 (it42.nordvpn.com)!",
+            "connect New_York": "You are connected to United States #1",
+            "connect P2P": "You are connected to Italy #42 (it42.nordvpn.com)!",
+            "disconnect": "You are disconnected from NordVPN.",
+        }
+    )
+    manager = ConnectionManager(NordVpn(transport=transport), clock=clock, **kwargs)
+    return manager, transport
+
+
+def commands(transport):
+    return [" ".join(call) for call in transport.calls]
+
+
+def test_skips_no_op_transitions(clock):
+    manager, transport = make_manager(CONNECTED, clock)
+    assert manager.connect_to_country("United_States")
+    assert manager.connect_to_city("New_York")
+    assert manager.connect_to_server("us1234")
+    assert commands(transport) == ["status"]
+    assert manager.skipped == 3
+
+    manager, transport = make_manager(DISCONNECTED, clock)
+    assert manager.disconnect()
+    assert commands(transport) == ["status"]
+
+
+def test_switch_runs_a_single_command(clock):
+    manager, transport = make_manager(CONNECTED, clock)
+    assert manager.connect_to_country("Italy")
+    assert commands(transport) == ["status", "connect Italy"]
+    assert manager.metrics.snapshot()[TRANSITION_SWITCH]["count"] == 1
+
+    manager, transport = make_manager(CONNECTED, clock, disconnect_before_switch=True)
+    assert manager.connect_to_group("P2P")
+    assert commands(transport) == ["status", "disconnect", "connect P2P"]
+
+
+def test_auto_connect_switches_from_a_chosen_server(clock):
+    manager, transport = make_manager(CONNECTED, clock)
+    assert manager.connect()
+    assert commands(transport) == ["status", "connect"]
+    # Already connected automatically
+    manager.observe(NordVpnStatus(CONNECTED))
+    assert manager.connect()
+    assert commands(transport) == ["status", "connect"]
+    assert manager.connect_to_country("Italy")
+    manager.observe(NordVpnStatus(CONNECTED))
+    assert manager.connect()
+    assert commands(transport) == ["status", "connect", "connect Italy", "connect"]
+
+
+def test_connect_when_disconnected(clock):
+    manager, transport = make_manager(DISCONNECTED, clock)
+    assert manager.connect_to_city("New_York")
+    assert commands(transport) == ["status", "connect New_York"]
+    assert manager.metrics.snapshot()[TRANSITION_CONNECT]["errors"] == 0
+
+
+def test_observed_status_is_reused_until_old(clock):
+    manager, transport = make_manager(CONNECTED, clock, max_status_age=5)
+    manager.observe(NordVpnStatus(DISCONNECTED))
+    assert manager.disconnect()
+    assert commands(transport) == []
+    clock.now += 5
+    # Too old, the status is read again
+    assert manager.disconnect()
+    assert commands(transport) == ["status", "disconnect"]
+    # The result of the disconnection is known
+    assert manager.disconnect()
+    assert commands(transport) == ["status", "disconnect"]
+
+
+def test_status_observed_while_connecting(clock):
+    manager, transport = make_manager(DISCONNECTED, clock)
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow_connect():
+        started.set()
+        assert release.wait(timeout=5)
+        return "You are connected to Italy #42 (it42.nordvpn.com)!"
+
+    transport.responses["connect Italy"] = slow_connect
+    connecting = threading.Thread(target=manager.connect_to_country, args=["Italy"])
+    connecting.start()
+    assert started.wait(timeout=5)
+    # Not blocked by the connect command still running
+    observer = threading.Thread(
+        target=manager.observe, args=[NordVpnStatus("Status: Connecting")]
+    )
+    observer.start()
+    observer.join(timeout=5)
+    assert not observer.is_alive()
+    release.set()
+    connecting.join(timeout=5)
+    assert commands(transport) == ["status", "connect Italy"]
+
+
+def test_transitions_are_notified_unless_skipped(clock):
+    notified = []
+    manager, transport = make_manager(
+        CONNECTED, clock, on_transition=lambda: notified.append(True)
+    )
+    assert manager.connect_to_country("United_States")
+    assert notified == []
+    assert manager.connect_to_country("Italy")
+    assert notified == [True]
+    assert manager.disconnect()
+    assert notified == [True, True]
+    assert manager.disconnect()
+    assert notified == [True, True]
@@ -0,0 +1,181 @@
+import os
+import socketserver
+import stat
+import threading
+import time
+from subprocess import CompletedProcess
+from unittest.mock import patch
+
+import pytest
+
+from nordvpn import (
+    CliTransport,
+    ConnectionStatus,
+    DaemonTransport,
+    FallbackTransport,
+    NordVpn,
+    TransportError,
+)
+from nordvpn.ipc import (
+    create_private_dir,
+    decode_message,
+    default_socket_path,
+    encode_message,
+)
+
+STATUS_OUTPUT = """Status: Connected
+Country: ACountry
+City: ACity"""
+
+
+class StandInHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            request = decode_message(line)
+            self.server.requests.append(request["command"])
+            if self.server.drop_next:
+                # Closed without responding
+                self.server.drop_next = False
+                return
+            if request["command"] == ["status"]:
+                response = {"output": STATUS_OUTPUT, "ok": True}
+            elif request["command"] == ["garbage"]:
+                self.wfile.write(b"not json\n")
+                continue
+            elif request["command"][0] == "connect":
+                # Slower than the client timeout
+                time.sleep(0.5)
+                response = {"output": "You are connected", "ok": True}
+            else:
+                response = {"output": "Unknown command", "ok": False}
+            self.wfile.write(encode_message(response))
+            if self.server.close_after_response:
+                return
+
+
+class StandInServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path):
+        super().__init__(path, StandInHandler)
+        self.requests = []
+        self.close_after_response = False
+        self.drop_next = False
+        self.closed = threading.Event()
+
+    def shutdown_request(self, request):
+        super().shutdown_request(request)
+        # Set once the socket is really closed
+        self.closed.set()
+
+
+@pytest.fixture
+def server(tmp_path):
+    server = StandInServer(str(tmp_path / "daemon.sock"))
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+    )
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_transport_run(server):
+    transport = DaemonTransport(server.server_address)
+    assert transport.run(["status"]) == STATUS_OUTPUT
+    assert transport.run(["status"]) == STATUS_OUTPUT
+    # Failures are raised like with the CLI
+    with pytest.raises(TransportError) as error:
+        transport.run(["unknown"])
+    assert error.value.output == "Unknown command"
+    assert server.requests == [["status"], ["status"], ["unknown"]]
+    transport.close()
+
+
+def test_transport_reconnects_after_close(server):
+    server.close_after_response = True
+    transport = DaemonTransport(server.server_address)
+    assert transport.run(["status"]) == STATUS_OUTPUT
+    assert server.closed.wait(timeout=5)
+    assert transport.run(["status"]) == STATUS_OUTPUT
+    transport.close()
+
+
+def test_transport_retries_read_only_commands_closed_before_response(server):
+    transport = DaemonTransport(server.server_address)
+    server.drop_next = True
+    assert transport.run(["status"]) == STATUS_OUTPUT
+    assert server.requests == [["status"], ["status"]]
+    # Other commands might have run
+    server.drop_next = True
+    with pytest.raises(TransportError):
+        transport.run(["connect", "Italy"])
+    assert server.requests[2:] == [["connect", "Italy"]]
+    transport.close()
+
+
+def test_transport_invalid_response(server):
+    transport = DaemonTransport(server.server_address)
+    with pytest.raises(TransportError):
+        transport.run(["garbage"])
+    assert transport.run(["status"]) == STATUS_OUTPUT
+    transport.close()
+
+
+def test_transport_unreachable(tmp_path):
+    with pytest.raises(OSError):
+        DaemonTransport(str(tmp_path / "missing.sock")).run(["status"])
+
+
+@patch("nordvpn.transport.run")
+def test_client_uses_transport(mock_run, server):
+    client = NordVpn(transport=DaemonTransport(server.server_address))
+    status = client.get_status()
+    assert status.status == ConnectionStatus.CONNECTED
+    assert status.city == "ACity"
+    mock_run.assert_not_called()
+
+
+@patch("nordvpn.transport.run")
+def test_client_falls_back_to_cli(mock_run, tmp_path):
+    mock_run.return_value = CompletedProcess(
+        args=[], returncode=0, stdout="Status: Disconnected"
+    )
+    transport = FallbackTransport(
+        DaemonTransport(str(tmp_path / "missing.sock")), CliTransport()
+    )
+    client = NordVpn(transport=transport)
+    assert client.get_status().status == ConnectionStatus.DISCONNECTED
+    mock_run.assert_called_once_with(
+        "nordvpn status".split(), capture_output=True, text=True, check=True
+    )
+
+
+@patch("nordvpn.transport.run")
+def test_no_fallback_once_the_command_is_sent(mock_run, server):
+    transport = FallbackTransport(
+        DaemonTransport(server.server_address, timeout=0.1), CliTransport()
+    )
+    with pytest.raises(TransportError):
+        transport.run(["connect", "Italy"])
+    assert server.requests == [["connect", "Italy"]]
+    mock_run.assert_not_called()
+
+
+def test_default_socket_path_without_runtime_dir(monkeypatch, tmp_path):
+    monkeypatch.delenv("XDG_RUNTIME_DIR", raising=False)
+    monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+    path = default_socket_path()
+    assert path.startswith(str(tmp_path / f"nordvpn-indicator-{os.getuid()}"))
+
+
+def test_private_dir(tmp_path):
+    path = tmp_path / "private"
+    create_private_dir(str(path))
+    assert stat.S_IMODE(path.stat().st_mode) == 0o700
+    # Created already
+    create_private_dir(str(path))
+    path.chmod(0o755)
+    with pytest.raises(OSError):
+        create_private_dir(str(path))
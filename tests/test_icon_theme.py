@@ -0,0 +1,107 @@
+import importlib
+import os
+import sys
+import zipfile
+from importlib import resources
+from unittest.mock import patch
+
+import pytest
+
+from nordvpn import ConnectionStatus
+from nordvpn_indicator.icons import (
+    ICON_NAMES,
+    IconTheme,
+    icon_name,
+    packaged_icon_dir,
+    read_icon,
+)
+
+
+def fake_scaler(data: bytes, size: int) -> bytes:
+    return f"{size}".encode()
+
+
+def test_icon_name():
+    assert icon_name(ConnectionStatus.CONNECTED) == "nordvpn_connected"
+    assert icon_name(ConnectionStatus.DISCONNECTED) == "nordvpn_disconnected"
+    assert icon_name(ConnectionStatus.CONNECTING) == "nordvpn_warning"
+
+
+def test_read_icon():
+    for name in ICON_NAMES:
+        assert read_icon(name).startswith(b"\x89PNG")
+
+
+def test_install(tmp_path):
+    theme = IconTheme(path=str(tmp_path), scaler=fake_scaler)
+    assert theme.install() == str(tmp_path)
+    for name in ICON_NAMES:
+        assert (tmp_path / f"{name}.png").read_bytes() == read_icon(name)
+        apps = tmp_path / "hicolor" / "22x22" / "apps"
+        assert (apps / f"{name}.png").read_bytes() == b"22"
+        hidpi_apps = tmp_path / "hicolor" / "22x22@2" / "apps"
+        assert (hidpi_apps / f"{name}.png").read_bytes() == b"44"
+
+
+def test_install_is_done_once(tmp_path):
+    calls = []
+
+    def counting_scaler(data, size):
+        calls.append(size)
+        return data
+
+    IconTheme(path=str(tmp_path), scaler=counting_scaler).install()
+    assert len(calls) > 0
+    calls.clear()
+    IconTheme(path=str(tmp_path), scaler=counting_scaler).install()
+    assert calls == []
+
+
+@pytest.mark.parametrize(
+    "error", [ImportError("GdkPixbuf"), ValueError("Can't scale the icon")]
+)
+def test_install_without_scaler(tmp_path, error):
+    def failing_scaler(data, size):
+        raise error
+
+    IconTheme(path=str(tmp_path), scaler=failing_scaler).install()
+    assert sorted(os.listdir(tmp_path / "hicolor")) == ["64x64"]
+    assert (tmp_path / "nordvpn_connected.png").exists()
+
+
+def test_is_installed(tmp_path):
+    theme = IconTheme(path=str(tmp_path / "icons"), scaler=fake_scaler)
+    assert not theme.is_installed()
+    theme.install()
+    assert theme.is_installed()
+
+
+def test_install_in_unwritable_directory(tmp_path):
+    # A file where the theme directory should be
+    (tmp_path / "icons").write_text("")
+    theme = IconTheme(path=str(tmp_path / "icons" / "theme"), scaler=fake_scaler)
+    with pytest.raises(OSError):
+        theme.install()
+    assert not theme.is_installed()
+
+
+def test_packaged_icons():
+    path = packaged_icon_dir()
+    assert path is not None
+    for name in ICON_NAMES:
+        assert os.path.exists(os.path.join(path, f"{name}.png"))
+
+
+def test_packaged_icons_in_zip_archive(tmp_path):
+    archive = tmp_path / "package.zip"
+    with zipfile.ZipFile(archive, "w") as f:
+        f.writestr("zipped/__init__.py", "")
+        f.writestr("zipped/data/nordvpn_connected.png", read_icon("nordvpn_connected"))
+    sys.path.insert(0, str(archive))
+    try:
+        with patch("nordvpn_indicator.icons.resources.files") as files:
+            files.return_value = resources.files(importlib.import_module("zipped"))
+            assert packaged_icon_dir() is None
+    finally:
+        sys.path.remove(str(archive))
+        sys.modules.pop("zipped", None)
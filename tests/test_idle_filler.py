@@ -0,0 +1,84 @@
+import pytest
+
+from nordvpn_indicator.filler import IdleFiller
+
+
+class FakeLoop:
+    """
+    UI loop calling the idle callbacks in turn, again while they return True
+    """
+
+    def __init__(self):
+        self.callbacks = []
+        self.iterations = 0
+
+    def idle_add(self, callback, *args):
+        self.callbacks.append((callback, args))
+
+    def run(self):
+        while self.callbacks:
+            callback, args = self.callbacks.pop(0)
+            self.iterations += 1
+            if callback(*args):
+                self.callbacks.append((callback, args))
+
+
+def test_items_are_added_without_loop():
+    added = []
+    done = []
+    filler = IdleFiller()
+    filler.fill(range(5), added.append, on_done=lambda: done.append(True))
+    assert added == [0, 1, 2, 3, 4]
+    assert done == [True]
+
+
+def test_slices_stop_when_the_budget_is_spent(clock):
+    loop = FakeLoop()
+    added = []
+
+    def add(item):
+        added.append(item)
+        # Every item takes 1 ms
+        clock.now += 0.001
+
+    filler = IdleFiller(dispatch=loop.idle_add, budget=0.003, clock=clock)
+    filler.fill(range(10), add)
+    assert added == []
+    loop.run()
+    assert added == list(range(10))
+    assert filler.slices == 4
+    assert filler.longest_slice == pytest.approx(0.003)
+
+
+def test_fills_are_interleaved(clock):
+    loop = FakeLoop()
+    added = []
+
+    def add(item):
+        added.append(item)
+        clock.now += 0.001
+
+    filler = IdleFiller(dispatch=loop.idle_add, budget=0.002, clock=clock)
+    filler.fill("abcd", add)
+    filler.fill("ABCD", add)
+    loop.run()
+    assert "".join(added) == "abABcdCD"
+
+
+def test_cancel_drops_the_pending_slices(clock):
+    loop = FakeLoop()
+    added = []
+    done = []
+
+    def add(item):
+        added.append(item)
+        clock.now += 0.001
+        if item == 2:
+            filler.cancel()
+
+    filler = IdleFiller(dispatch=loop.idle_add, budget=0.002, clock=clock)
+    filler.fill(range(10), add, on_done=lambda: done.append(True))
+    loop.run()
+    assert filler.cancelled
+    assert added == [0, 1, 2, 3]
+    assert done == []
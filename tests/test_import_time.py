@@ -0,0 +1,62 @@
+import os
+import subprocess
+import sys
+
+# Generous budgets on the cumulative import time, in microseconds, to catch a
+# heavy import slipping back in rather than measuring the machine
+NORDVPN_IMPORT_BUDGET_US = 300_000
+INDICATOR_IMPORT_BUDGET_US = 300_000
+
+# Modules the client doesn't need until a feature using them runs
+HEAVY_MODULES = ("asyncio", "urllib.request", "socketserver", "gi")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_times(*args: str) -> dict[str, int]:
+    """
+    Run python with -X importtime and return the cumulative import time of
+    each module imported, in microseconds
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True,
+        text=True,
+        cwd=ROOT,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, module = line.split("|")
+        if cumulative.strip().isdigit():
+            times[module.strip()] = int(cumulative)
+    return times
+
+
+def test_nordvpn_client_import_is_light():
+    times = import_times("-c", "from nordvpn import NordVpn")
+    assert "nordvpn.nordvpn" in times
+    assert not set(HEAVY_MODULES) & set(times)
+    total = sum(times[m] for m in ("nordvpn", "nordvpn.nordvpn") if m in times)
+    assert total < NORDVPN_IMPORT_BUDGET_US
+
+
+def test_nordvpn_names_are_loaded_on_access():
+    import nordvpn
+
+    assert nordvpn.ConnectionManager.__module__ == "nordvpn.connection"
+    assert "AsyncNordVpn" in dir(nordvpn)
+    assert set(nordvpn.__all__) <= set(dir(nordvpn))
+
+
+def test_indicator_package_import_does_not_load_gtk():
+    times = import_times("-c", "import nordvpn_indicator")
+    assert "gi" not in times
+    assert times["nordvpn_indicator"] < INDICATOR_IMPORT_BUDGET_US
+
+
+def test_indicator_help_does_not_load_gtk():
+    times = import_times("-m", "nordvpn_indicator", "--help")
+    assert "gi" not in times
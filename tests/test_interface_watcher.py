@@ -0,0 +1,66 @@
+import threading
+
+from nordvpn_indicator.netwatch import InterfaceWatcher, read_tunnel_interfaces
+
+
+def add_interface(root, name, operstate="unknown"):
+    interface = root / name
+    interface.mkdir()
+    (interface / "operstate").write_text(f"{operstate}\n")
+
+
+def test_read_tunnel_interfaces(tmp_path):
+    add_interface(tmp_path, "lo")
+    add_interface(tmp_path, "eth0", "up")
+    add_interface(tmp_path, "nordlynx")
+    add_interface(tmp_path, "tun0", "down")
+    (tmp_path / "tun1").mkdir()
+    assert read_tunnel_interfaces(str(tmp_path)) == {
+        "nordlynx": "unknown",
+        "tun0": "down",
+        "tun1": "unknown",
+    }
+
+
+def test_read_tunnel_interfaces_missing_root(tmp_path):
+    assert read_tunnel_interfaces(str(tmp_path / "missing")) == {}
+
+
+def test_watcher_notifies_changes(tmp_path):
+    changes = []
+    changed = threading.Event()
+
+    def on_change(state):
+        changes.append(state)
+        changed.set()
+
+    add_interface(tmp_path, "eth0", "up")
+    watcher = InterfaceWatcher(
+        on_change, sysfs_root=str(tmp_path), poll_interval=0.01, use_netlink=False
+    )
+    watcher.start()
+    try:
+        add_interface(tmp_path, "nordlynx")
+        assert changed.wait(timeout=5)
+        changed.clear()
+        (tmp_path / "nordlynx" / "operstate").write_text("down\n")
+        assert changed.wait(timeout=5)
+    finally:
+        watcher.stop(timeout=5)
+    assert changes == [{"nordlynx": "unknown"}, {"nordlynx": "down"}]
+
+
+def test_watcher_ignores_other_interfaces(tmp_path):
+    changed = threading.Event()
+    watcher = InterfaceWatcher(
+        lambda state: changed.set(),
+        sysfs_root=str(tmp_path),
+        poll_interval=0.01,
+        use_netlink=False,
+    )
+    watcher.start()
+    try:
+        add_interface(tmp_path, "wlan0", "up")
+        assert not changed.wait(timeout=0.2)
+    finally:
+        watcher.stop(timeout=5)
@@ -1,10 +1,11 @@
+import time
 from subprocess import CompletedProcess
 from unittest.mock import patch
 
 from nordvpn import ConnectionStatus, NordVpn, Protocols, SettingsNames, Technologies
 
 
-@patch("nordvpn.nordvpn.run")
+@patch("nordvpn.transport.run")
 def test_connect(mock_run):
     mock_run.return_value = CompletedProcess(
         args=[],
@@ -17,7 +18,7 @@ def test_connect(mock_run):
     )
 
 
-@patch("nordvpn.nordvpn.run")
+@patch("nordvpn.transport.run")
 def test_connect_fail(mock_run):
     mock_run.return_value = CompletedProcess(args=[], returncode=1, stdout="Error")
     assert NordVpn().connect() is False
@@ -26,7 +27,7 @@ def test_connect_fail(mock_run):
     )
 
 
-@patch("nordvpn.nordvpn.run")
+@patch("nordvpn.transport.run")
 def test_connect_to_country(mock_run):
     mock_run.return_value = CompletedProcess(
         args=[],
@@ -39,7 +40,7 @@ def test_connect_to_country(mock_run):
     )
 
 
-@patch("nordvpn.nordvpn.run")
+@patch("nordvpn.transport.run")
 def test_connect_to_country_fail(mock_run):
     mock_run.return_value = CompletedProcess(args=[], returncode=1, stdout="Error")
     assert NordVpn().connect_to_country("Birmania") is False
@@ -48,7 +49,7 @@ def test_connect_to_country_fail(mock_run):
     )
 
 
-@patch("nordvpn.nordvpn.run")
+@patch("nordvpn.transport.run")
 def test_connect_to_group(mock_run):
     mock_run.return_value = CompletedProcess(
         args=[],
@@ -64,7 +65,7 @@ def test_connect_to_group(mock_run):
     )
 
 
-@patch("nordvpn.nordvpn.run")
+@patch("nordvpn.transport.run")
 def test_connect_to_group_fail(mock_run):
     mock_run.return_value = CompletedProcess(args=[], returncode=1, stdout="Error")
     assert NordVpn().connect_to_group("secret_group") is False
@@ -76,7 +77,7 @@ def test_connect_to_group_fail(mock_run):
     )
 
 
-@patch("nordvpn.nordvpn.run")
+@patch("nordvpn.transport.run")
 def test_connect_to_city(mock_run):
     mock_run.return_value = CompletedProcess(
         args=[],
@@ -89,7 +90,7 @@ def test_connect_to_city(mock_run):
     )
 
 
-@patch("nordvpn.nordvpn.run")
+@patch("nordvpn.transport.run")
 def test_connect_to_city_fail(mock_run):
     mock_run.return_value = CompletedProcess(args=[], returncode=1, stdout="Error")
     assert NordVpn().connect_to_city("Tortona") is False
@@ -98,7 +99,7 @@ def test_connect_to_city_fail(mock_run):
     )
 
 
-@patch("nordvpn.nordvpn.run")
+@patch("nordvpn.transport.run")
 def test_disconnect(mock_run):
     mock_run.return_value = CompletedProcess(
         args=[],
@@ -111,7 +112,7 @@ def test_disconnect(mock_run):
     )
 
 
-@patch("nordvpn.nordvpn.run")
+@patch("nordvpn.transport.run")
 def test_disconnect_fail(mock_run):
     mock_run.return_value = CompletedProcess(args=[], returncode=1, stdout="Error")
     assert NordVpn().disconnect() is False
@@ -120,7 +121,7 @@ def test_disconnect_fail(mock_run):
     )
 
 
-@patch("nordvpn.nordvpn.run")
+@patch("nordvpn.transport.run")
 def test_get_status_disconnected(mock_run):
     mock_run.return_value = CompletedProcess(
         args=[],
@@ -143,7 +144,7 @@ def test_get_status_disconnected(mock_run):
     assert status.uptime is None
 
 
-@patch("nordvpn.nordvpn.run")
+@patch("nordvpn.transport.run")
 def test_get_status_connecting(mock_run):
     mock_run.return_value = CompletedProcess(
         args=[],
@@ -166,7 +167,7 @@ def test_get_status_connecting(mock_run):
     assert status.uptime is None
 
 
-@patch("nordvpn.nordvpn.run")
+@patch("nordvpn.transport.run")
 def test_get_status_connected(mock_run):
     mock_run.return_value = CompletedProcess(
         args=[],
@@ -197,7 +198,7 @@ Uptime: 3 seconds""",
     assert status.uptime == "3 seconds"
 
 
-@patch("nordvpn.nordvpn.run")
+@patch("nordvpn.transport.run")
 def test_get_status_connected_failed_parsing(mock_run):
     mock_run.return_value = CompletedProcess(
         args=[],
@@ -228,7 +229,7 @@ UptimeWRONG: 3 seconds""",
     assert status.uptime is None
 
 
-@patch("nordvpn.nordvpn.run")
+@patch("nordvpn.transport.run")
 def test_get_countries(mock_run):
     mock_run.return_value = CompletedProcess(
         args=[],
@@ -260,7 +261,7 @@ Denmark			Japan			Singapore""",
     assert countries[-1] == "Vietnam"
 
 
-@patch("nordvpn.nordvpn.run")
+@patch("nordvpn.transport.run")
 def test_get_groups(mock_run):
     mock_run.return_value = CompletedProcess(
         args=[],
@@ -282,7 +283,7 @@ Europe					The_Americas
     assert groups[-1] == "The_Americas"
 
 
-@patch("nordvpn.nordvpn.run")
+@patch("nordvpn.transport.run")
 def test_get_cities(mock_run):
     mock_run.return_value = CompletedProcess(
         args=[],
@@ -303,7 +304,58 @@ London		Manchester""",
     assert cities[1] == "Manchester"
 
 
-@patch("nordvpn.nordvpn.run")
+def fake_cities_run(latency: float):
+    """Return a fake "nordvpn cities" runner that sleeps for latency seconds"""
+
+    def _run(args, **kwargs):
+        time.sleep(latency)
+        country = args[-1]
+        return CompletedProcess(
+            args=args, returncode=0, stdout=f"{country}_City_B\t{country}_City_A"
+        )
+
+    return _run
+
+
+@patch("nordvpn.transport.run")
+def test_get_cities_for(mock_run):
+    mock_run.side_effect = fake_cities_run(0)
+    countries = ["Italy", "Albania", "Germany"]
+    cities = NordVpn().get_cities_for(countries)
+    assert list(cities.keys()) == countries
+    assert cities["Italy"] == ["Italy_City_A", "Italy_City_B"]
+    assert cities["Albania"] == ["Albania_City_A", "Albania_City_B"]
+    assert mock_run.call_count == len(countries)
+
+
+@patch("nordvpn.transport.run")
+def test_get_cities_for_empty(mock_run):
+    assert NordVpn().get_cities_for([]) == {}
+    mock_run.assert_not_called()
+
+
+@patch("nordvpn.transport.run")
+def test_get_cities_for_is_concurrent(mock_run):
+    latency = 0.05
+    countries = [f"Country{i}" for i in range(16)]
+    mock_run.side_effect = fake_cities_run(latency)
+    client = NordVpn()
+
+    start = time.perf_counter()
+    sequential = {country: client.get_cities(country) for country in countries}
+    sequential_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    concurrent = client.get_cities_for(countries, max_workers=8)
+    concurrent_time = time.perf_counter() - start
+
+    assert concurrent == sequential
+    assert sequential_time >= latency * len(countries)
+    # 16 queries over 8 workers need roughly two rounds of latency
+    assert concurrent_time < sequential_time / 3
+
+
+@patch("nordvpn.transport.run")
 def test_get_settings(mock_run):
     mock_run.return_value = CompletedProcess(
         args=[],
@@ -341,7 +393,7 @@ Whitelisted subnets:
     assert settings.whitelisted_subnets[1] == "172.16.0.0/16"
 
 
-@patch("nordvpn.nordvpn.run")
+@patch("nordvpn.transport.run")
 def test_set_technology_openvpn(mock_run):
     mock_run.return_value = CompletedProcess(
         args=[],
@@ -358,7 +410,7 @@ def test_set_technology_openvpn(mock_run):
     assert result
 
 
-@patch("nordvpn.nordvpn.run")
+@patch("nordvpn.transport.run")
 def test_set_technology_nordlynx(mock_run):
     mock_run.return_value = CompletedProcess(
         args=[],
@@ -375,7 +427,7 @@ def test_set_technology_nordlynx(mock_run):
     assert result
 
 
-@patch("nordvpn.nordvpn.run")
+@patch("nordvpn.transport.run")
 def test_set_technology_fail(mock_run):
     mock_run.return_value = CompletedProcess(
         args=[],
@@ -392,7 +444,7 @@ def test_set_technology_fail(mock_run):
     assert result is False
 
 
-@patch("nordvpn.nordvpn.run")
+@patch("nordvpn.transport.run")
 def test_set_firewall(mock_run):
     mock_run.return_value = CompletedProcess(
         args=[],
@@ -409,7 +461,7 @@ def test_set_firewall(mock_run):
     assert result
 
 
-@patch("nordvpn.nordvpn.run")
+@patch("nordvpn.transport.run")
 def test_set_firewall_off(mock_run):
     mock_run.return_value = CompletedProcess(
         args=[],
@@ -426,7 +478,7 @@ def test_set_firewall_off(mock_run):
     assert result
 
 
-@patch("nordvpn.nordvpn.run")
+@patch("nordvpn.transport.run")
 def test_set_firewall_fail(mock_run):
     mock_run.return_value = CompletedProcess(
         args=[],
@@ -443,7 +495,7 @@ def test_set_firewall_fail(mock_run):
     assert result is False
 
 
-@patch("nordvpn.nordvpn.run")
+@patch("nordvpn.transport.run")
 def test_set_kill_switch(mock_run):
     mock_run.return_value = CompletedProcess(
         args=[],
@@ -460,7 +512,7 @@ def test_set_kill_switch(mock_run):
     assert result
 
 
-@patch("nordvpn.nordvpn.run")
+@patch("nordvpn.transport.run")
 def test_set_kill_switch_off(mock_run):
     mock_run.return_value = CompletedProcess(
         args=[],
@@ -477,7 +529,7 @@ def test_set_kill_switch_off(mock_run):
     assert result
 
 
-@patch("nordvpn.nordvpn.run")
+@patch("nordvpn.transport.run")
 def test_set_kill_switch_fail(mock_run):
     mock_run.return_value = CompletedProcess(
         args=[],
@@ -494,7 +546,7 @@ def test_set_kill_switch_fail(mock_run):
     assert result is False
 
 
-@patch("nordvpn.nordvpn.run")
+@patch("nordvpn.transport.run")
 def test_set_cybersec(mock_run):
     mock_run.return_value = CompletedProcess(
         args=[],
@@ -511,7 +563,7 @@ def test_set_cybersec(mock_run):
     assert result
 
 
-@patch("nordvpn.nordvpn.run")
+@patch("nordvpn.transport.run")
 def test_set_cybersec_off(mock_run):
     mock_run.return_value = CompletedProcess(
         args=[],
@@ -528,7 +580,7 @@ def test_set_cybersec_off(mock_run):
     assert result
 
 
-@patch("nordvpn.nordvpn.run")
+@patch("nordvpn.transport.run")
 def test_set_cybersec_fail(mock_run):
     mock_run.return_value = CompletedProcess(
         args=[],
@@ -545,7 +597,7 @@ def test_set_cybersec_fail(mock_run):
     assert result is False
 
 
-@patch("nordvpn.nordvpn.run")
+@patch("nordvpn.transport.run")
 def test_set_notify(mock_run):
     mock_run.return_value = CompletedProcess(
         args=[],
@@ -562,7 +614,7 @@ def test_set_notify(mock_run):
     assert result
 
 
-@patch("nordvpn.nordvpn.run")
+@patch("nordvpn.transport.run")
 def test_set_notify_fail(mock_run):
     mock_run.return_value = CompletedProcess(
         args=[],
@@ -579,7 +631,7 @@ def test_set_notify_fail(mock_run):
     assert result is False
 
 
-@patch("nordvpn.nordvpn.run")
+@patch("nordvpn.transport.run")
 def test_set_notify_off(mock_run):
     mock_run.return_value = CompletedProcess(
         args=[],
@@ -596,7 +648,7 @@ def test_set_notify_off(mock_run):
     assert result
 
 
-@patch("nordvpn.nordvpn.run")
+@patch("nordvpn.transport.run")
 def test_set_auto_connect(mock_run):
     mock_run.return_value = CompletedProcess(
         args=[],
@@ -613,7 +665,7 @@ def test_set_auto_connect(mock_run):
     assert result
 
 
-@patch("nordvpn.nordvpn.run")
+@patch("nordvpn.transport.run")
 def test_set_auto_connect_off(mock_run):
     mock_run.return_value = CompletedProcess(
         args=[],
@@ -630,7 +682,7 @@ def test_set_auto_connect_off(mock_run):
     assert result
 
 
-@patch("nordvpn.nordvpn.run")
+@patch("nordvpn.transport.run")
 def test_set_auto_connect_with_args(mock_run):
     mock_run.return_value = CompletedProcess(
         args=[],
@@ -647,7 +699,7 @@ def test_set_auto_connect_with_args(mock_run):
     assert result
 
 
-@patch("nordvpn.nordvpn.run")
+@patch("nordvpn.transport.run")
 def test_set_auto_connect_fail(mock_run):
     mock_run.return_value = CompletedProcess(
         args=[],
@@ -664,7 +716,7 @@ def test_set_auto_connect_fail(mock_run):
     assert result is False
 
 
-@patch("nordvpn.nordvpn.run")
+@patch("nordvpn.transport.run")
 def test_set_ipv6(mock_run):
     mock_run.return_value = CompletedProcess(
         args=[],
@@ -681,7 +733,7 @@ def test_set_ipv6(mock_run):
     assert result
 
 
-@patch("nordvpn.nordvpn.run")
+@patch("nordvpn.transport.run")
 def test_set_ipv6_off(mock_run):
     mock_run.return_value = CompletedProcess(
         args=[],
@@ -698,7 +750,7 @@ def test_set_ipv6_off(mock_run):
     assert result
 
 
-@patch("nordvpn.nordvpn.run")
+@patch("nordvpn.transport.run")
 def test_set_ipv6_fail(mock_run):
     mock_run.return_value = CompletedProcess(
         args=[],
@@ -715,7 +767,7 @@ def test_set_ipv6_fail(mock_run):
     assert result is False
 
 
-@patch("nordvpn.nordvpn.run")
+@patch("nordvpn.transport.run")
 def test_settings_help_message(mock_run):
     mock_run.return_value = CompletedProcess(
         args=[],
@@ -744,7 +796,7 @@ Options:
     assert message == mock_run.return_value.stdout
 
 
-@patch("nordvpn.nordvpn.run")
+@patch("nordvpn.transport.run")
 def test_set_dns(mock_run):
     mock_run.return_value = CompletedProcess(
         args=[],
@@ -762,7 +814,7 @@ DNS is set to '1.1.1.1, 2.2.2.2, 3.3.3.3' successfully.""",
     assert result
 
 
-@patch("nordvpn.nordvpn.run")
+@patch("nordvpn.transport.run")
 def test_set_dns_off(mock_run):
     mock_run.return_value = CompletedProcess(
         args=[],
@@ -779,7 +831,7 @@ def test_set_dns_off(mock_run):
     assert result
 
 
-@patch("nordvpn.nordvpn.run")
+@patch("nordvpn.transport.run")
 def test_set_dns_fail(mock_run):
     mock_run.return_value = CompletedProcess(
         args=[],
@@ -796,7 +848,7 @@ def test_set_dns_fail(mock_run):
     assert result is False
 
 
-@patch("nordvpn.nordvpn.run")
+@patch("nordvpn.transport.run")
 def test_add_whitelisted_subnet(mock_run):
     mock_run.return_value = CompletedProcess(
         args=[],
@@ -813,7 +865,7 @@ def test_add_whitelisted_subnet(mock_run):
     assert result
 
 
-@patch("nordvpn.nordvpn.run")
+@patch("nordvpn.transport.run")
 def test_add_whitelisted_subnet_fail(mock_run):
     mock_run.return_value = CompletedProcess(
         args=[],
@@ -830,7 +882,7 @@ def test_add_whitelisted_subnet_fail(mock_run):
     assert result is False
 
 
-@patch("nordvpn.nordvpn.run")
+@patch("nordvpn.transport.run")
 def test_remove_whitelisted_subnet(mock_run):
     mock_run.return_value = CompletedProcess(
         args=[],
@@ -847,7 +899,7 @@ def test_remove_whitelisted_subnet(mock_run):
     assert result
 
 
-@patch("nordvpn.nordvpn.run")
+@patch("nordvpn.transport.run")
 def test_add_whitelisted_port(mock_run):
     mock_run.return_value = CompletedProcess(
         args=[],
@@ -864,7 +916,7 @@ def test_add_whitelisted_port(mock_run):
     assert result
 
 
-@patch("nordvpn.nordvpn.run")
+@patch("nordvpn.transport.run")
 def test_add_whitelisted_port_fail(mock_run):
     mock_run.return_value = CompletedProcess(
         args=[],
@@ -881,7 +933,7 @@ def test_add_whitelisted_port_fail(mock_run):
     assert result is False
 
 
-@patch("nordvpn.nordvpn.run")
+@patch("nordvpn.transport.run")
 def test_remove_whitelisted_port(mock_run):
     mock_run.return_value = CompletedProcess(
         args=[],
@@ -898,7 +950,7 @@ def test_remove_whitelisted_port(mock_run):
     assert result
 
 
-@patch("nordvpn.nordvpn.run")
+@patch("nordvpn.transport.run")
 def test_add_whitelisted_port_protocol(mock_run):
     mock_run.return_value = CompletedProcess(
         args=[],
@@ -0,0 +1,56 @@
+import pytest
+
+from nordvpn import ConnectionStatus
+from nordvpn_indicator.scheduler import PollScheduler
+
+
+def make_scheduler(clock):
+    return PollScheduler(
+        fast_interval=0.5,
+        base_interval=2,
+        max_interval=16,
+        backoff=2,
+        boost_duration=10,
+        clock=clock,
+    )
+
+
+def test_backoff_while_stable(clock):
+    scheduler = make_scheduler(clock)
+    intervals = [scheduler.next_interval(ConnectionStatus.CONNECTED) for _ in range(6)]
+    assert intervals == [2, 4, 8, 16, 16, 16]
+
+
+def test_status_change_resets_backoff(clock):
+    scheduler = make_scheduler(clock)
+    for _ in range(4):
+        scheduler.next_interval(ConnectionStatus.CONNECTED)
+    assert scheduler.next_interval(ConnectionStatus.DISCONNECTED) == 2
+    assert scheduler.next_interval(ConnectionStatus.DISCONNECTED) == 4
+
+
+def test_fast_polling_while_connecting(clock):
+    scheduler = make_scheduler(clock)
+    for _ in range(4):
+        scheduler.next_interval(ConnectionStatus.CONNECTED)
+    assert scheduler.next_interval(ConnectionStatus.CONNECTING) == 0.5
+    assert scheduler.next_interval(ConnectionStatus.CONNECTING) == 0.5
+    assert scheduler.next_interval(ConnectionStatus.CONNECTED) == 2
+
+
+def test_fast_polling_after_activity(clock):
+    scheduler = make_scheduler(clock)
+    for _ in range(4):
+        scheduler.next_interval(ConnectionStatus.DISCONNECTED)
+    scheduler.notify_activity()
+    clock.now += 9.9
+    assert scheduler.next_interval(ConnectionStatus.DISCONNECTED) == 0.5
+    clock.now += 0.1
+    assert scheduler.next_interval(ConnectionStatus.DISCONNECTED) == 4
+
+
+def test_invalid_configuration():
+    with pytest.raises(ValueError):
+        PollScheduler(fast_interval=5, base_interval=2)
+    with pytest.raises(ValueError):
+        PollScheduler(backoff=0.5)
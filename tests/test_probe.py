@@ -0,0 +1,139 @@
+import asyncio
+import io
+import json
+import socket
+
+from nordvpn.probe import (
+    ProbeResult,
+    fastest_server,
+    fetch_recommended_servers,
+    probe,
+    probe_all,
+    rank,
+)
+
+
+def delayed_opener(ports, delays):
+    """
+    Open the connections to local servers, adding an artificial delay to
+    each host
+    """
+
+    async def _open(host, port):
+        await asyncio.sleep(delays.get(host, 0))
+        return await asyncio.open_connection("127.0.0.1", ports[host])
+
+    return _open
+
+
+async def unresolved(host, port):
+    # The fake hosts are mapped to local servers by the opener
+    return host
+
+
+def closed_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def run_probes(hosts, delays, **kwargs):
+    server = await asyncio.start_server(
+        lambda reader, writer: writer.close(), "127.0.0.1", 0
+    )
+    port = server.sockets[0].getsockname()[1]
+    ports = {host: port for host in hosts}
+    ports["refused"] = closed_port()
+    try:
+        return await probe_all(
+            list(hosts) + ["refused"],
+            opener=delayed_opener(ports, delays),
+            resolver=unresolved,
+            **kwargs,
+        )
+    finally:
+        server.close()
+        await server.wait_closed()
+
+
+def test_probe_all_ranks_by_rtt():
+    delays = {"slow": 0.2, "fast": 0.0, "medium": 0.1}
+    results = asyncio.run(run_probes(delays, delays))
+    assert [r.host for r in results] == ["fast", "medium", "slow", "refused"]
+    assert results[0].rtt < results[1].rtt < results[2].rtt
+    assert not results[3].reachable
+    assert results[3].error
+
+
+def test_probe_all_timeout_and_concurrency():
+    delays = {f"s{i}": 0.2 for i in range(4)}
+    delays["stuck"] = 10
+    loop_time = []
+
+    async def _run():
+        start = asyncio.get_running_loop().time()
+        results = await run_probes(delays, delays, timeout=0.5, max_concurrency=4)
+        loop_time.append(asyncio.get_running_loop().time() - start)
+        return results
+
+    results = asyncio.run(_run())
+    errors = {r.host: r.error for r in results if not r.reachable}
+    assert set(errors) == {"refused", "stuck"}
+    assert errors["stuck"] == "timeout"
+    # The slow probes run concurrently, the stuck one is bounded by the timeout
+    assert loop_time[0] < 1.5
+
+
+def test_rank_puts_unreachable_last():
+    results = [
+        ProbeResult("a", 443, None, "timeout"),
+        ProbeResult("b", 443, 0.3),
+        ProbeResult("c", 443, 0.1),
+    ]
+    assert [r.host for r in rank(results)] == ["c", "b", "a"]
+
+
+def test_fastest_server():
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen()
+    try:
+        port = server.getsockname()[1]
+        assert fastest_server(["127.0.0.1"], port=port) == "127.0.0.1"
+        assert fastest_server(["127.0.0.1"], port=closed_port()) is None
+        assert fastest_server([]) is None
+    finally:
+        server.close()
+
+
+def test_fetch_recommended_servers():
+    def fake_urlopen(url, timeout):
+        assert "limit=2" in url
+        body = [{"hostname": "it42.nordvpn.com"}, {"hostname": "es7.nordvpn.com"}]
+        return io.BytesIO(json.dumps(body).encode())
+
+    assert fetch_recommended_servers(limit=2, urlopen=fake_urlopen) == [
+        "it42.nordvpn.com",
+        "es7.nordvpn.com",
+    ]
+
+
+def test_probe_excludes_the_resolution():
+    async def slow_resolver(host, port):
+        await asyncio.sleep(0.3)
+        return "127.0.0.1"
+
+    async def _run():
+        server = await asyncio.start_server(
+            lambda reader, writer: writer.close(), "127.0.0.1", 0
+        )
+        port = server.sockets[0].getsockname()[1]
+        try:
+            return await probe("local", port, resolver=slow_resolver)
+        finally:
+            server.close()
+            await server.wait_closed()
+
+    result = asyncio.run(_run())
+    assert result.host == "local"
+    assert result.rtt < 0.2
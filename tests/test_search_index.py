@@ -0,0 +1,73 @@
+import time
+
+import pytest
+
+from nordvpn_indicator.search import EntryKind, SearchEntry, SearchIndex, normalize
+
+COUNTRIES = ["Italy", "United_States", "United_Kingdom", "Spain"]
+GROUPS = ["P2P", "Double_VPN", "Onion_Over_VPN"]
+CITIES = {
+    "Italy": ["Milan", "Rome"],
+    "United_States": ["New_York", "Los_Angeles", "Miami"],
+    "Spain": ["Madrid", "Barcelona"],
+}
+
+
+@pytest.fixture
+def index():
+    return SearchIndex.build(COUNTRIES, GROUPS, CITIES)
+
+
+def targets(entries):
+    return [entry.target for entry in entries]
+
+
+def test_normalize():
+    assert normalize("  New_York ") == "new york"
+    assert normalize("Double VPN") == "double vpn"
+
+
+def test_build(index):
+    assert len(index) == 14
+    assert SearchEntry(EntryKind.CITY, "New_York", "New York (United States)") in (
+        index.entries
+    )
+
+
+def test_prefix_search(index):
+    assert targets(index.search("mi")) == ["Miami", "Milan"]
+    assert targets(index.search("united")) == ["United_Kingdom", "United_States"]
+    # Any word of the name can match
+    assert targets(index.search("york")) == ["New_York"]
+    assert targets(index.search("United St")) == ["United_States"]
+
+
+def test_ranking(index):
+    # Exact matches first, countries before cities and groups
+    assert targets(index.search("Italy")) == ["Italy"]
+    assert targets(index.search("m")) == ["Madrid", "Miami", "Milan"]
+    assert targets(index.search("vpn")) == ["Double_VPN", "Onion_Over_VPN"]
+
+
+def test_substring_search(index):
+    assert targets(index.search("ngdo")) == ["United_Kingdom"]
+    assert targets(index.search("celo")) == ["Barcelona"]
+    assert index.search("xyz") == []
+    assert index.search("  ") == []
+
+
+def test_limit(index):
+    assert len(index.search("m")) == 3
+    assert targets(index.search("m", limit=2)) == ["Madrid", "Miami"]
+    assert index.search("m", limit=0) == []
+
+
+def test_lookup_speed():
+    countries = [f"Country_{i}" for i in range(100)]
+    cities = {c: [f"City_{c}_{i}" for i in range(50)] for c in countries}
+    index = SearchIndex.build(countries, GROUPS, cities)
+    start = time.perf_counter()
+    for _ in range(100):
+        index.search("city_country_4")
+        index.search("ntry_9")
+    assert (time.perf_counter() - start) / 200 < 0.01
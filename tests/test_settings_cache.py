@@ -0,0 +1,87 @@
+from nordvpn import FakeTransport, NordVpn, Protocols, SettingsNames, Technologies
+
+SETTINGS = """Technology: OpenVPN
+Protocol: UDP
+Firewall: enabled
+Kill Switch: disabled
+Whitelisted subnets:
+    10.0.0.0/8
+"""
+OK = "Setting is successfully set."
+
+
+def make_client(clock, **kwargs):
+    transport = FakeTransport(
+        {
+            "settings": SETTINGS,
+            "set killswitch on": OK,
+            "set protocol tcp": OK,
+            "set technology nordlynx": OK,
+            "whitelist add subnet 172.16.0.0/16": OK,
+            "whitelist remove subnet 10.0.0.0/8": OK,
+            "whitelist add port 22": OK,
+        }
+    )
+    client = NordVpn(transport=transport, clock=clock, **kwargs)
+    return client, transport
+
+
+def settings_reads(transport):
+    return transport.calls.count(["settings"])
+
+
+def test_settings_are_cached_until_expired(clock):
+    client, transport = make_client(clock, settings_ttl=10)
+    assert client.get_settings() is client.get_settings()
+    assert settings_reads(transport) == 1
+    clock.now += 10
+    client.get_settings()
+    assert settings_reads(transport) == 2
+    client.get_settings(refresh=True)
+    assert settings_reads(transport) == 3
+
+
+def test_settings_cache_disabled(clock):
+    client, transport = make_client(clock, settings_ttl=0)
+    client.get_settings()
+    client.get_settings()
+    assert settings_reads(transport) == 2
+
+
+def test_setters_write_through(clock):
+    client, transport = make_client(clock)
+    client.get_settings()
+    assert client.set_kill_switch(True)
+    assert client.set_protocol(Protocols.TCP)
+    assert client.add_whitelisted_subnet("172.16.0.0/16")
+    assert client.remove_whitelisted_subnet("10.0.0.0/8")
+    settings = client.get_settings()
+    assert settings.kill_swith is True
+    assert settings.protocol == Protocols.TCP
+    assert settings.whitelisted_subnets == ("172.16.0.0/16",)
+    assert settings_reads(transport) == 1
+    # Failed commands leave the cache untouched
+    assert not client.set_firewall(False)
+    assert client.get_settings().firewall is True
+    assert settings_reads(transport) == 1
+
+
+def test_unknown_results_invalidate(clock):
+    client, transport = make_client(clock)
+    client.get_settings()
+    assert client.set_technology(Technologies.NORDLYNX)
+    client.get_settings()
+    assert settings_reads(transport) == 2
+    assert client.add_whitelisted_port("22")
+    client.get_settings()
+    assert settings_reads(transport) == 3
+
+
+def test_apply_settings_writes_through(clock):
+    client, transport = make_client(clock)
+    client.apply_settings(
+        {SettingsNames.KILL_SWITCH: True, SettingsNames.FIREWALL: True},
+        reconnect=False,
+    )
+    assert client.get_settings().kill_swith is True
+    assert settings_reads(transport) == 1
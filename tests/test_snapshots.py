@@ -0,0 +1,134 @@
+import copy
+import pickle
+
+import pytest
+
+from nordvpn import (
+    ConnectionStatus,
+    FrozenInstanceError,
+    NordVpnSettings,
+    NordVpnStatus,
+    Snapshot,
+    Technologies,
+)
+
+RAW_STATUS = """Status: Connected
+Current server: it42.nordvpn.com
+Country: Italy
+City: Milan
+Server IP: 1.2.3.4
+Current technology: NordLynx
+Current protocol: UDP
+Transfer: 1.2 MiB received, 300 KiB sent
+Uptime: 5 minutes 3 seconds
+"""
+
+RAW_SETTINGS = """Technology: NORDLYNX
+Firewall: enabled
+Kill Switch: disabled
+CyberSec: disabled
+Notify: enabled
+Auto-connect: disabled
+IPv6: disabled
+DNS: disabled
+Whitelisted subnets:
+    10.0.0.0/8
+"""
+
+
+def test_status_is_immutable():
+    status = NordVpnStatus(RAW_STATUS)
+    with pytest.raises(FrozenInstanceError):
+        status.status = ConnectionStatus.DISCONNECTED
+    with pytest.raises(FrozenInstanceError):
+        del status.country
+    with pytest.raises(AttributeError):
+        status.extra = True
+    assert not hasattr(status, "__dict__")
+
+
+def test_status_equality_and_hash():
+    status = NordVpnStatus(RAW_STATUS)
+    assert status == NordVpnStatus(RAW_STATUS)
+    assert hash(status) == hash(NordVpnStatus(RAW_STATUS))
+    assert status != NordVpnStatus("Status: Disconnected")
+    assert len({status, NordVpnStatus(RAW_STATUS)}) == 1
+
+
+def test_status_defaults():
+    status = NordVpnStatus("Status: Disconnected")
+    assert status.status == ConnectionStatus.DISCONNECTED
+    assert status.country is None
+    assert status.warnings == frozenset()
+    invalid = NordVpnStatus("Status: Unknown")
+    assert invalid.status == ConnectionStatus.DISCONNECTED
+
+
+def test_settings_replace():
+    settings = NordVpnSettings(RAW_SETTINGS)
+    assert settings.whitelisted_subnets == ("10.0.0.0/8",)
+    changed = settings.replace(firewall=False, technology=Technologies.OPENVPN)
+    assert changed.firewall is False
+    assert changed.technology == Technologies.OPENVPN
+    assert settings.firewall is True
+    assert settings.technology == Technologies.NORDLYNX
+    assert changed != settings
+    assert changed.replace(firewall=True, technology=Technologies.NORDLYNX) == settings
+    with pytest.raises(TypeError):
+        settings.replace(unknown=1)
+
+
+def test_settings_defaults_are_not_shared():
+    first = NordVpnSettings("")
+    second = NordVpnSettings("")
+    assert first.whitelisted_subnets == ()
+    assert first == second
+    assert first != NordVpnStatus("")
+
+
+def test_fields_are_computed_per_class():
+    class Point(Snapshot):
+        __slots__ = ("x", "y", "_cache")
+
+        def __init__(self, x, y):
+            self._init_fields(x=x, y=y)
+
+    class Point3D(Point):
+        __slots__ = ("z",)
+
+        def __init__(self, x, y, z):
+            self._init_fields(x=x, y=y, z=z)
+
+    assert Point._field_names == ("x", "y")
+    assert Point3D._field_names == ("x", "y", "z")
+    assert Point3D(1, 2, 3).replace(z=4) == Point3D(1, 2, 4)
+    assert repr(Point(1, 2)) == "Point(x=1, y=2)"
+
+
+@pytest.mark.parametrize(
+    "snapshot", [NordVpnStatus(RAW_STATUS), NordVpnSettings(RAW_SETTINGS)]
+)
+def test_snapshots_can_be_copied_and_pickled(snapshot):
+    for clone in (
+        copy.copy(snapshot),
+        copy.deepcopy(snapshot),
+        pickle.loads(pickle.dumps(snapshot)),
+    ):
+        assert clone == snapshot
+        assert type(clone) is type(snapshot)
+        with pytest.raises(FrozenInstanceError):
+            setattr(clone, "technology", None)
+
+
+def test_pickled_status_parses_its_counters():
+    status = pickle.loads(pickle.dumps(NordVpnStatus(RAW_STATUS)))
+    assert status.received_bytes == int(1.2 * 1024**2)
+    assert status.uptime_seconds == 303
+
+
+def test_status_summary_leaves_out_the_counters():
+    status = NordVpnStatus(RAW_STATUS)
+    assert "Country: Italy" in status.summary()
+    assert "Transfer" not in status.summary()
+    assert "Uptime" not in status.summary()
+    assert status.summary() == status.replace(transfer="1 KiB received").summary()
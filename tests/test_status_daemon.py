@@ -0,0 +1,185 @@
+import queue
+import socket
+
+import pytest
+
+from nordvpn import (
+    ConnectionStatus,
+    DaemonTransport,
+    FakeTransport,
+    NordVpn,
+    StatusDaemon,
+    StatusSubscriber,
+    TransportError,
+)
+
+CONNECTED = """Status: Connected
+Current server: it42.nordvpn.com
+Country: Italy"""
+DISCONNECTED = "Status: Disconnected"
+
+
+class FakeVpn:
+    """
+    Stand-in of the nordvpn CLI switching state on connect and disconnect
+    """
+
+    def __init__(self) -> None:
+        self.output = DISCONNECTED
+        self.transport = FakeTransport(
+            {
+                "status": lambda: self.output,
+                "connect": self._connect,
+                "countries": "Italy",
+            }
+        )
+
+    def _connect(self) -> str:
+        self.output = CONNECTED
+        return "You are connected to Italy #42 (it42.nordvpn.com)!"
+
+
+@pytest.fixture
+def vpn():
+    return FakeVpn()
+
+
+@pytest.fixture
+def daemon(tmp_path, vpn):
+    daemon = StatusDaemon(
+        NordVpn(transport=vpn.transport),
+        socket_path=str(tmp_path / "daemon.sock"),
+        interval=60,
+    )
+    daemon.start()
+    yield daemon
+    daemon.stop()
+
+
+def status_calls(vpn):
+    return vpn.transport.calls.count(["status"])
+
+
+def test_daemon_serves_the_polled_status(daemon, vpn):
+    client = NordVpn(transport=DaemonTransport(daemon.socket_path))
+    for _ in range(5):
+        assert client.get_status().status == ConnectionStatus.DISCONNECTED
+    # A single poll serves all the requests
+    assert status_calls(vpn) == 1
+    assert client.get_countries() == ["Italy"]
+    assert status_calls(vpn) == 1
+
+
+def test_daemon_polls_after_commands(daemon, vpn):
+    changes = queue.Queue()
+    subscriber = StatusSubscriber(changes.put, daemon.socket_path)
+    subscriber.start()
+    try:
+        assert changes.get(timeout=5) == DISCONNECTED
+        client = NordVpn(transport=DaemonTransport(daemon.socket_path))
+        assert client.connect()
+        # The connection is pushed without waiting the poll interval
+        assert changes.get(timeout=5) == CONNECTED
+        assert client.get_status().status == ConnectionStatus.CONNECTED
+    finally:
+        subscriber.stop(timeout=5)
+
+
+def test_daemon_invalid_messages(daemon):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(5)
+        sock.connect(daemon.socket_path)
+        reader = sock.makefile("rb")
+        sock.sendall(b"not json\n")
+        assert b'"ok": false' in reader.readline()
+        sock.sendall(b'{"command": "status"}\n')
+        assert b"Invalid command" in reader.readline()
+        reader.close()
+
+
+def test_subscriber_reports_disconnections(tmp_path, vpn):
+    path = str(tmp_path / "daemon.sock")
+    changes = queue.Queue()
+    disconnections = queue.Queue()
+    subscriber = StatusSubscriber(
+        changes.put,
+        path,
+        on_disconnect=lambda: disconnections.put(True),
+        retry_interval=0.01,
+    )
+    subscriber.start()
+    try:
+        # No daemon running yet
+        assert disconnections.get(timeout=5)
+        daemon = StatusDaemon(NordVpn(transport=vpn.transport), socket_path=path)
+        daemon.start()
+        assert changes.get(timeout=5) == DISCONNECTED
+        daemon.stop()
+        while not disconnections.empty():
+            disconnections.get()
+        assert disconnections.get(timeout=5)
+    finally:
+        subscriber.stop(timeout=5)
+
+
+def test_daemon_socket_ownership(tmp_path, daemon, vpn):
+    # Another daemon can't take over a socket in use
+    with pytest.raises(OSError):
+        StatusDaemon(
+            NordVpn(transport=vpn.transport), socket_path=daemon.socket_path
+        ).start()
+    # The socket left by a daemon no longer running is replaced
+    path = tmp_path / "stale.sock"
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(str(path))
+    stale.close()
+    other = StatusDaemon(NordVpn(transport=vpn.transport), socket_path=str(path))
+    other.start()
+    other.stop()
+    assert not path.exists()
+
+
+def test_counters_changes_are_rate_limited(vpn):
+    now = [0.0]
+    daemon = StatusDaemon(
+        NordVpn(transport=vpn.transport), counters_interval=10, clock=lambda: now[0]
+    )
+    vpn.output = CONNECTED + "\nTransfer: 1 KiB received, 1 KiB sent"
+    daemon.poll()
+    assert daemon.version == 1
+    vpn.output = CONNECTED + "\nTransfer: 2 KiB received, 1 KiB sent"
+    now[0] = 2.0
+    daemon.poll()
+    # Served to the status commands, not pushed
+    assert daemon.version == 1
+    assert daemon.status.received_bytes == 2048
+    now[0] = 10.0
+    daemon.poll()
+    assert daemon.version == 2
+    vpn.output = DISCONNECTED
+    now[0] = 11.0
+    daemon.poll()
+    assert daemon.version == 3
+
+
+def test_status_fails_when_the_poller_never_succeeds(tmp_path):
+    def fail():
+        raise OSError("nordvpn is not installed")
+
+    transport = FakeTransport({"status": fail, "countries": "Italy"})
+    daemon = StatusDaemon(
+        NordVpn(transport=transport),
+        socket_path=str(tmp_path / "daemon.sock"),
+        interval=60,
+        status_timeout=0.1,
+    )
+    daemon.start()
+    try:
+        client = DaemonTransport(daemon.socket_path, timeout=5)
+        with pytest.raises(TransportError):
+            client.run(["status"])
+        # The connection is still usable
+        assert client.run(["countries"]) == "Italy"
+        client.close()
+    finally:
+        daemon.stop()
@@ -0,0 +1,116 @@
+import csv
+import json
+
+import pytest
+
+from nordvpn import ConnectionStatus, NordVpnStatus, StatusHistory
+
+CONNECTED = NordVpnStatus(
+    """Status: Connected
+Current server: it42.nordvpn.com
+Transfer: 1 KiB received, 2 KiB sent
+"""
+)
+DISCONNECTED = NordVpnStatus("Status: Disconnected")
+CONNECTING = NordVpnStatus("Status: Connecting")
+
+
+def test_history_append_and_samples():
+    history = StatusHistory(capacity=4)
+    history.append(CONNECTED, timestamp=1.0)
+    history.append(DISCONNECTED, timestamp=2.0)
+    assert len(history) == 2
+    first, second = history.samples()
+    assert first.timestamp == 1.0
+    assert first.status == ConnectionStatus.CONNECTED
+    assert first.received_bytes == 1024
+    assert first.sent_bytes == 2048
+    assert first.server == "it42.nordvpn.com"
+    assert second.status == ConnectionStatus.DISCONNECTED
+    assert second.received_bytes is None
+    assert second.server is None
+    assert [s.timestamp for s in history.samples(since=2.0)] == [2.0]
+
+
+def test_history_is_bounded():
+    history = StatusHistory(capacity=3)
+    for timestamp in range(10):
+        history.append(CONNECTED, timestamp=float(timestamp))
+    assert len(history) == 3
+    assert history.overwritten == 7
+    assert [s.timestamp for s in history.samples()] == [7.0, 8.0, 9.0]
+    with pytest.raises(ValueError):
+        StatusHistory(capacity=0)
+
+
+def test_history_drops():
+    history = StatusHistory(capacity=3)
+    states = [CONNECTED, DISCONNECTED, CONNECTING, CONNECTED, DISCONNECTED]
+    for timestamp, status in enumerate(states):
+        history.append(status, timestamp=float(timestamp))
+    # Drops are counted also after their samples are overwritten
+    assert history.drops == 2
+    assert history.count_drops() == 1
+    assert history.count_drops(since=5.0) == 0
+    history.clear()
+    assert len(history) == 0
+    assert history.drops == 0
+
+
+def test_history_server_names_are_released():
+    history = StatusHistory(capacity=3)
+    for number in range(100):
+        history.append(CONNECTED.replace(current_server=f"it{number}.nordvpn.com"))
+    # Only the names of the samples in the buffer are kept
+    assert len(history._server_ids) == 3
+    assert len(history._server_names) <= 4
+    assert [s.server for s in history.samples()] == [
+        "it97.nordvpn.com",
+        "it98.nordvpn.com",
+        "it99.nordvpn.com",
+    ]
+    history.clear()
+    assert history._server_ids == {}
+    assert history._server_names == []
+
+
+def test_history_user_transitions_are_not_drops():
+    now = [0.0]
+    history = StatusHistory(capacity=10, clock=lambda: now[0])
+    history.append(CONNECTED)
+    history.notify_user_transition()
+    now[0] = 1.0
+    history.append(CONNECTING)
+    history.append(CONNECTED)
+    assert history.drops == 0
+    # The notification only covers the next transition
+    history.append(DISCONNECTED)
+    assert history.drops == 1
+    assert history.count_drops() == 1
+
+
+def test_history_export(tmp_path):
+    history = StatusHistory(capacity=2)
+    history.append(CONNECTED, timestamp=1.0)
+    history.append(DISCONNECTED, timestamp=2.0)
+
+    history.dump(str(tmp_path / "history.csv"))
+    with open(tmp_path / "history.csv", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert rows[0]["status"] == "Connected"
+    assert rows[0]["server"] == "it42.nordvpn.com"
+    assert rows[0]["received_bytes"] == "1024"
+    assert rows[1]["sent_bytes"] == ""
+
+    history.dump(str(tmp_path / "history.json"))
+    with open(tmp_path / "history.json") as f:
+        data = json.load(f)
+    assert data["version"] == StatusHistory.FORMAT_VERSION
+    assert data["drops"] == 1
+    assert data["samples"][1] == {
+        "timestamp": 2.0,
+        "status": "Disconnected",
+        "received_bytes": None,
+        "sent_bytes": None,
+        "server": None,
+    }
@@ -0,0 +1,79 @@
+from nordvpn import ConnectionStatus, NordVpnStatus, ThroughputSampler
+from nordvpn.throughput import format_rate
+
+
+def make_status(received: str, sent: str, server: str = "it42.nordvpn.com"):
+    return NordVpnStatus(
+        f"""Status: Connected
+Current server: {server}
+Transfer: {received} received, {sent} sent
+Uptime: 1 hour 2 minutes 3 seconds
+"""
+    )
+
+
+def test_status_counters():
+    status = make_status("1.5 KiB", "2 MiB")
+    assert status.status == ConnectionStatus.CONNECTED
+    assert status.received_bytes == 1536
+    assert status.sent_bytes == 2 * 1024**2
+    assert status.uptime_seconds == 3723
+    disconnected = NordVpnStatus("Status: Disconnected")
+    assert disconnected.received_bytes is None
+    assert disconnected.uptime_seconds is None
+
+
+def test_status_counters_are_parsed_on_access():
+    status = make_status("1.5 KiB", "2 MiB")
+    other = make_status("1.5 KiB", "2 MiB")
+    assert status.received_bytes == 1536
+    # The parsed counters are not part of the value
+    assert status == other
+    assert hash(status) == hash(other)
+    changed = status.replace(transfer="3 KiB received, 1 KiB sent")
+    assert changed.received_bytes == 3072
+    assert changed.sent_bytes == 1024
+
+
+def test_sampler_rates(clock):
+    sampler = ThroughputSampler(clock=clock)
+    assert sampler.sample(make_status("1 MiB", "100 KiB")) is None
+    clock.now += 2
+    throughput = sampler.sample(make_status("3 MiB", "300 KiB"))
+    assert throughput is not None
+    assert throughput.received_rate == 1024**2
+    assert throughput.sent_rate == 100 * 1024
+    assert throughput.interval == 2
+    assert throughput.to_string() == "↓ 1.0 MiB/s  ↑ 100.0 KiB/s"
+
+
+def test_sampler_merges_close_samples(clock):
+    sampler = ThroughputSampler(min_interval=1.0, clock=clock)
+    sampler.sample(make_status("1 KiB", "1 KiB"))
+    clock.now += 0.5
+    assert sampler.sample(make_status("2 KiB", "1 KiB")) is None
+    clock.now += 0.5
+    throughput = sampler.sample(make_status("3 KiB", "1 KiB"))
+    assert throughput is not None
+    assert throughput.received_rate == 2048
+    assert throughput.sent_rate == 0
+
+
+def test_sampler_restarts_on_new_connection(clock):
+    sampler = ThroughputSampler(clock=clock)
+    sampler.sample(make_status("5 MiB", "5 MiB"))
+    clock.now += 1
+    # Counters restart from zero after a reconnection
+    assert sampler.sample(make_status("1 MiB", "1 MiB")) is None
+    clock.now += 1
+    assert sampler.sample(make_status("2 MiB", "2 MiB", server="es1")) is None
+    clock.now += 1
+    assert sampler.sample(NordVpnStatus("Status: Disconnected")) is None
+    assert sampler.last is None
+
+
+def test_format_rate():
+    assert format_rate(12) == "12 B/s"
+    assert format_rate(1536) == "1.5 KiB/s"
+    assert format_rate(3 * 1024**3) == "3.0 GiB/s"
+    assert format_rate(2 * 1024**5) == "2048.0 TiB/s"
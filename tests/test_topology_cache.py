@@ -0,0 +1,123 @@
+import json
+import threading
+from subprocess import CompletedProcess
+from unittest.mock import patch
+
+from nordvpn import FakeTransport, NordVpn, TopologyCache
+
+
+def test_cache_set_and_get(tmp_path):
+    cache = TopologyCache(path=str(tmp_path / "topology.json"))
+    assert cache.get("countries") is None
+    assert cache.set("countries", ["Italy", "Spain"]) is True
+    assert cache.get("countries") == ["Italy", "Spain"]
+    assert cache.set("countries", ["Italy", "Spain"]) is False
+
+
+def test_cache_persistence(tmp_path):
+    path = str(tmp_path / "nested" / "topology.json")
+    TopologyCache(path=path).set("groups", ["P2P"])
+    assert TopologyCache(path=path).get("groups") == ["P2P"]
+    with open(path) as f:
+        assert json.load(f)["version"] == TopologyCache.FORMAT_VERSION
+
+
+def test_cache_batch_saves_once(tmp_path):
+    path = tmp_path / "topology.json"
+    cache = TopologyCache(path=str(path))
+    saves = []
+    save = cache._save
+    cache._save = lambda: saves.append(save())
+    with cache.batch():
+        with cache.batch():
+            cache.set("cities/Italy", ["Milan"])
+        cache.set("cities/Spain", ["Madrid"])
+        assert saves == []
+        assert not path.exists()
+    assert len(saves) == 1
+    assert TopologyCache(path=str(path)).get("cities/Spain") == ["Madrid"]
+    with cache.batch():
+        pass
+    assert len(saves) == 1
+
+
+def test_cache_ignores_other_versions(tmp_path):
+    path = tmp_path / "topology.json"
+    path.write_text(json.dumps({"version": -1, "entries": {"groups": {}}}))
+    assert TopologyCache(path=str(path)).get("groups") is None
+    path.write_text("not json")
+    assert TopologyCache(path=str(path)).get("groups") is None
+
+
+def test_cache_ttl(tmp_path, clock):
+    cache = TopologyCache(path=str(tmp_path / "topology.json"), ttl=10, clock=clock)
+    assert cache.is_stale("countries")
+    cache.set("countries", ["Italy"])
+    cache.set("groups", ["P2P"], ttl=100)
+    assert not cache.is_stale("countries")
+    clock.now += 10
+    assert cache.is_stale("countries")
+    assert not cache.is_stale("groups")
+    # Stale entries are still served
+    assert cache.get("countries") == ["Italy"]
+
+
+def test_cache_listeners(tmp_path):
+    cache = TopologyCache(path=str(tmp_path / "topology.json"))
+    updates = []
+    cache.subscribe(lambda key, value: updates.append((key, value)))
+    cache.set("groups", ["P2P"])
+    cache.set("groups", ["P2P"])
+    cache.set("groups", ["P2P", "Double_VPN"])
+    assert updates == [("groups", ["P2P"]), ("groups", ["P2P", "Double_VPN"])]
+
+
+@patch("nordvpn.transport.run")
+def test_client_cold_and_warm_cache(mock_run, tmp_path):
+    mock_run.return_value = CompletedProcess(
+        args=[], returncode=0, stdout="Italy\tAlbania"
+    )
+    path = str(tmp_path / "topology.json")
+    assert NordVpn(cache=TopologyCache(path=path)).get_countries() == [
+        "Albania",
+        "Italy",
+    ]
+    assert mock_run.call_count == 1
+    # A new client process is served from disk without running the CLI
+    assert NordVpn(cache=TopologyCache(path=path)).get_countries() == [
+        "Albania",
+        "Italy",
+    ]
+    assert mock_run.call_count == 1
+
+
+@patch("nordvpn.transport.run")
+def test_client_stale_while_revalidate(mock_run, tmp_path, clock):
+    cache = TopologyCache(path=str(tmp_path / "topology.json"), ttl=10, clock=clock)
+    cache.set("groups", ["P2P"])
+    clock.now += 10
+    refreshed = threading.Event()
+    cache.subscribe(lambda key, value: refreshed.set())
+    mock_run.return_value = CompletedProcess(
+        args=[], returncode=0, stdout="P2P\tDouble_VPN"
+    )
+
+    # The stale value is returned immediately and refreshed in background
+    assert NordVpn(cache=cache).get_groups() == ["P2P"]
+    assert refreshed.wait(timeout=5)
+    assert cache.get("groups") == ["Double_VPN", "P2P"]
+    assert not cache.is_stale("groups")
+
+
+def test_client_caches_empty_lists_but_not_failures(tmp_path):
+    transport = FakeTransport({"cities Andorra": ""})
+    client = NordVpn(
+        transport=transport, cache=TopologyCache(path=str(tmp_path / "t.json"))
+    )
+    assert client.get_cities("Andorra") == []
+    assert client.get_cities("Andorra") == []
+    assert transport.calls == [["cities", "Andorra"]]
+    # Invalid command
+    assert client.get_cities("Nowhere") == []
+    assert client.get_cities("Nowhere") == []
+    assert transport.calls.count(["cities", "Nowhere"]) == 2
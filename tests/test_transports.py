@@ -0,0 +1,87 @@
+import time
+
+import pytest
+
+from nordvpn import (
+    ConnectionStatus,
+    FakeTransport,
+    NordVpn,
+    RecordingTransport,
+    ReplayTransport,
+    Transport,
+    TransportError,
+)
+
+
+def test_fake_transport():
+    transport = FakeTransport(
+        {
+            "status": "Status: Connected",
+            "connect Italy": lambda: "You are connected to Italy #1",
+        }
+    )
+    client = NordVpn(transport=transport)
+    assert client.get_status().status == ConnectionStatus.CONNECTED
+    assert client.connect_to_country("Italy") is True
+    assert client.disconnect() is False
+    assert transport.calls == [["status"], ["connect", "Italy"], ["disconnect"]]
+
+
+def test_record_and_replay(tmp_path):
+    fake = FakeTransport({"status": "Status: Disconnected", "groups": "P2P"})
+    recorder = RecordingTransport(fake)
+    client = NordVpn(transport=recorder)
+    client.get_status()
+    client.get_groups()
+    with pytest.raises(TransportError):
+        recorder.run(["unknown"])
+    path = str(tmp_path / "recordings.json")
+    recorder.save(path)
+
+    replay = ReplayTransport.from_file(path)
+    assert replay.recordings == {
+        "status": ["Status: Disconnected"],
+        "groups": ["P2P"],
+    }
+    replayed = NordVpn(transport=replay)
+    assert replayed.get_status().status == ConnectionStatus.DISCONNECTED
+    assert replayed.get_groups() == ["P2P"]
+
+
+def test_replay_cycles_outputs():
+    replay = ReplayTransport({"status": ["Status: Connecting", "Status: Connected"]})
+    outputs = [replay.run(["status"]) for _ in range(3)]
+    assert outputs == ["Status: Connecting", "Status: Connected", "Status: Connecting"]
+    with pytest.raises(TransportError):
+        replay.run(["unknown"])
+
+
+def test_replay_latency():
+    replay = ReplayTransport({"status": ["Status: Connected"]}, latency=(0.05, 0.1))
+    start = time.perf_counter()
+    replay.run(["status"])
+    assert time.perf_counter() - start >= 0.05
+
+
+def test_replay_failure_rate():
+    replay = ReplayTransport(
+        {"status": ["Status: Connected"]}, failure_rate=0.3, seed=42
+    )
+    failures = 0
+    for _ in range(1000):
+        try:
+            replay.run(["status"])
+        except TransportError as e:
+            assert e.output == ReplayTransport.DEFAULT_FAILURE_OUTPUT
+            failures += 1
+    assert 200 < failures < 400
+
+
+def test_replay_invalid_failure_rate():
+    with pytest.raises(ValueError):
+        ReplayTransport({}, failure_rate=2)
+
+
+def test_transport_is_abstract():
+    with pytest.raises(TypeError):
+        Transport()
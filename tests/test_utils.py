@@ -0,0 +1,89 @@
+from nordvpn.utils import (
+    parse_duration,
+    parse_key_values,
+    parse_size,
+    parse_transfer,
+    to_bool,
+    to_list,
+)
+
+
+def test_parse_key_values():
+    values = parse_key_values(
+        """Status: Connected
+Current server: aserver.nordvpn.com
+Transfer: 17.16 KiB received, 21.23 KiB sent"""
+    )
+    assert values == {
+        "Status": "Connected",
+        "Current server": "aserver.nordvpn.com",
+        "Transfer": "17.16 KiB received, 21.23 KiB sent",
+    }
+
+
+def test_parse_key_values_empty():
+    assert parse_key_values("") == {}
+    assert parse_key_values(None) == {}
+    assert parse_key_values("no pairs here") == {}
+
+
+def test_parse_key_values_spinner_and_duplicates():
+    values = parse_key_values("\r-\r  \r\r-\r  \rStatus: Connecting\nStatus: Connected")
+    assert values == {"Status": "Connecting"}
+
+
+def test_parse_key_values_indented_list():
+    values = parse_key_values(
+        """Firewall: enabled
+Whitelisted subnets:
+    192.168.0.0/24
+\tfe80::/10
+DNS: disabled"""
+    )
+    assert values["Firewall"] == "enabled"
+    assert values["Whitelisted subnets"] == "192.168.0.0/24,fe80::/10"
+    assert values["DNS"] == "disabled"
+
+
+def test_to_bool():
+    assert to_bool("enabled") is True
+    assert to_bool("on") is True
+    assert to_bool("true") is True
+    assert to_bool("disabled") is False
+    assert to_bool(None) is None
+
+
+def test_to_list():
+    assert to_list("192.168.0.0/24, 172.16.0.0/16") == [
+        "192.168.0.0/24",
+        "172.16.0.0/16",
+    ]
+    assert to_list("") == []
+    assert to_list(None) is None
+
+
+def test_parse_size():
+    assert parse_size("17 B") == 17
+    assert parse_size("1.5 KiB") == 1536
+    assert parse_size("2 MB") == 2000000
+    assert parse_size("1.2 GiB") == round(1.2 * 1024**3)
+    assert parse_size("12 parsecs") is None
+    assert parse_size("") is None
+
+
+def test_parse_transfer():
+    assert parse_transfer("17.16 KiB received, 21.23 KiB sent") == (
+        round(17.16 * 1024),
+        round(21.23 * 1024),
+    )
+    assert parse_transfer("1 GiB received") == (1024**3, None)
+    assert parse_transfer(None) == (None, None)
+
+
+def test_parse_duration():
+    assert parse_duration("3 seconds") == 3
+    assert parse_duration("1 hour 5 minutes 3 seconds") == 3903
+    assert parse_duration("2 days 1 minute") == 172860
+    assert parse_duration("forever") is None
+    assert parse_duration("5 fortnights") is None
+    assert parse_duration(None) is None
@@ -0,0 +1,85 @@
+import threading
+
+from nordvpn_indicator.view import ViewModel
+
+
+def test_only_changes_are_pushed():
+    labels = []
+    view = ViewModel()
+    assert view.update("label", "Connected", labels.append) is True
+    assert view.update("label", "Connected", labels.append) is False
+    assert view.update("label", "Disconnected", labels.append) is True
+    assert labels == ["Connected", "Disconnected"]
+    assert view.pushed == 2
+    assert view.suppressed == 1
+    assert view.counters() == {"pushed": 2, "suppressed": 1}
+    assert view.get("label") == "Disconnected"
+
+
+def test_properties_are_independent():
+    pushed = []
+    view = ViewModel()
+    view.update("icon", "connected.png", pushed.append)
+    view.update("sensitive", True, pushed.append)
+    view.update("icon", "connected.png", pushed.append)
+    view.update("sensitive", False, pushed.append)
+    assert pushed == ["connected.png", True, False]
+
+
+def test_invalidate():
+    labels = []
+    view = ViewModel()
+    view.update("label", "Connected", labels.append)
+    view.update("icon", "connected.png", labels.append)
+    view.invalidate("label")
+    assert view.update("label", "Connected", labels.append) is True
+    assert view.update("icon", "connected.png", labels.append) is False
+    view.invalidate()
+    assert view.update("icon", "connected.png", labels.append) is True
+
+
+def test_updates_are_dispatched():
+    dispatched = []
+    view = ViewModel(dispatch=lambda callback, *args: dispatched.append(args))
+    view.update("label", "Connected", print)
+    view.update("label", "Connected", print)
+    assert dispatched == [("Connected",)]
+
+
+def test_concurrent_updates_are_dispatched_in_order():
+    dispatched = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def dispatch(callback, value):
+        dispatched.append(value)
+        if value == "first":
+            started.set()
+            release.wait(timeout=5)
+
+    view = ViewModel(dispatch=dispatch)
+    first = threading.Thread(target=view.update, args=("label", "first", print))
+    first.start()
+    assert started.wait(timeout=5)
+    second = threading.Thread(target=view.update, args=("label", "second", print))
+    second.start()
+    second.join(timeout=0.1)
+    # Waiting for the first update to be dispatched
+    assert dispatched == ["first"]
+    release.set()
+    first.join(timeout=5)
+    second.join(timeout=5)
+    assert dispatched == ["first", "second"]
+    assert view.get("label") == "second"
+
+
+def test_apply_can_update_with_the_default_dispatch():
+    view = ViewModel()
+    applied = []
+
+    def apply(value):
+        applied.append(value)
+        view.update("other", value, applied.append)
+
+    view.update("label", "Connected", apply)
+    assert applied == ["Connected", "Connected"]